@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify
 from app.middleware.auth_middleware import role_required
+from app.middleware.conditional_get import conditional_get
 from app.core.constants import UserRole
 from app.models.ticket import Ticket
 from app.models.user import User
@@ -109,6 +110,7 @@ def mark_message_read(message_id):
 
 @admin_bp.route('/team-mappings', methods=['GET'])
 @role_required([UserRole.ADMIN])
+@conditional_get("team_mappings", "teams")
 def get_team_mappings():
     """
     Get list of all category-to-team routing mappings (Admin only)
@@ -119,7 +121,9 @@ def get_team_mappings():
       - Bearer: []
     responses:
       200:
-        description: List of team routing mappings retrieved successfully
+        description: List of team routing mappings retrieved successfully (with an ETag)
+      304:
+        description: Not modified since the version in If-None-Match
       401:
         description: Unauthorized
       403:
@@ -332,6 +336,140 @@ def delete_team_mapping(mapping_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@admin_bp.route('/slas', methods=['GET'])
+@role_required([UserRole.ADMIN])
+def get_slas():
+    """
+    Get SLA policies per ticket priority (Admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: List of SLA policies
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (Admin only)
+    """
+    from app.models.sla import SLA
+    from app.services.sla_service import SLAService
+
+    SLAService.seed_default_slas()
+    return jsonify([_sla_to_dict(s) for s in SLA.query.all()])
+
+
+@admin_bp.route('/slas/<string:priority>', methods=['PUT', 'PATCH'])
+@role_required([UserRole.ADMIN])
+def update_sla(priority):
+    """
+    Update the SLA policy for a ticket priority (Admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    parameters:
+      - name: priority
+        in: path
+        type: string
+        enum: [Low, Medium, High, Critical]
+        required: true
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            response_time_hours:
+              type: integer
+              minimum: 1
+              example: 2
+            resolution_time_hours:
+              type: integer
+              minimum: 1
+              example: 8
+    responses:
+      200:
+        description: SLA policy updated; cached policies are invalidated in all workers
+      400:
+        description: Validation error
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (Admin only)
+      404:
+        description: Unknown priority
+    """
+    from app.models.sla import SLA
+    from app.core.constants import TicketPriority
+    from app.schemas.sla_schema import SLAUpdate
+    from app.services.sla_service import SLAService
+    from app.core.database import db
+    from flask import request
+    from pydantic import ValidationError
+
+    priority_enum = next(
+        (p for p in TicketPriority if priority.lower() in (p.value.lower(), p.name.lower())), None
+    )
+    if not priority_enum:
+        return jsonify({'error': 'Unknown priority'}), 404
+
+    try:
+        data = SLAUpdate(**request.json)
+        SLAService.seed_default_slas()
+        sla = SLA.query.filter_by(priority=priority_enum).first()
+        if data.response_time_hours is not None:
+            sla.response_time_hours = data.response_time_hours
+        if data.resolution_time_hours is not None:
+            sla.resolution_time_hours = data.resolution_time_hours
+        db.session.commit()
+        return jsonify({'message': 'SLA updated', 'sla': _sla_to_dict(sla)})
+    except ValidationError as e:
+        return jsonify({'error': e.errors()}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+def _sla_to_dict(sla):
+    return {
+        'priority': sla.priority.value,
+        'response_time_hours': sla.response_time_hours,
+        'responseTimeHours': sla.response_time_hours,
+        'resolution_time_hours': sla.resolution_time_hours,
+        'resolutionTimeHours': sla.resolution_time_hours
+    }
+
+@admin_bp.route('/email-queue', methods=['GET'])
+@role_required([UserRole.ADMIN])
+def get_email_queue_stats():
+    """
+    Get outbound email queue depth and worker metrics (Admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Queue depth per status, oldest pending age and this worker's send metrics
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (Admin only)
+    """
+    from app.services.email_service import EmailService
+    from app.services.email_worker import email_worker_pool
+
+    queue = EmailService.get_queue_stats()
+    return jsonify({
+        "queue": queue,
+        "workers": email_worker_pool.metrics.snapshot()
+    })
+
 @admin_bp.route('/purge', methods=['POST'])
 @role_required([UserRole.ADMIN])
 def trigger_purge():
@@ -366,6 +504,110 @@ def trigger_purge():
             "message": str(e)
         }), 500
 
+@admin_bp.route('/archive/tickets', methods=['GET'])
+@role_required([UserRole.ADMIN])
+def search_archived_tickets():
+    """
+    List archived tickets from the archive index (Admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    parameters:
+      - name: created_by_id
+        in: query
+        type: integer
+      - name: team_id
+        in: query
+        type: integer
+      - name: from
+        in: query
+        type: string
+        description: ISO date; last activity on or after it
+      - name: to
+        in: query
+        type: string
+        description: ISO date; last activity before it
+      - name: after_id
+        in: query
+        type: integer
+        description: Keyset cursor (the last ticket id of the previous page)
+      - name: limit
+        in: query
+        type: integer
+        default: 100
+    responses:
+      200:
+        description: Index entries of matching archived tickets
+      400:
+        description: Invalid parameters
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (Admin only)
+    """
+    from flask import request
+    from datetime import date
+    from app.services.archive_service import ArchiveService
+
+    limit = request.args.get('limit', 100, type=int)
+    if not 1 <= limit <= 500:
+        return jsonify({"error": "limit must be between 1 and 500"}), 400
+    try:
+        updated_from, updated_to = (
+            date.fromisoformat(request.args[name]).isoformat() if request.args.get(name) else None
+            for name in ('from', 'to')
+        )
+    except ValueError:
+        return jsonify({"error": "from and to must be ISO dates (YYYY-MM-DD)"}), 400
+
+    entries = ArchiveService.search_archive(
+        created_by_id=request.args.get('created_by_id', type=int),
+        team_id=request.args.get('team_id', type=int),
+        updated_from=updated_from,
+        updated_to=updated_to,
+        after_id=request.args.get('after_id', 0, type=int),
+        limit=limit
+    )
+    return jsonify({
+        "items": entries,
+        "next_after_id": entries[-1]["ticket_id"] if len(entries) == limit else None,
+        "nextAfterId": entries[-1]["ticket_id"] if len(entries) == limit else None
+    })
+
+@admin_bp.route('/archive/tickets/<int:ticket_id>', methods=['GET'])
+@role_required([UserRole.ADMIN])
+def get_archived_ticket(ticket_id):
+    """
+    Fetch one archived ticket with its comments, history and feedback (Admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    parameters:
+      - name: ticket_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: The archived ticket record
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (Admin only)
+      404:
+        description: Ticket is not in the archive
+    """
+    from app.services.archive_service import ArchiveService
+
+    record = ArchiveService.get_archived_ticket(ticket_id)
+    if record is None:
+        return jsonify({"error": "Archived ticket not found"}), 404
+    return jsonify(record)
+
 @admin_bp.route('/announcements', methods=['POST'])
 @role_required([UserRole.ADMIN])
 def create_announcement():
@@ -4,121 +4,40 @@ from app.core.constants import UserRole, TicketStatus
 from app.models.ticket import Ticket
 from app.models.user import User
 from app.utils.time_utils import utcnow
+# Imported at module level so its feedback write hook is registered in every worker
+from app.services.csat_service import CSATService
 
 analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/v1/analytics')
 
 @analytics_bp.route('/dashboard', methods=['GET'])
 @role_required([UserRole.ADMIN])
 def get_dashboard_stats():
-    from app.core.database import db
-    from sqlalchemy import func
-    from datetime import datetime, timedelta
+    from app.services.ticket_stats_service import TicketStatsService
+
+    # 1. Ticket counters from the daily rollup (a few dozen rows) - EXCLUDE DEMO
+    counts = TicketStatsService.get_dashboard_counts(is_demo=False, days=7)
+    status_map = counts["by_status"]
 
-    # 1. Ticket Status Counts (Efficient Group By) - EXCLUDE DEMO
-    status_counts = db.session.query(Ticket.status, func.count(Ticket.id))\
-        .filter(Ticket.is_demo == False)\
-        .group_by(Ticket.status).all()
-    status_map = {s: c for s, c in status_counts}
-    
     # Safe mapping helper
     def get_count(status_enum):
         return status_map.get(status_enum, 0)
 
-    today_date = utcnow().date()
-    resolved_today = Ticket.query.filter(
-        Ticket.is_demo == False,
-        Ticket.status == TicketStatus.RESOLVED,
-        func.date(Ticket.updated_at) == today_date
-    ).count()
-
-    total_tickets = Ticket.query.filter(Ticket.is_demo == False).count()
+    resolved_today = counts["resolved_today"]
+    total_tickets = counts["total"]
     open_tickets = get_count(TicketStatus.OPEN)
     in_progress_tickets = get_count(TicketStatus.IN_PROGRESS)
     resolved_tickets = get_count(TicketStatus.RESOLVED)
     # Users not filtered by demo currently (Demo user is a valid user, but maybe exclude?)
     # Let's keep total_users as is for now.
     users_count = User.query.count()
-    
-    # 2. Category Distribution - EXCLUDE DEMO
-    cat_counts = db.session.query(Ticket.category, func.count(Ticket.id))\
-        .filter(Ticket.is_demo == False)\
-        .group_by(Ticket.category).all()
-    categories = {cat or "Uncategorized": count for cat, count in cat_counts}
-        
-    # 3. Priority Breakdown - EXCLUDE DEMO
-    prio_counts = db.session.query(Ticket.priority, func.count(Ticket.id))\
-        .filter(Ticket.is_demo == False)\
-        .group_by(Ticket.priority).all()
-    priorities = {prio.value: count for prio, count in prio_counts}
 
-    # 4. Trends (Last 7 days)
-    # Only fetch tickets modified or created in last 7 days to reduce load
-    today = utcnow().date()
-    seven_days_ago = today - timedelta(days=7)
-    
-    # We need tickets created recently OR resolved recently
-    # To keep identical logic to before (iterating all), we can optimize by filtering
-    # But for exact parity with previous logic, we need to check all tickets?
-    # No, previous logic checked 'if 0 <= days_ago < 7'. 
-    # So we ONLY need tickets where created_at or updated_at is >= 7 days ago.
-    
-    relevant_tickets = Ticket.query.filter(
-        Ticket.is_demo == False,
-        (Ticket.created_at >= seven_days_ago) | 
-        (Ticket.updated_at >= seven_days_ago)
-    ).all()
+    # 2. Category Distribution / 3. Priority Breakdown / 4. Trends (Last 7 days)
+    categories = counts["by_category"]
+    priorities = counts["by_priority"]
+    trends = counts["trends"]
 
-    dates = [(today - timedelta(days=i)).isoformat() for i in range(6, -1, -1)]
-    created_trend = [0] * 7
-    resolved_trend = [0] * 7
-    
-    for t in relevant_tickets:
-        if t.created_at:
-            t_date = t.created_at.date()
-            days_ago = (today - t_date).days
-            if 0 <= days_ago < 7:
-                created_trend[6 - days_ago] += 1
-                
-        if t.status == TicketStatus.RESOLVED and t.updated_at:
-             t_date = t.updated_at.date()
-             days_ago = (today - t_date).days
-             if 0 <= days_ago < 7:
-                 resolved_trend[6 - days_ago] += 1
-
-    # CSAT Feedback stats - EXCLUDE DEMO
-    from app.models.csat_feedback import CSATFeedback
-    
-    # Query feed backs for non-demo tickets
-    csat_query = db.session.query(CSATFeedback).join(Ticket).filter(Ticket.is_demo == False)
-    feedbacks = csat_query.all()
-    
-    total_ratings = len(feedbacks)
-    average_rating = 0.0
-    breakdown = {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}
-    
-    if total_ratings > 0:
-        total_sum = sum(fb.rating for fb in feedbacks)
-        average_rating = round(total_sum / total_ratings, 2)
-        for fb in feedbacks:
-            breakdown[str(fb.rating)] += 1
-            
-    # Recent feedback logs (last 5)
-    recent_feedbacks = csat_query.order_by(CSATFeedback.created_at.desc()).limit(5).all()
-    recent_list = [{
-        "ticketId": fb.ticket_id,
-        "ticketTitle": fb.ticket.title,
-        "rating": fb.rating,
-        "comment": fb.comment,
-        "userName": fb.user.full_name,
-        "createdAt": fb.created_at.isoformat()
-    } for fb in recent_feedbacks]
-    
-    csat_stats = {
-        "average": average_rating,
-        "total": total_ratings,
-        "breakdown": breakdown,
-        "recent": recent_list
-    }
+    # CSAT Feedback stats - EXCLUDE DEMO (aggregated in SQL, cached)
+    csat_stats = CSATService.get_stats(is_demo=False, recent=5)
 
     return jsonify({
         "total_tickets": total_tickets,
@@ -129,44 +48,136 @@ def get_dashboard_stats():
         "total_users": users_count,
         "categories": categories,
         "priorities": priorities,
-        "trends": {
-            "dates": dates,
-            "created": created_trend,
-            "resolved": resolved_trend
-        },
+        "trends": trends,
         "sla_compliance": get_sla_stats(),
         "csat": csat_stats
     })
 
+@analytics_bp.route('/csat', methods=['GET'])
+@role_required([UserRole.ADMIN])
+def get_csat_stats():
+    """
+    Get CSAT analytics with optional breakdown (Admin only)
+    ---
+    tags:
+      - Analytics
+    security:
+      - Bearer: []
+    parameters:
+      - name: group_by
+        in: query
+        type: string
+        enum: [team, assignee, category]
+        description: Break the ratings down by this dimension
+      - name: days
+        in: query
+        type: integer
+        description: Only include feedback from the last N days
+      - name: team_id
+        in: query
+        type: integer
+      - name: assignee_id
+        in: query
+        type: integer
+      - name: category
+        in: query
+        type: string
+      - name: recent
+        in: query
+        type: integer
+        default: 0
+        description: Number of most recent feedback entries to include (max 50)
+    responses:
+      200:
+        description: Average rating, 1-5 breakdown and optional per-group stats
+      400:
+        description: Invalid parameters
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (Admin only)
+    """
+    from flask import request
+
+    days = request.args.get('days', type=int)
+    recent = request.args.get('recent', 0, type=int)
+    if days is not None and days < 1:
+        return jsonify({"error": "days must be a positive integer"}), 400
+    if recent < 0 or recent > 50:
+        return jsonify({"error": "recent must be between 0 and 50"}), 400
+
+    try:
+        stats = CSATService.get_stats(
+            is_demo=False,
+            group_by=request.args.get('group_by'),
+            days=days,
+            team_id=request.args.get('team_id', type=int),
+            assigned_to_id=request.args.get('assignee_id', type=int),
+            category=request.args.get('category'),
+            recent=recent
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(stats)
+
+@analytics_bp.route('/trends', methods=['GET'])
+@role_required([UserRole.ADMIN, UserRole.IT_STAFF])
+def get_trends():
+    """
+    Get created vs resolved ticket trends over a configurable window
+    ---
+    tags:
+      - Analytics
+    security:
+      - Bearer: []
+    parameters:
+      - name: window
+        in: query
+        type: integer
+        enum: [7, 30, 90, 365]
+        default: 7
+        description: Number of days ending now
+      - name: granularity
+        in: query
+        type: string
+        enum: [hour, day, week]
+        default: day
+        description: Bucket size (hour is limited to windows of 30 days or less)
+    responses:
+      200:
+        description: Bucket labels with created and resolved counts per bucket
+      400:
+        description: Unsupported window or granularity
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden
+    """
+    from flask import request, g
+    from sqlalchemy import or_
+    from app.core.config import Config
+    from app.services.trend_service import TrendService
+
+    user = g.user
+    # Same scoping as the ticket list: demo users only see demo data, IT staff their team
+    filters = [Ticket.is_demo == (user.email == Config.DEMO_EMAIL)]
+    if user.role == UserRole.IT_STAFF and user.team_id:
+        filters.append(or_(Ticket.team_id == user.team_id, Ticket.assigned_to_id == user.id))
+
+    try:
+        trends = TrendService.get_trends(
+            filters,
+            window_days=request.args.get('window', 7, type=int),
+            granularity=request.args.get('granularity', 'day')
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(trends)
+
 def get_sla_stats():
-    from app.models.ticket import Ticket
     from app.services.sla_service import SLAService
-    from app.core.constants import SLAStatus, TicketStatus
-    
-    SLAService.seed_default_slas()
-    tickets = Ticket.query.filter(Ticket.is_demo == False).all()
-    
-    met = 0
-    missed = 0
-    pending = 0
-    
-    for t in tickets:
-        if t.status == TicketStatus.WITHDRAWN:
-            continue
-            
-        status = SLAService.check_sla_status(t)
-        if status == SLAStatus.ACHIEVED:
-            met += 1
-        elif status == SLAStatus.BREACHED:
-            missed += 1
-        else:
-            pending += 1
-            
-    return {
-        "met": met,
-        "missed": missed,
-        "pending": pending
-    }
+
+    return SLAService.get_compliance_counts(is_demo=False)
 
 @analytics_bp.route('/it-dashboard', methods=['GET'])
 @token_required
@@ -178,7 +189,6 @@ def get_it_dashboard_stats():
     from app.models.ticket import Ticket
     from app.core.constants import TicketStatus, TicketPriority, UserRole
     from app.services.sla_service import SLAService
-    from app.models.sla import SLA
 
     user = g.user
     today_date = utcnow().date()
@@ -201,18 +211,7 @@ def get_it_dashboard_stats():
     ).count()
     
     # 4. SLA Breaches
-    SLAService.seed_default_slas()
-    sla_configs = SLA.query.all()
-    sla_hours = {cfg.priority: cfg.resolution_time_hours for cfg in sla_configs}
-    defaults = {
-        TicketPriority.CRITICAL: 4,
-        TicketPriority.HIGH: 8,
-        TicketPriority.MEDIUM: 24,
-        TicketPriority.LOW: 48
-    }
-    for p, hrs in defaults.items():
-        if p not in sla_hours:
-            sla_hours[p] = hrs
+    sla_hours = SLAService.get_policy_hours()
 
     conditions = []
     for priority, hours in sla_hours.items():
@@ -224,34 +223,13 @@ def get_it_dashboard_stats():
         or_(*conditions)
     ).count()
 
-    # 5. Weekly Performance Trends (Assigned vs Resolved)
-    # Get last 7 days dates
-    # 5. Weekly Performance Trends (Assigned vs Resolved)
-    # Get last 7 days dates
-    dates = [(today_date - timedelta(days=i)).isoformat() for i in range(6, -1, -1)]
-    assigned_trend = [0] * 7
-    resolved_trend = [0] * 7
+    # 5. Weekly Performance Trends (Assigned vs Resolved), bucketed in SQL
+    from app.services.trend_service import TrendService
 
-    seven_days_ago = today_date - timedelta(days=7)
-    
-    # Re-use base query filter logic but applying date range
-    trend_tickets = query.filter(
-        (Ticket.created_at >= seven_days_ago) | 
-        ((Ticket.updated_at >= seven_days_ago) & (Ticket.status == TicketStatus.RESOLVED))
-    ).all()
-    
-    for t in trend_tickets:
-        if t.created_at:
-            t_date = t.created_at.date()
-            days_ago = (today_date - t_date).days
-            if 0 <= days_ago < 7:
-               assigned_trend[6 - days_ago] += 1
-        
-        if t.status == TicketStatus.RESOLVED and t.updated_at:
-            t_date = t.updated_at.date()
-            days_ago = (today_date - t_date).days
-            if 0 <= days_ago < 7:
-               resolved_trend[6 - days_ago] += 1
+    trend_filters = []
+    if user.role == UserRole.IT_STAFF and user.team_id:
+        trend_filters.append(or_(Ticket.team_id == user.team_id, Ticket.assigned_to_id == user.id))
+    weekly = TrendService.get_trends(trend_filters, window_days=7, granularity="day")
 
     return jsonify({
         "assigned_tickets": assigned_to_team,
@@ -259,9 +237,9 @@ def get_it_dashboard_stats():
         "resolved_tickets": resolved_today,
         "sla_breaches": sla_breaches,
         "weekly_activity": {
-            "dates": dates,
-            "assigned": assigned_trend,
-            "resolved": resolved_trend
+            "dates": weekly["buckets"],
+            "assigned": weekly["created"],
+            "resolved": weekly["resolved"]
         }
     })
 
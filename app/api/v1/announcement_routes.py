@@ -2,12 +2,26 @@ from flask import Blueprint, jsonify, g
 from datetime import datetime
 from app.models.announcement import Announcement
 from app.middleware.auth_middleware import token_required
+from app.middleware.conditional_get import conditional_get
 
 notification_bp = None # Avoid name conflicts
 announcement_bp = Blueprint('announcements', __name__, url_prefix='/api/v1/announcements')
 
+def _next_expiry():
+    # Expiring announcements drop out of the list without a write, so the next expiry
+    # time is part of the validator
+    from sqlalchemy import func
+    from app.core.database import db
+    from app.utils.time_utils import utcnow
+
+    next_expiry = db.session.query(func.min(Announcement.expires_at)).filter(
+        Announcement.is_active == True, Announcement.expires_at > utcnow()
+    ).scalar()
+    return next_expiry.isoformat() if next_expiry else ""
+
 @announcement_bp.route('', methods=['GET'])
 @token_required
+@conditional_get("announcements", "users", scope=_next_expiry)
 def get_active_announcements():
     """
     Get active system-wide announcements
@@ -18,7 +32,9 @@ def get_active_announcements():
       - Bearer: []
     responses:
       200:
-        description: List of active announcements retrieved successfully
+        description: List of active announcements retrieved successfully (with an ETag)
+      304:
+        description: Not modified since the version in If-None-Match
       401:
         description: Unauthorized
     """
@@ -2,8 +2,9 @@ from flask import Blueprint, request, jsonify, g
 from app.models.event import Event
 from app.core.database import db
 from app.middleware.auth_middleware import token_required, role_required
+from app.middleware.conditional_get import conditional_get
 from app.core.constants import UserRole
-from app.schemas.event_schema import EventCreate, EventUpdate
+from app.schemas.event_schema import EventCreate, EventUpdate, convert_to_naive_utc
 from pydantic import ValidationError
 from datetime import datetime
 
@@ -11,23 +12,112 @@ event_bp = Blueprint('events', __name__, url_prefix='/api/v1/events')
 
 @event_bp.route('', methods=['GET'])
 @token_required
+@conditional_get("events", "users")
 def get_events():
     """
-    Get all calendar events
+    Get calendar events, optionally only those overlapping a time window
     ---
     tags:
       - Events
     security:
       - Bearer: []
+    parameters:
+      - name: start
+        in: query
+        type: string
+        format: date-time
+        required: false
+        description: Only events ending after this ISO 8601 date or date-time
+      - name: end
+        in: query
+        type: string
+        format: date-time
+        required: false
+        description: Only events starting before this ISO 8601 date or date-time
     responses:
       200:
-        description: List of all calendar events retrieved successfully
+        description: List of calendar events, ordered by start time (with an ETag)
+      304:
+        description: Not modified since the version in If-None-Match
+      400:
+        description: Invalid window
       401:
         description: Unauthorized
     """
-    events = Event.query.order_by(Event.start_time.asc()).all()
+    from app.services.event_service import EventService
+
+    window, error = _parse_window()
+    if error:
+        return jsonify({"error": error}), 400
+    events = EventService.get_events(*window)
     return jsonify([e.to_dict() for e in events]), 200
 
+@event_bp.route('/calendar.ics', methods=['GET'])
+@token_required
+@conditional_get("events")
+def export_calendar():
+    """
+    Export calendar events as an iCalendar feed
+    ---
+    tags:
+      - Events
+    security:
+      - Bearer: []
+    produces:
+      - text/calendar
+    parameters:
+      - name: start
+        in: query
+        type: string
+        format: date-time
+        required: false
+      - name: end
+        in: query
+        type: string
+        format: date-time
+        required: false
+    responses:
+      200:
+        description: iCalendar document, with an ETag that changes whenever any event does
+      304:
+        description: Not modified since the version in If-None-Match
+      400:
+        description: Invalid window
+      401:
+        description: Unauthorized
+    """
+    from flask import make_response
+    from app.services.event_service import EventService
+
+    window, error = _parse_window()
+    if error:
+        return jsonify({"error": error}), 400
+
+    response = make_response(EventService.to_ics(EventService.get_events(*window), host=request.host.split(':')[0]))
+    response.mimetype = 'text/calendar'
+    response.headers['Content-Disposition'] = 'attachment; filename=calendar.ics'
+    return response
+
+def _parse_window():
+    """Reads the optional start/end query parameters as naive UTC datetimes."""
+    bounds = []
+    for name in ('start', 'end'):
+        value = request.args.get(name)
+        if not value:
+            bounds.append(None)
+            continue
+        # datetime.fromisoformat() only accepts a trailing 'Z' from Python 3.11 on, and
+        # Date.toISOString() always sends one
+        if value[-1:] in ('Z', 'z'):
+            value = value[:-1] + '+00:00'
+        try:
+            bounds.append(convert_to_naive_utc(datetime.fromisoformat(value)))
+        except ValueError:
+            return None, f"Invalid '{name}': expected an ISO 8601 date or date-time"
+    if bounds[0] and bounds[1] and bounds[1] <= bounds[0]:
+        return None, "'end' must be after 'start'"
+    return tuple(bounds), None
+
 @event_bp.route('', methods=['POST'])
 @role_required([UserRole.ADMIN])
 def create_event():
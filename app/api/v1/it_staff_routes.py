@@ -1,4 +1,5 @@
 from flask import Blueprint, jsonify, g
+from sqlalchemy.orm import load_only
 from app.models.ticket import Ticket
 from app.middleware.auth_middleware import role_required
 from app.core.constants import UserRole, TicketStatus
@@ -23,7 +24,9 @@ def get_assigned_tickets():
       403:
         description: Forbidden (IT Staff or Admin only)
     """
-    tickets = Ticket.query.filter_by(assigned_to_id=g.user.id).all()
+    tickets = Ticket.query.options(
+        load_only(Ticket.id, Ticket.title, Ticket.status, Ticket.priority)
+    ).filter_by(assigned_to_id=g.user.id).all()
     return jsonify([{
         "id": t.id,
         "title": t.title,
@@ -54,7 +57,9 @@ def get_team_tickets():
     if not g.user.team_id:
          return jsonify({"error": "User not assigned to a team"}), 400
          
-    tickets = Ticket.query.filter_by(team_id=g.user.team_id).all()
+    tickets = Ticket.query.options(
+        load_only(Ticket.id, Ticket.title, Ticket.status)
+    ).filter_by(team_id=g.user.team_id).all()
     return jsonify([{
         "id": t.id,
         "title": t.title,
@@ -1,6 +1,5 @@
 from flask import Blueprint, jsonify, g, request
 from app.models.project import Project
-from app.models.user import User
 from app.core.database import db
 from app.middleware.auth_middleware import token_required, role_required
 from app.core.constants import UserRole, ProjectStatus, TicketPriority
@@ -18,14 +17,42 @@ def get_projects():
       - Projects
     security:
       - Bearer: []
+    parameters:
+      - name: page
+        in: query
+        type: integer
+        description: Page number; with page or per_page the response is paginated
+      - name: per_page
+        in: query
+        type: integer
+        description: Projects per page (max 100)
     responses:
       200:
-        description: List of projects retrieved successfully
+        description: List of projects (newest first), or items and meta when paginated
       401:
         description: Unauthorized
     """
-    projects = Project.query.all()
-    return jsonify([p.to_dict() for p in projects])
+    from app.services.project_service import ProjectService
+
+    query = ProjectService.list_query()
+    if 'page' not in request.args and 'per_page' not in request.args:
+        return jsonify([p.to_dict() for p in query.all()])
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+    return jsonify({
+        "items": [p.to_dict() for p in paginated.items],
+        "meta": {
+            "page": paginated.page,
+            "per_page": paginated.per_page,
+            "perPage": paginated.per_page,
+            "total_pages": paginated.pages,
+            "totalPages": paginated.pages,
+            "total_items": paginated.total,
+            "totalItems": paginated.total
+        }
+    })
 
 @project_bp.route('', methods=['POST'])
 @role_required([UserRole.ADMIN])
@@ -95,6 +122,8 @@ def create_project():
       403:
         description: Forbidden (Admin only)
     """
+    from app.services.project_service import ProjectService
+
     data = request.get_json()
     
     try:
@@ -109,27 +138,17 @@ def create_project():
             created_by_id=g.user.id
         )
         
-        # Handle Team
+        # Handle Team (all identifiers resolved with one query)
         if 'team' in data:
-            for member_data in data['team']:
-                identifier = member_data.get('email') or member_data.get('name')
-                if identifier:
-                    # Try email first
-                    user = User.query.filter_by(email=identifier).first()
-                    # If not found, try full name
-                    if not user:
-                         user = User.query.filter(User.full_name.ilike(identifier)).first()
-                    
-                    if user:
-                        new_project.team.append(user)
+            new_project.team = ProjectService.resolve_members(data['team'])
         
         db.session.add(new_project)
         db.session.commit()
         
-        # Send Email Notifications
+        # Queue Email Notifications
         try:
             from app.services.email_service import EmailService
-            from app.services.email_templates import get_project_created_email, get_project_assignment_email
+            from app.services.email_templates import get_project_created_email
             
             # 1. Notify Admin (Creator)
             admin_email_body = get_project_created_email(
@@ -145,25 +164,8 @@ def create_project():
                 admin_email_body
             )
             
-            # 2. Notify Assigned Team Members
-            for member in new_project.team:
-                # Skip if member is the creator (though usually they are different roles, just in case)
-                if member.id == g.user.id:
-                    continue
-                    
-                member_email_body = get_project_assignment_email(
-                    name=member.full_name,
-                    project_name=new_project.name,
-                    role="Team Member", # detailed role not in Many-to-Many, generic "Team Member"
-                    start_date=new_project.start_date.strftime('%Y-%m-%d') if new_project.start_date else 'N/A',
-                    deadline=new_project.deadline.strftime('%Y-%m-%d') if new_project.deadline else 'N/A'
-                )
-                
-                EmailService.send_email(
-                    member.email,
-                    f"New Project Assignment - {new_project.name} 📋",
-                    member_email_body
-                )
+            # 2. Notify Assigned Team Members (skipping the creator), one outbox commit for all
+            ProjectService.queue_assignment_emails(new_project, new_project.team, exclude_user_id=g.user.id)
                 
         except Exception as e:
             print(f"Failed to send project emails: {e}")
@@ -319,46 +321,18 @@ def update_project(project_id):
         
     # Handle Team Update
     if 'team' in data:
+        from app.services.project_service import ProjectService
+
         # 1. Capture existing members specific IDs
         existing_member_ids = {u.id for u in project.team}
         
-        project.team = [] # Clear existing
-        for member_data in data['team']:
-            identifier = member_data.get('email') or member_data.get('name')
-            if identifier:
-                # Try email first
-                user = User.query.filter_by(email=identifier).first()
-                # If not found, try full name
-                if not user:
-                        user = User.query.filter(User.full_name.ilike(identifier)).first()
-                
-                if user:
-                    project.team.append(user)
-        
+        # Replaces the existing members; all identifiers resolved with one query
+        project.team = ProjectService.resolve_members(data['team'])
         db.session.commit()
 
-        # 2. Identify and Notify New Members
-        try:
-            from app.services.email_service import EmailService
-            from app.services.email_templates import get_project_assignment_email
-            
-            for member in project.team:
-                if member.id not in existing_member_ids and member.id != g.user.id:
-                    member_email_body = get_project_assignment_email(
-                        name=member.full_name,
-                        project_name=project.name,
-                        role="Team Member",
-                        start_date=project.start_date.strftime('%Y-%m-%d') if project.start_date else 'N/A',
-                        deadline=project.deadline.strftime('%Y-%m-%d') if project.deadline else 'N/A'
-                    )
-                    
-                    EmailService.send_email(
-                        member.email,
-                        f"New Project Assignment - {project.name} 📋",
-                        member_email_body
-                    )
-        except Exception as e:
-            print(f"Failed to send assignment emails during update: {e}")
+        # 2. Queue emails for the new members
+        new_members = [m for m in project.team if m.id not in existing_member_ids]
+        ProjectService.queue_assignment_emails(project, new_members, exclude_user_id=g.user.id)
             
     else:
         db.session.commit()
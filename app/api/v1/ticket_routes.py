@@ -5,6 +5,7 @@ from app.schemas.ticket_schema import TicketCreate, TicketUpdate
 from app.schemas.csat_feedback_schema import CSATFeedbackCreate
 from app.utils.time_utils import utcnow
 from app.middleware.auth_middleware import token_required
+from app.middleware.conditional_get import conditional_get
 from pydantic import ValidationError
 from app.core.extensions import limiter
 
@@ -66,6 +67,9 @@ def create_ticket():
               type: string
             ticket_id:
               type: integer
+            possible_duplicates:
+              type: array
+              description: Open tickets visible to the user that look like the same problem
       400:
         description: Validation error
       401:
@@ -74,14 +78,26 @@ def create_ticket():
     try:
         data = TicketCreate(**request.json)
         ticket = TicketService.create_ticket(data, g.user.id)
-        return jsonify({"message": "Ticket created", "ticket_id": ticket.id}), 201
+        duplicates = _similar_tickets(g.user, ticket.title, ticket.description, exclude_id=ticket.id)
+        return jsonify({
+            "message": "Ticket created",
+            "ticket_id": ticket.id,
+            "possible_duplicates": duplicates,
+            "possibleDuplicates": duplicates
+        }), 201
     except ValidationError as e:
         return jsonify({"error": e.errors()}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def _ticket_version(ticket_id):
+    # The PDF cache already versions a ticket by its row, comment count and history count
+    from app.services.pdf_cache_service import PDFCacheService
+    return PDFCacheService.get_version(ticket_id)[1]
+
 @ticket_bp.route('/<int:ticket_id>', methods=['GET'])
 @token_required
+@conditional_get("users", "teams", "csat_feedbacks", scope=_ticket_version)
 def get_ticket(ticket_id):
     """
     Get ticket details by ID (including comments and history)
@@ -98,7 +114,9 @@ def get_ticket(ticket_id):
         description: The ID of the ticket to retrieve
     responses:
       200:
-        description: Ticket details retrieved successfully
+        description: Ticket details retrieved successfully (with an ETag)
+      304:
+        description: Not modified since the version in If-None-Match
       401:
         description: Unauthorized
       404:
@@ -153,6 +171,7 @@ def get_ticket(ticket_id):
 
 @ticket_bp.route('', methods=['GET'])
 @token_required
+@conditional_get("tickets", "users", "teams")
 def get_tickets():
     """
     List tickets with pagination (filtered by user role)
@@ -172,39 +191,68 @@ def get_tickets():
         type: integer
         default: 20
         maximum: 100
-        description: Items per page (capped at 100)
+        description: Items per page (clamped to 1-100)
+      - name: pagination
+        in: query
+        type: string
+        enum: [offset, cursor]
+        default: offset
+        description: Use keyset pagination ordered by (createdAt, id) instead of page numbers
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque nextCursor from the previous page (implies pagination=cursor)
+      - name: include_total
+        in: query
+        type: boolean
+        default: false
+        description: In cursor mode, also return totalItems (runs a COUNT query)
     responses:
       200:
-        description: List of tickets and pagination metadata
+        description: List of tickets and pagination metadata (with an ETag)
+      304:
+        description: Not modified since the version in If-None-Match
+      400:
+        description: Invalid cursor
       401:
         description: Unauthorized
     """
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 100, type=int)
-    if per_page > 100:
-        per_page = 100
+    per_page = min(max(request.args.get('per_page', 100, type=int), 1), 100)
+
+    if request.args.get('pagination') == 'cursor' or 'cursor' in request.args:
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        try:
+            result = TicketService.get_tickets_by_cursor(
+                g.user,
+                cursor=request.args.get('cursor'),
+                per_page=per_page,
+                include_total=include_total
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        meta = {
+            "per_page": per_page,
+            "perPage": per_page,
+            "next_cursor": result["next_cursor"],
+            "nextCursor": result["next_cursor"],
+            "has_more": result["next_cursor"] is not None,
+            "hasMore": result["next_cursor"] is not None
+        }
+        if include_total:
+            meta["total_items"] = result["total"]
+            meta["totalItems"] = result["total"]
+
+        return jsonify({
+            "items": [_ticket_list_item(t) for t in result["items"]],
+            "meta": meta
+        }), 200
     
     paginated_tickets = TicketService.get_tickets(g.user, page=page, per_page=per_page)
     
     return jsonify({
-        "items": [{
-            "id": t.id, 
-            "title": t.title, 
-            "description": t.description,
-            "category": t.category,
-            "status": t.status.value, 
-            "priority": t.priority.value,
-            "createdAt": t.created_at.isoformat(),
-            "updatedAt": t.updated_at.isoformat() if t.updated_at else t.created_at.isoformat(),
-            "createdByName": t.creator.full_name if t.creator else "Unknown",
-            "createdById": t.created_by_id,
-            "assignedToId": t.assigned_to_id,
-            "assignedTo": (
-                f"{t.team.name} : {t.assignee.full_name}" 
-                if t.assignee and t.team 
-                else (t.assignee.full_name if t.assignee else (t.team.name if t.team else None))
-            )
-        } for t in paginated_tickets.items],
+        "items": [_ticket_list_item(t) for t in paginated_tickets.items],
         "meta": {
             "page": paginated_tickets.page,
             "per_page": paginated_tickets.per_page,
@@ -216,6 +264,78 @@ def get_tickets():
         }
     }), 200
 
+@ticket_bp.route('/search', methods=['GET'])
+@token_required
+def search_tickets():
+    """
+    Full-text search over ticket titles, descriptions and comments (filtered by user role)
+    ---
+    tags:
+      - Tickets
+    security:
+      - Bearer: []
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Search text
+      - name: limit
+        in: query
+        type: integer
+        default: 20
+        maximum: 100
+      - name: offset
+        in: query
+        type: integer
+        default: 0
+    responses:
+      200:
+        description: Matching tickets, best match first
+      400:
+        description: Missing or empty query
+      401:
+        description: Unauthorized
+    """
+    q = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    try:
+        results = TicketService.search_tickets(g.user, q, limit=limit, offset=offset)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "items": [{**_ticket_list_item(t), "score": round(score, 4)} for t, score in results],
+        "meta": {
+            "query": q,
+            "limit": limit,
+            "offset": offset,
+            "has_more": len(results) == limit,
+            "hasMore": len(results) == limit
+        }
+    }), 200
+
+def _ticket_list_item(t):
+    return {
+        "id": t.id, 
+        "title": t.title, 
+        "description": t.description,
+        "category": t.category,
+        "status": t.status.value, 
+        "priority": t.priority.value,
+        "createdAt": t.created_at.isoformat(),
+        "updatedAt": t.updated_at.isoformat() if t.updated_at else t.created_at.isoformat(),
+        "createdByName": t.creator.full_name if t.creator else "Unknown",
+        "createdById": t.created_by_id,
+        "assignedToId": t.assigned_to_id,
+        "assignedTo": (
+            f"{t.team.name} : {t.assignee.full_name}" 
+            if t.assignee and t.team 
+            else (t.assignee.full_name if t.assignee else (t.team.name if t.team else None))
+        )
+    }
+
 @ticket_bp.route('/<int:ticket_id>', methods=['PUT', 'PATCH'])
 @token_required
 def update_ticket(ticket_id):
@@ -368,7 +488,9 @@ def download_pdf(ticket_id):
         description: The ID of the ticket
     responses:
       200:
-        description: PDF binary file
+        description: PDF binary file (served from the on-disk cache, with an ETag)
+      304:
+        description: Not modified since the version in If-None-Match
       401:
         description: Unauthorized
       403:
@@ -377,9 +499,10 @@ def download_pdf(ticket_id):
         description: Ticket not found
     """
     try:
-        from app.services.pdf_service import PDFService
+        from flask import send_file, make_response
+        from app.services.pdf_cache_service import PDFCacheService
         
-        ticket = TicketService.get_ticket_by_id(ticket_id)
+        ticket, version = PDFCacheService.get_version(ticket_id)
         if not ticket:
             return jsonify({"error": "Ticket not found"}), 404
             
@@ -390,13 +513,22 @@ def download_pdf(ticket_id):
             ticket.assigned_to_id != g.user.id and 
             (ticket.team_id is None or g.user.team_id != ticket.team_id)):
             return jsonify({"error": "Unauthorized"}), 403
+
+        # Answer revalidations before touching the cache, so an evicted file is not re-rendered
+        if request.if_none_match.contains(version):
+            response = make_response('', 304)
+            response.set_etag(version)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
         
-        pdf_buffer = PDFService.generate_ticket_pdf(ticket)
-        
-        from flask import make_response
-        response = make_response(pdf_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename=Ticket-{ticket.id}.pdf'
+        path = PDFCacheService.get_path(ticket_id, version)
+        if not path:
+            return jsonify({"error": "Ticket not found"}), 404
+
+        response = send_file(path, mimetype='application/pdf', as_attachment=True,
+                             download_name=f'Ticket-{ticket_id}.pdf', etag=version, conditional=True)
+        # Ticket contents are per-user; browsers must revalidate with the ETag on every click
+        response.headers['Cache-Control'] = 'private, no-cache'
         
         return response
     except Exception as e:
@@ -405,11 +537,33 @@ def download_pdf(ticket_id):
         logger.error(traceback.format_exc())
         return jsonify({"error": str(e)}), 500
 
+def _similar_tickets(user, title, description=None, exclude_id=None):
+    """Serializes near-duplicate open tickets for a response; never fails the request."""
+    from app.services.duplicate_service import DuplicateService
+    try:
+        matches, _ = DuplicateService.find_similar(user, title, description, exclude_id=exclude_id)
+    except Exception as e:
+        logger.warning(f"Duplicate lookup failed: {e}")
+        return []
+    return [_similar_item(t, similarity) for t, similarity in matches]
+
+def _similar_item(ticket, similarity):
+    return {
+        "id": ticket.id,
+        "title": ticket.title,
+        "status": ticket.status.value,
+        "similarity": round(similarity, 2),
+        "createdAt": ticket.created_at.isoformat()
+    }
+
 @ticket_bp.route('/check-duplicate', methods=['POST'])
 @token_required
 def check_duplicate():
     """
-    Check for existing similar active tickets by the current user
+    Check for existing similar active tickets
+    `exists` reports an open ticket of the current user whose title contains the given title
+    or closely matches it. `similar` lists near-duplicate open tickets the user can see, and
+    `similar_count` counts all of them, including ones filed by other users.
     ---
     tags:
       - Tickets
@@ -427,6 +581,9 @@ def check_duplicate():
             title:
               type: string
               example: VPN down again
+            description:
+              type: string
+              example: Cannot connect since this morning
     responses:
       200:
         description: Duplicate check result
@@ -442,7 +599,8 @@ def check_duplicate():
             
         title = data['title'].strip()
         if not title:
-             return jsonify({"exists": False}), 200
+             return jsonify({"exists": False, "similar": [], "similar_count": 0, "similarCount": 0}), 200
+        description = (data.get('description') or '').strip() or None
 
         # Search for similar active tickets by this user
         # Uses ILIKE for case-insensitive matching if DB supports it (Postgres), otherwise standard query
@@ -452,24 +610,31 @@ def check_duplicate():
         from app.core.constants import TicketStatus
         from sqlalchemy import or_
 
-        existing_ticket = Ticket.query.filter(
-            Ticket.created_by_id == g.user.id,
-            Ticket.title.ilike(f"%{title}%"), # Fuzzy match contains
-            Ticket.status.notin_([TicketStatus.RESOLVED, TicketStatus.CLOSED])
-        ).first()
+        from app.services.duplicate_service import DuplicateService
+
+        matches, similar_count = DuplicateService.find_similar(g.user, title, description)
+        similar = [_similar_item(t, similarity) for t, similarity in matches]
 
+        # Rephrasings come from the index; the substring match still catches a short title
+        # that is part of a longer one
+        existing_ticket = next((t for t, _ in matches if t.created_by_id == g.user.id), None)
+        if existing_ticket is None:
+            existing_ticket = Ticket.query.filter(
+                Ticket.created_by_id == g.user.id,
+                Ticket.title.ilike(f"%{title}%"), # Fuzzy match contains
+                Ticket.status.notin_([TicketStatus.RESOLVED, TicketStatus.CLOSED])
+            ).first()
+
+        result = {"exists": False, "similar": similar, "similar_count": similar_count, "similarCount": similar_count}
         if existing_ticket:
-            return jsonify({
-                "exists": True,
-                "ticket": {
-                    "id": existing_ticket.id,
-                    "title": existing_ticket.title,
-                    "status": existing_ticket.status.value,
-                    "createdAt": existing_ticket.created_at.isoformat()
-                }
-            }), 200
-        
-        return jsonify({"exists": False}), 200
+            result["exists"] = True
+            result["ticket"] = {
+                "id": existing_ticket.id,
+                "title": existing_ticket.title,
+                "status": existing_ticket.status.value,
+                "createdAt": existing_ticket.created_at.isoformat()
+            }
+        return jsonify(result), 200
 
     except Exception as e:
         logger.error(f"Duplicate Check Error: {e}")
@@ -5,8 +5,11 @@ from app.core.database import db
 from app.utils.time_utils import utcnow
 from werkzeug.security import generate_password_hash
 from app.middleware.auth_middleware import token_required, role_required
-from app.core.constants import UserRole, TicketStatus
+from app.middleware.conditional_get import conditional_get
+from app.core.constants import UserRole
 from app.models.ticket import Ticket
+# Imported for its flush hook, which invalidates the cached specialty list on profile edits
+from app.services.agent_directory_service import AgentDirectoryService
 
 user_bp = Blueprint('users', __name__, url_prefix='/api/v1/users')
 
@@ -40,7 +43,7 @@ def get_me():
         "createdAt": g.user.created_at.isoformat() if g.user.created_at else None
     }
     if g.user.role in [UserRole.IT_STAFF, UserRole.ADMIN]:
-        response_data["specializations"] = g.user.specializations or []
+        response_data["specializations"] = list(g.user.specializations)
 
     return jsonify(response_data)
 
@@ -88,7 +91,7 @@ def update_my_profile():
     if 'specializations' in data:
         if g.user.role in [UserRole.IT_STAFF, UserRole.ADMIN]:
             if isinstance(data['specializations'], list):
-                g.user.specializations = [str(s).strip() for s in data['specializations'] if str(s).strip()]
+                g.user.specializations = _clean_specializations(data['specializations'])
 
     if 'preferences' in data:
         # Ensure it's a dict
@@ -109,7 +112,7 @@ def update_my_profile():
         "department": g.user.department
     }
     if g.user.role in [UserRole.IT_STAFF, UserRole.ADMIN]:
-        user_data["specializations"] = g.user.specializations or []
+        user_data["specializations"] = list(g.user.specializations)
 
     return jsonify({
         "message": "Profile updated successfully",
@@ -194,65 +197,125 @@ def get_all_users():
       - name: search
         in: query
         type: string
-        description: Search query matching name or email
+        description: Case-insensitive prefix of the name or email
+      - name: pagination
+        in: query
+        type: string
+        enum: [cursor]
+        description: Return pages of users (newest first) instead of the full list
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque nextCursor from the previous page (implies pagination=cursor)
+      - name: per_page
+        in: query
+        type: integer
+        description: Users per page in cursor mode (max 100, default 50)
+      - name: include_total
+        in: query
+        type: boolean
+        description: In cursor mode, also return totalItems (runs a COUNT query)
     responses:
       200:
         description: List of users retrieved successfully
+      400:
+        description: Invalid cursor
       401:
         description: Unauthorized
       403:
         description: Forbidden (Admin only)
     """
-    role_filter = request.args.get('role')
-    exclude_role = request.args.get('exclude_role')
+    role = next((r for r in UserRole if r.value == request.args.get('role')), None)
+    exclude_role = next((r for r in UserRole if r.value == request.args.get('exclude_role')), None)
     search_query = request.args.get('search')
-    
-    query = User.query
-    
-    # Exclude Demo User
-    from app.core.config import Config
-    query = query.filter(User.email != Config.DEMO_EMAIL)
-    
-    if search_query:
-        search = f"%{search_query}%"
-        # Search by name OR email
-        query = query.filter((User.full_name.ilike(search)) | (User.email.ilike(search)))
 
-    if role_filter:
-        try:
-            role_enum = next((r for r in UserRole if r.value == role_filter), None)
-            if role_enum:
-                query = query.filter(User.role == role_enum)
-        except Exception:
-            pass
+    from app.services.user_service import UserService
 
-    if exclude_role:
+    if request.args.get('pagination') == 'cursor' or 'cursor' in request.args:
+        per_page = min(max(request.args.get('per_page', 50, type=int), 1), 100)
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         try:
-            exclude_enum = next((r for r in UserRole if r.value == exclude_role), None)
-            if exclude_enum:
-                query = query.filter(User.role != exclude_enum)
-        except Exception:
-            pass
-            
-    users = query.all()
-    
-    return jsonify([{
-        "id": u.id,
-        "email": u.email,
-        "full_name": u.full_name,
-        "fullName": u.full_name,
-        "role": u.role.value,
-        "department": u.department,
-        "team": u.team.name if u.team else None,
-        "tickets_raised": len(u.created_tickets),
-        "ticketsRaised": len(u.created_tickets),
-        "tickets_resolved": sum(1 for t in u.assigned_tickets if t.status in [TicketStatus.RESOLVED, TicketStatus.CLOSED]),
-        "ticketsResolved": sum(1 for t in u.assigned_tickets if t.status in [TicketStatus.RESOLVED, TicketStatus.CLOSED]),
-        "is_active": u.is_active,
-        "isActive": u.is_active,
-        "created_at": u.created_at.isoformat() if u.created_at else None,
-        "createdAt": u.created_at.isoformat() if u.created_at else None
-    } for u in users])
+            result = UserService.get_users_by_cursor(
+                search=search_query,
+                role=role,
+                exclude_role=exclude_role,
+                cursor=request.args.get('cursor'),
+                per_page=per_page,
+                include_total=include_total
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        meta = {
+            "per_page": per_page,
+            "perPage": per_page,
+            "next_cursor": result["next_cursor"],
+            "nextCursor": result["next_cursor"],
+            "has_more": result["next_cursor"] is not None,
+            "hasMore": result["next_cursor"] is not None
+        }
+        if include_total:
+            meta["total_items"] = result["total"]
+            meta["totalItems"] = result["total"]
+
+        return jsonify({"items": _user_list_items(result["items"]), "meta": meta})
+
+    users = UserService.list_users(search=search_query, role=role, exclude_role=exclude_role)
+    return jsonify(_user_list_items(users))
+
+def _user_list_items(users):
+    from app.services.user_service import UserService
+
+    counts = UserService.get_ticket_counts([u.id for u in users])
+    items = []
+    for u in users:
+        raised, resolved = counts[u.id]
+        items.append({
+            "id": u.id,
+            "email": u.email,
+            "full_name": u.full_name,
+            "fullName": u.full_name,
+            "role": u.role.value,
+            "department": u.department,
+            "team": u.team.name if u.team else None,
+            "tickets_raised": raised,
+            "ticketsRaised": raised,
+            "tickets_resolved": resolved,
+            "ticketsResolved": resolved,
+            "is_active": u.is_active,
+            "isActive": u.is_active,
+            "created_at": u.created_at.isoformat() if u.created_at else None,
+            "createdAt": u.created_at.isoformat() if u.created_at else None
+        })
+    return items
+
+@user_bp.route('/summary', methods=['GET'])
+@role_required([UserRole.ADMIN])
+def get_user_summary():
+    """
+    Count users per role (Admin only)
+    ---
+    tags:
+      - Users
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Total and active user counts, overall and per role
+      401:
+        description: Unauthorized
+      403:
+        description: Forbidden (Admin only)
+    """
+    from app.services.user_service import UserService
+
+    summary = UserService.get_role_summary()
+    return jsonify({
+        "total": summary["total"],
+        "active": summary["active"],
+        "by_role": summary["by_role"],
+        "byRole": summary["by_role"]
+    })
 
 @user_bp.route('', methods=['POST'])
 @role_required([UserRole.ADMIN])
@@ -338,7 +401,7 @@ def create_user():
         password_hash=generate_password_hash(password),
         team_id=team_id,
         is_active=True,
-        specializations=specializations if isinstance(specializations, list) else []
+        specializations=_clean_specializations(specializations) if isinstance(specializations, list) else []
     )
     
     db.session.add(new_user)
@@ -434,7 +497,7 @@ def update_user(user_id):
 @token_required
 def export_user_data():
     """
-    Export current user data (tickets, profile, comments) as JSON, CSV, or PDF
+    Export current user data (tickets, profile, comments) as JSON, CSV, NDJSON, or PDF
     ---
     tags:
       - Users
@@ -444,9 +507,9 @@ def export_user_data():
       - name: format
         in: query
         type: string
-        enum: [json, csv, pdf]
+        enum: [json, csv, ndjson, pdf]
         default: json
-        description: Export format
+        description: Export format (csv and ndjson are streamed row by row)
     responses:
       200:
         description: Exported data in requested format
@@ -460,18 +523,42 @@ def export_user_data():
     tickets = []
     from app.models.ticket import Ticket
     from app.core.constants import UserRole
-    
+    from sqlalchemy.orm import load_only
+
+    ticket_filters = []
     if user.role == UserRole.EMPLOYEE:
-        tickets = Ticket.query.filter_by(created_by_id=user.id).all()
+        ticket_filters = [Ticket.created_by_id == user.id]
     elif user.role == UserRole.IT_STAFF:
          if user.team_id:
-            tickets = Ticket.query.filter_by(team_id=user.team_id).all()
+            ticket_filters = [Ticket.team_id == user.team_id]
          else:
-            tickets = Ticket.query.filter_by(assigned_to_id=user.id).all()
+            ticket_filters = [Ticket.assigned_to_id == user.id]
+
+    if format_type in ('csv', 'ndjson'):
+        # Streamed straight from batched cursors, so memory does not grow with history size
+        from flask import Response, stream_with_context
+        from app.services.export_service import ExportService
+
+        if format_type == 'csv':
+            rows, mimetype, extension = ExportService.iter_csv(user, ticket_filters), 'text/csv', 'csv'
+        else:
+            rows, mimetype, extension = ExportService.iter_ndjson(user, ticket_filters), 'application/x-ndjson', 'ndjson'
+        output = Response(stream_with_context(rows), mimetype=mimetype)
+        output.headers["Content-Disposition"] = f"attachment; filename=ticket_tally_data_{user.id}.{extension}"
+        return output
+
+    # Only the exported columns are loaded; no relationships are touched per row
+    if ticket_filters:
+        tickets = Ticket.query.options(load_only(
+            Ticket.id, Ticket.title, Ticket.status, Ticket.priority,
+            Ticket.category, Ticket.created_at, Ticket.updated_at
+        )).filter(*ticket_filters).all()
     
     # Comments
     from app.models.comment import Comment
-    comments = Comment.query.filter_by(user_id=user.id).all()
+    comments = Comment.query.options(
+        load_only(Comment.id, Comment.ticket_id, Comment.text, Comment.created_at)
+    ).filter_by(user_id=user.id).all()
     
     # 2. Format Data
     export_data = {
@@ -500,39 +587,6 @@ def export_user_data():
         "exported_at": utcnow().isoformat()
     }
     
-    if format_type == 'csv':
-        import csv
-        import io
-        from flask import make_response
-        
-        si = io.StringIO()
-        cw = csv.writer(si)
-        
-        # Write User Info
-        cw.writerow(['User Profile'])
-        cw.writerow(['Name', user.full_name])
-        cw.writerow(['Email', user.email])
-        cw.writerow(['Role', user.role.value])
-        cw.writerow([])
-        
-        # Write Tickets
-        cw.writerow(['Tickets'])
-        cw.writerow(['ID', 'Title', 'Status', 'Priority', 'Category', 'Created At'])
-        for t in tickets:
-            cw.writerow([t.id, t.title, t.status.value, t.priority.value, t.category, t.created_at])
-        cw.writerow([])
-
-        # Write Comments
-        cw.writerow(['My Comments'])
-        cw.writerow(['Ticket ID', 'Comment', 'Date'])
-        for c in comments:
-            cw.writerow([c.ticket_id, c.text, c.created_at])
-            
-        output = make_response(si.getvalue())
-        output.headers["Content-Disposition"] = f"attachment; filename=ticket_tally_data_{user.id}.csv"
-        output.headers["Content-type"] = "text/csv"
-        return output
-
     if format_type == 'pdf':
         from flask import send_file
         from app.services.pdf_service import PDFService
@@ -548,48 +602,18 @@ def export_user_data():
 
     return jsonify(export_data)
 
-@user_bp.route('/agents', methods=['GET'])
-@token_required
-def get_agents():
-    """
-    Get list of active IT support agents
-    """
-    search_query = request.args.get('search')
-    specialty_filter = request.args.get('specialty')
-    
-    from app.core.config import Config
-    query = User.query.filter(
-        User.role.in_([UserRole.IT_STAFF, UserRole.ADMIN]),
-        User.is_active == True,
-        User.email != Config.DEMO_EMAIL
-    )
-    
-    agents = query.all()
-    
-    filtered_agents = []
-    for agent in agents:
-        specs = agent.specializations or []
-        
-        # Match specialty filter
-        if specialty_filter:
-            if specialty_filter.lower() not in [s.lower() for s in specs]:
-                continue
-                
-        # Match search query (searches name, email, team name, and specializations)
-        if search_query:
-            search_lower = search_query.lower()
-            team_name = agent.team.name.lower() if agent.team else ""
-            match_name = search_lower in agent.full_name.lower()
-            match_email = search_lower in agent.email.lower()
-            match_team = search_lower in team_name
-            match_spec = any(search_lower in s.lower() for s in specs)
-            
-            if not (match_name or match_email or match_team or match_spec):
-                continue
-                
-        filtered_agents.append(agent)
-        
-    return jsonify([{
+def _clean_specializations(values):
+    """Strips names and drops blanks and case-insensitive repeats, keeping the given order."""
+    cleaned, seen = [], set()
+    for value in values:
+        name = str(value).strip()[:100]
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            cleaned.append(name)
+    return cleaned
+
+def _agent_item(a):
+    return {
         "id": a.id,
         "email": a.email,
         "fullName": a.full_name,
@@ -600,8 +624,65 @@ def get_agents():
             "id": a.team.id,
             "name": a.team.name
         } if a.team else None,
-        "specializations": a.specializations or []
-    } for a in filtered_agents])
+        "specializations": list(a.specializations)
+    }
+
+@user_bp.route('/agents', methods=['GET'])
+@token_required
+def get_agents():
+    """
+    Get list of active IT support agents
+    ---
+    tags:
+      - Users
+    security:
+      - Bearer: []
+    parameters:
+      - name: search
+        in: query
+        type: string
+        description: Case-insensitive match on name, email, team name or specialty
+      - name: specialty
+        in: query
+        type: string
+        description: Only agents with this specialty
+      - name: page
+        in: query
+        type: integer
+        description: Page number; with page or per_page the response is paginated
+      - name: per_page
+        in: query
+        type: integer
+        description: Agents per page (max 100)
+    responses:
+      200:
+        description: A list of agents, or items and meta when paginated
+      401:
+        description: Unauthorized
+    """
+    query = AgentDirectoryService.search_agents(
+        search=request.args.get('search'),
+        specialty=request.args.get('specialty')
+    )
+
+    if 'page' not in request.args and 'per_page' not in request.args:
+        return jsonify([_agent_item(a) for a in query.all()])
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), 100)
+    paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+    return jsonify({
+        "items": [_agent_item(a) for a in paginated.items],
+        "meta": {
+            "page": paginated.page,
+            "per_page": paginated.per_page,
+            "perPage": paginated.per_page,
+            "total_pages": paginated.pages,
+            "totalPages": paginated.pages,
+            "total_items": paginated.total,
+            "totalItems": paginated.total
+        }
+    })
 
 @user_bp.route('/specialties', methods=['GET'])
 @token_required
@@ -609,24 +690,11 @@ def get_all_specialties():
     """
     Get list of all unique specialties/specializations across all active agents
     """
-    from app.core.config import Config
-    agents = User.query.filter(
-        User.role.in_([UserRole.IT_STAFF, UserRole.ADMIN]),
-        User.is_active == True,
-        User.email != Config.DEMO_EMAIL
-    ).all()
-    
-    specialties_set = set()
-    for agent in agents:
-        if agent.specializations:
-            for s in agent.specializations:
-                if s.strip():
-                    specialties_set.add(s.strip())
-                    
-    return jsonify(sorted(list(specialties_set)))
+    return jsonify(AgentDirectoryService.get_specialties())
 
 @user_bp.route('/teams', methods=['GET'])
 @token_required
+@conditional_get("teams")
 def get_all_teams():
     """
     Get list of all teams in the system (for directory dropdown)
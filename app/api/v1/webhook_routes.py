@@ -5,6 +5,7 @@ from app.core.database import db
 from app.core.constants import TicketStatus
 from app.utils.time_utils import utcnow
 from app.services.notification_service import NotificationService
+from app.services.sla_service import SLAService
 from datetime import datetime
 import logging
 
@@ -50,6 +51,7 @@ def github_webhook():
             merged_at = utcnow()
             
         ticket.updated_at = merged_at
+        SLAService.record_resolution(ticket, merged_at)
         
         history = TicketStatusHistory(
             ticket_id=ticket.id,
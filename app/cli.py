@@ -0,0 +1,125 @@
+import click
+from app.core.database import db
+
+def register_cli_commands(app):
+    """Registers maintenance commands on the Flask CLI (run with `flask <command>`)."""
+
+    @app.cli.command('explain-queries')
+    def explain_queries():
+        """Print the database query plan for each hot query path."""
+        for label, plan in explain_hot_queries():
+            click.echo(f"== {label}")
+            for line in plan:
+                click.echo(f"   {line}")
+            click.echo("")
+
+    @app.cli.command('rebuild-ticket-stats')
+    @click.option('--batch-size', default=500, show_default=True, help='Tickets loaded per round trip.')
+    def rebuild_ticket_stats(batch_size):
+        """Recompute the ticket_daily_stats dashboard rollup from the tickets table."""
+        from app.services.ticket_stats_service import TicketStatsService
+
+        count = TicketStatsService.rebuild(batch_size=batch_size)
+        click.echo(f"Rebuilt ticket_daily_stats from {count} tickets.")
+
+    @app.cli.command('rebuild-archive-index')
+    def rebuild_archive_index():
+        """Recreate the archive index sidecar from the archived segments."""
+        from app.services.archive_service import ArchiveService
+
+        count = ArchiveService.rebuild_index()
+        click.echo(f"Indexed {count} archived tickets.")
+
+    @app.cli.command('restore-archived-tickets')
+    @click.argument('ticket_ids', nargs=-1, type=int)
+    @click.option('--created-by-id', type=int, help='Restore every archived ticket of this creator.')
+    @click.option('--team-id', type=int, help='Restore every archived ticket of this team.')
+    @click.option('--batch-size', default=500, show_default=True, help='Tickets inserted per transaction.')
+    def restore_archived_tickets(ticket_ids, created_by_id, team_id, batch_size):
+        """Re-insert archived tickets (by id, creator or team) with their comments and history."""
+        from app.services.archive_service import ArchiveService
+
+        ids = list(ticket_ids)
+        if created_by_id is not None or team_id is not None:
+            after_id = 0
+            while True:
+                entries = ArchiveService.search_archive(
+                    created_by_id=created_by_id, team_id=team_id, after_id=after_id, limit=1000
+                )
+                if not entries:
+                    break
+                ids.extend(entry["ticket_id"] for entry in entries)
+                after_id = entries[-1]["ticket_id"]
+        if not ids:
+            raise click.UsageError("Give ticket ids, --created-by-id or --team-id.")
+
+        result = ArchiveService.restore(ids, batch_size=batch_size)
+        click.echo(f"Restored {len(result['restored'])} tickets.")
+        for key, label in (("already_present", "Already in the database"),
+                           ("not_archived", "Not in the archive"),
+                           ("skipped", "Skipped (creator no longer exists)")):
+            if result[key]:
+                click.echo(f"{label}: {', '.join(str(i) for i in result[key])}")
+
+def _explain(statement):
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+    rows = db.session.connection().exec_driver_sql(prefix + sql).fetchall()
+    # SQLite returns (id, parent, notused, detail); Postgres returns one text column
+    return [str(row[-1]) for row in rows]
+
+def explain_hot_queries():
+    """Builds the hot queries used by TicketService, analytics_routes and NotificationService
+    and returns (label, plan lines) pairs for each.
+
+    Sample ids and values are fixed placeholders; the plan shape does not depend on them.
+    """
+    from sqlalchemy import select, func
+    from app.models.ticket import Ticket
+    from app.models.ticket_status_history import TicketStatusHistory
+    from app.models.comment import Comment
+    from app.models.notification import Notification
+    from app.models.activity_log import ActivityLog
+    from app.core.constants import TicketStatus
+
+    live = Ticket.is_deleted == False
+    queries = [
+        ("Ticket list (admin, newest first)",
+         select(Ticket).where(live, Ticket.is_demo == False)
+         .order_by(Ticket.created_at.desc()).limit(100)),
+        ("Ticket list (employee)",
+         select(Ticket).where(live, Ticket.is_demo == False, Ticket.created_by_id == 1)
+         .order_by(Ticket.created_at.desc()).limit(100)),
+        ("Ticket list (IT staff, team or assignee)",
+         select(Ticket).where(live, Ticket.is_demo == False,
+                              (Ticket.team_id == 1) | (Ticket.assigned_to_id == 1))
+         .order_by(Ticket.created_at.desc()).limit(100)),
+        ("Claim workload check",
+         select(func.count(Ticket.id)).where(live, Ticket.assigned_to_id == 1,
+                                             Ticket.status == TicketStatus.IN_PROGRESS)),
+        ("IT dashboard active team tickets",
+         select(func.count(Ticket.id)).where(live, Ticket.team_id == 1,
+                                             Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS]))),
+        ("Dashboard status breakdown",
+         select(Ticket.status, func.count(Ticket.id)).where(live, Ticket.is_demo == False)
+         .group_by(Ticket.status)),
+        ("GitHub webhook PR lookup",
+         select(Ticket).where(live, Ticket.github_pr_url == "https://github.com/org/repo/pull/1").limit(1)),
+        ("Ticket status history",
+         select(TicketStatusHistory).where(TicketStatusHistory.ticket_id == 1)),
+        ("Resolved trend buckets",
+         select(func.count(TicketStatusHistory.id)).where(
+             TicketStatusHistory.new_status == TicketStatus.RESOLVED,
+             TicketStatusHistory.changed_at >= "2026-01-01")),
+        ("Ticket comments",
+         select(Comment).where(Comment.ticket_id == 1)),
+        ("Notification feed",
+         select(Notification).where(Notification.user_id == 1)
+         .order_by(Notification.created_at.desc()).limit(20)),
+        ("Unread notification count",
+         select(func.count(Notification.id)).where(Notification.user_id == 1, Notification.is_read == False)),
+        ("Recent activity log",
+         select(ActivityLog).order_by(ActivityLog.timestamp.desc()).limit(20)),
+    ]
+    return [(label, _explain(statement)) for label, statement in queries]
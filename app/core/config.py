@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,6 +17,15 @@ class Config:
     MAIL_USE_TLS = os.getenv('MAIL_USE_TLS') == 'True'
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
+
+    # Outbound email queue (see app/services/email_worker.py)
+    MAIL_WORKERS = int(os.getenv('MAIL_WORKERS', 2))
+    MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+    MAIL_RETRY_BASE_SECONDS = int(os.getenv('MAIL_RETRY_BASE_SECONDS', 30))
+    MAIL_RETRY_MAX_SECONDS = int(os.getenv('MAIL_RETRY_MAX_SECONDS', 3600))
+    MAIL_POLL_SECONDS = int(os.getenv('MAIL_POLL_SECONDS', 5))
+    MAIL_CONNECTION_IDLE_SECONDS = int(os.getenv('MAIL_CONNECTION_IDLE_SECONDS', 60))
+    MAIL_TIMEOUT_SECONDS = int(os.getenv('MAIL_TIMEOUT_SECONDS', 30))
     
     # Upload config for PDF or attachments if needed
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
@@ -33,9 +43,21 @@ class Config:
     REDIS_URL = os.getenv('REDIS_URL')
     RATELIMIT_STORAGE_URI = REDIS_URL if REDIS_URL else 'memory://'
 
+    # How often (seconds) each worker re-checks the shared SLA policy version
+    SLA_CACHE_CHECK_SECONDS = int(os.getenv('SLA_CACHE_CHECK_SECONDS', 30))
+
+    # CSAT analytics results are reused for this long unless new feedback arrives
+    CSAT_CACHE_SECONDS = int(os.getenv('CSAT_CACHE_SECONDS', 60))
+
+    # Rendered ticket PDFs, keyed by ticket content version and evicted least recently served first
+    PDF_CACHE_FOLDER = os.getenv('PDF_CACHE_FOLDER', os.path.join(os.getcwd(), 'pdf_cache'))
+    PDF_CACHE_MAX_BYTES = int(os.getenv('PDF_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+
     # Data Retention (in days)
     RETENTION_DAYS = int(os.getenv('RETENTION_DAYS', 365))
     ARCHIVE_FOLDER = os.getenv('ARCHIVE_FOLDER', os.path.join(os.getcwd(), 'archive'))
+    # Tickets per archive segment and per purge transaction
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 500))
 
 
 class TestingConfig(Config):
@@ -45,4 +67,5 @@ class TestingConfig(Config):
     REDIS_URL = None
     RATELIMIT_STORAGE_URI = 'memory://'
     RETENTION_DAYS = 30
+    PDF_CACHE_FOLDER = os.path.join(tempfile.gettempdir(), 'ticket_tally_test_pdf_cache')
 
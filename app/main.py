@@ -84,6 +84,11 @@ def create_app(config_class=Config):
     if not app.config.get('TESTING'):
         scheduler.start()
 
+    # Deliver queued emails in the background (see EmailService.send_email)
+    if not app.config.get('TESTING') and app.config.get('MAIL_SERVER') and app.config.get('MAIL_USERNAME'):
+        from app.services.email_worker import email_worker_pool
+        email_worker_pool.start(app)
+
     swagger_config = {
         "headers": [],
         "specs": [
@@ -168,6 +173,10 @@ def create_app(config_class=Config):
     # Register Socket Events
     register_socket_events(socketio)
 
+    # Register CLI Commands
+    from app.cli import register_cli_commands
+    register_cli_commands(app)
+
     # Rate Limit Error Handler
     from flask_limiter.errors import RateLimitExceeded
     @app.errorhandler(RateLimitExceeded)
@@ -182,10 +191,28 @@ def create_app(config_class=Config):
             return e
         return jsonify({"error": str(e)}), 500
 
+    # Start every app with an empty SLA policy cache
+    from app.services.sla_service import SLAService
+    SLAService.invalidate_policy_cache()
+    from app.services.csat_service import CSATService
+    CSATService.clear_cache()
+    from app.services.notification_service import NotificationService
+    NotificationService.clear_recipient_cache()
+    from app.services.duplicate_service import DuplicateService
+    DuplicateService.reset()
+    from app.services.principal_service import PrincipalService
+    PrincipalService.clear_cache()
+
     # Trigger once on startup to process existing old tickets
     # Doing this at the very end ensures all models and blueprints are loaded
     if not app.config.get('TESTING'):
         with app.app_context():
+            try:
+                logger.info("Warming SLA policy cache...")
+                SLAService.get_policy_hours()
+            except Exception as e:
+                logger.error(f"Failed to warm SLA policy cache: {e}")
+            DuplicateService.start_background_build(app)
             try:
                 from app.services.ticket_service import TicketService
                 logger.info("Pre-starting auto-close job on application startup...")
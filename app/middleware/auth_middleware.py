@@ -1,9 +1,8 @@
 from functools import wraps
 from flask import request, jsonify, g
 from app.utils.jwt import decode_token
-from app.models.user import User
 from app.core.constants import UserRole
-from app.core.database import db
+from app.services.principal_service import PrincipalService
 
 def token_required(f):
     @wraps(f)
@@ -19,14 +18,16 @@ def token_required(f):
         
         try:
             payload = decode_token(token)
-            current_user = db.session.get(User, int(payload['sub']))
+            # Cached per worker; the User row itself is only loaded if the handler needs it
+            current_user = PrincipalService.get_principal(int(payload['sub']), token)
             if not current_user:
                 raise Exception("User not found")
+            if not current_user.is_active:
+                raise Exception("Account is deactivated")
             g.user = current_user
             
             # Read-Only Demo Enforcement
-            from app.core.config import Config
-            if g.user.email == Config.DEMO_EMAIL:
+            if g.user.is_demo:
                 if request.method in ['POST', 'PUT', 'DELETE', 'PATCH']:
                     # Allow logout if it exists as a protected route, otherwise block all state changes
                     # Assuming logout might be '/api/v1/auth/logout' or similar
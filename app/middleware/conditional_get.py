@@ -0,0 +1,49 @@
+import hashlib
+from functools import wraps
+from flask import request, g, make_response
+from app.services.table_version_service import TableVersionService, VERSIONED_TABLES
+
+def conditional_get(*tables, scope=None):
+    """Answers `If-None-Match` with 304 when nothing the response depends on has changed.
+
+    The ETag hashes the request path and query, the caller's identity and role (responses
+    are filtered per user) and the version counters of `tables`, read with one query before
+    the view runs. A matching request is answered without running the view's queries.
+    Must be applied below `token_required`.
+
+    Args:
+        *tables (str): Tables the response is built from; each must be in VERSIONED_TABLES.
+        scope (callable, optional): Called with the view's arguments; returns an extra
+            validator for a finer scope than whole tables (e.g. one ticket's version), or
+            None to skip the check and just run the view (e.g. the row does not exist).
+    """
+    unknown = set(tables) - VERSIONED_TABLES
+    if unknown:
+        raise ValueError(f"Tables without version counters: {', '.join(sorted(unknown))}")
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            versions = TableVersionService.get_versions(tables)
+            parts = [request.full_path, g.user.id, g.user.email, g.user.role.value, g.user.team_id]
+            parts += [f"{table}={versions[table]}" for table in tables]
+            if scope is not None:
+                extra = scope(*args, **kwargs)
+                if extra is None:
+                    return f(*args, **kwargs)
+                parts.append(extra)
+            etag = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Responses are per-user; clients must revalidate with the ETag on every use
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Authorization')
+            return response
+        return decorated
+    return decorator
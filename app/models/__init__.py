@@ -1,4 +1,5 @@
 from app.models.user import User
+from app.models.user_specialization import UserSpecialization
 from app.models.team import Team
 from app.models.ticket import Ticket
 from app.models.ticket_status_history import TicketStatusHistory
@@ -11,3 +12,8 @@ from app.models.event import Event
 from app.models.activity_log import ActivityLog
 from app.models.csat_feedback import CSATFeedback
 
+from app.models.cache_version import CacheVersion
+from app.models.ticket_daily_stat import TicketDailyStat
+from app.models.email_outbox import EmailOutbox
+# Registers the full-text search DDL on the tickets and comments tables
+from app.models import ticket_search
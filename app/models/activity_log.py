@@ -9,7 +9,7 @@ class ActivityLog(db.Model):
     ticket_id = db.Column(db.Integer, db.ForeignKey("tickets.id", ondelete="CASCADE"), nullable=False)
     message = db.Column(db.Text, nullable=False)
     created_by = db.Column(db.String(100), nullable=False)
-    timestamp = db.Column(db.DateTime, default=utcnow)
+    timestamp = db.Column(db.DateTime, default=utcnow, index=True)
 
     # Relationship
     ticket = db.relationship("Ticket", backref=db.backref("activity_logs", cascade="all, delete-orphan"))
@@ -0,0 +1,13 @@
+from app.utils.time_utils import utcnow
+from app.core.database import db
+
+class CacheVersion(db.Model):
+    __tablename__ = "cache_versions"
+
+    # One row per named in-process cache; workers compare against their loaded version
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow)
+
+    def __repr__(self):
+        return f"<CacheVersion {self.name}={self.version}>"
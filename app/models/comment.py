@@ -9,7 +9,7 @@ class Comment(db.Model):
     created_at = db.Column(db.DateTime, default=utcnow)
     
     # Foreign Keys
-    ticket_id = db.Column(db.Integer, db.ForeignKey("tickets.id"), nullable=False)
+    ticket_id = db.Column(db.Integer, db.ForeignKey("tickets.id"), nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     
     # Relationships
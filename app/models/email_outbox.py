@@ -0,0 +1,36 @@
+from app.utils.time_utils import utcnow
+from app.core.database import db
+
+class EmailOutbox(db.Model):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Worker poll: due pending rows, oldest first
+        db.Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    reply_to = db.Column(db.String(255), nullable=True)
+    sender_name = db.Column(db.String(255), nullable=True)
+    # [{"filename": ..., "content": <base64>}]
+    attachments = db.Column(db.JSON, nullable=True)
+    # Rendered by the worker at send time, e.g. [{"kind": "ticket_pdf", "ticket_id": 1, "filename": ...}]
+    deferred_attachments = db.Column(db.JSON, nullable=True)
+
+    status = db.Column(db.String(20), nullable=False, default=PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<EmailOutbox {self.id} {self.status} to={self.to_email}>"
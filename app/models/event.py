@@ -3,6 +3,12 @@ from app.core.database import db
 
 class Event(db.Model):
     __tablename__ = "events"
+    __table_args__ = (
+        # Calendar views ask for the events overlapping a window
+        db.Index('ix_events_start_time_end_time', 'start_time', 'end_time'),
+        # max(updated_at) is half of the conditional GET validator (see TableVersionService)
+        db.Index('ix_events_updated_at', 'updated_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -1,9 +1,27 @@
 from app.utils.time_utils import utcnow
 from app.core.database import db, SoftDeleteMixin
-from app.core.constants import TicketStatus, TicketPriority
+from app.core.constants import TicketStatus, TicketPriority, SLAStatus
 
 class Ticket(db.Model, SoftDeleteMixin):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Matched to the role-scoped list, dashboard and workload queries in TicketService / analytics_routes
+        db.Index("ix_tickets_is_demo_created_at", "is_demo", "created_at"),
+        db.Index("ix_tickets_team_id_status", "team_id", "status"),
+        db.Index("ix_tickets_assigned_to_id_status", "assigned_to_id", "status"),
+        db.Index("ix_tickets_created_by_id_status", "created_by_id", "status"),
+        # SLA compliance GROUP BY (see SLAService.get_compliance_counts)
+        db.Index("ix_tickets_is_demo_sla_state_sla_due_at", "is_demo", "sla_state", "sla_due_at"),
+        # max(updated_at) is half of the conditional GET validator (see TableVersionService)
+        db.Index("ix_tickets_updated_at", "updated_at"),
+        # Webhook lookup; most tickets never get a PR link so only index the ones that do
+        db.Index(
+            "ix_tickets_github_pr_url",
+            "github_pr_url",
+            postgresql_where=db.text("github_pr_url IS NOT NULL"),
+            sqlite_where=db.text("github_pr_url IS NOT NULL")
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -18,6 +36,12 @@ class Ticket(db.Model, SoftDeleteMixin):
     team_id = db.Column(db.Integer, db.ForeignKey("teams.id"), nullable=True)
     
     github_pr_url = db.Column(db.String(255), nullable=True)
+
+    # Materialized SLA tracking, maintained by SLAService
+    sla_due_at = db.Column(db.DateTime, nullable=True)
+    first_resolved_at = db.Column(db.DateTime, nullable=True)
+    sla_state = db.Column(db.Enum(SLAStatus), default=SLAStatus.PENDING, nullable=True)
+
     created_at = db.Column(db.DateTime, default=utcnow)
     updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow)
 
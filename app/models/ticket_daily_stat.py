@@ -0,0 +1,29 @@
+from app.core.database import db
+from app.core.constants import TicketStatus, TicketPriority
+
+class TicketDailyStat(db.Model):
+    __tablename__ = "ticket_daily_stats"
+    __table_args__ = (
+        db.Index(
+            "ix_ticket_daily_stats_key",
+            "stat_date", "is_demo", "team_id", "category", "priority", "status"
+        ),
+    )
+
+    # Rollup of ticket counters per day and (team, category, priority, status), maintained by
+    # TicketStatsService. Summing entered_count - exited_count over all days for a key gives the
+    # number of tickets currently in that key.
+    id = db.Column(db.Integer, primary_key=True)
+    stat_date = db.Column(db.Date, nullable=False)
+    is_demo = db.Column(db.Boolean, nullable=False, default=False)
+    team_id = db.Column(db.Integer, db.ForeignKey("teams.id"), nullable=True)
+    category = db.Column(db.String(50), nullable=True)
+    priority = db.Column(db.Enum(TicketPriority), nullable=False)
+    status = db.Column(db.Enum(TicketStatus), nullable=False)
+
+    created_count = db.Column(db.Integer, nullable=False, default=0)
+    entered_count = db.Column(db.Integer, nullable=False, default=0)
+    exited_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TicketDailyStat {self.stat_date} {self.status} +{self.entered_count}/-{self.exited_count}>"
@@ -0,0 +1,88 @@
+"""Full-text search index over ticket titles, descriptions and comments.
+
+Neither index is an ORM model. On Postgres, `tickets.search_vector` is a weighted tsvector
+column with a GIN index. On SQLite, `tickets_fts` is an FTS5 table whose rowid is the
+ticket id. Database triggers keep both in step with every insert, update and delete of
+tickets and comments, including bulk statements that bypass the ORM. The DDL runs with
+`db.create_all()` and is mirrored by the add_ticket_full_text_search migration.
+"""
+from sqlalchemy import DDL, event
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+
+SQLITE_FTS_TABLE = "tickets_fts"
+
+_COMMENTS_TEXT = "(SELECT group_concat(text, ' ') FROM comments WHERE ticket_id = {ticket})"
+
+SQLITE_TICKET_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} "
+    "USING fts5(title, description, comments, tokenize = 'porter unicode61')",
+    f"""CREATE TRIGGER IF NOT EXISTS tickets_fts_insert AFTER INSERT ON tickets BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, description, comments)
+        VALUES (new.id, new.title, new.description, '');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tickets_fts_update AFTER UPDATE OF title, description ON tickets BEGIN
+        UPDATE {SQLITE_FTS_TABLE} SET title = new.title, description = new.description WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tickets_fts_delete AFTER DELETE ON tickets BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = old.id;
+    END""",
+]
+
+SQLITE_COMMENT_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+        UPDATE {SQLITE_FTS_TABLE} SET comments = {_COMMENTS_TEXT.format(ticket='new.ticket_id')}
+        WHERE rowid = new.ticket_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF text ON comments BEGIN
+        UPDATE {SQLITE_FTS_TABLE} SET comments = {_COMMENTS_TEXT.format(ticket='new.ticket_id')}
+        WHERE rowid = new.ticket_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+        UPDATE {SQLITE_FTS_TABLE} SET comments = coalesce({_COMMENTS_TEXT.format(ticket='old.ticket_id')}, '')
+        WHERE rowid = old.ticket_id;
+    END""",
+]
+
+# Title outranks description, which outranks comments (ts_rank weights A > B > C)
+POSTGRES_TICKET_DDL = [
+    "ALTER TABLE tickets ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_tickets_search_vector ON tickets USING gin (search_vector)",
+    """CREATE OR REPLACE FUNCTION tickets_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT string_agg(text, ' ') FROM comments WHERE ticket_id = NEW.id), '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER tickets_search_vector BEFORE INSERT OR UPDATE OF title, description ON tickets
+    FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_refresh()""",
+]
+
+POSTGRES_COMMENT_DDL = [
+    """CREATE OR REPLACE FUNCTION comments_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        -- Re-running the ticket trigger recomputes the vector with the current comments
+        UPDATE tickets SET title = title
+        WHERE id = CASE WHEN TG_OP = 'DELETE' THEN OLD.ticket_id ELSE NEW.ticket_id END;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER comments_search_vector AFTER INSERT OR DELETE OR UPDATE OF text ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_refresh()""",
+]
+
+def _listen(table, when, statements, dialect):
+    for statement in statements:
+        # DDL treats % as a format character
+        event.listen(table, when, DDL(statement.replace("%", "%%")).execute_if(dialect=dialect))
+
+_listen(Ticket.__table__, "after_create", SQLITE_TICKET_DDL, "sqlite")
+_listen(Comment.__table__, "after_create", SQLITE_COMMENT_DDL, "sqlite")
+_listen(Ticket.__table__, "after_create", POSTGRES_TICKET_DDL, "postgresql")
+_listen(Comment.__table__, "after_create", POSTGRES_COMMENT_DDL, "postgresql")
+# The triggers are dropped with their tables; the FTS5 table is not
+_listen(Ticket.__table__, "before_drop", [f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}"], "sqlite")
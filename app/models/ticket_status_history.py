@@ -4,9 +4,13 @@ from app.core.constants import TicketStatus
 
 class TicketStatusHistory(db.Model):
     __tablename__ = "ticket_status_history"
+    __table_args__ = (
+        # Resolved-per-bucket trend queries (see TrendService)
+        db.Index("ix_ticket_status_history_new_status_changed_at", "new_status", "changed_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    ticket_id = db.Column(db.Integer, db.ForeignKey("tickets.id"), nullable=False)
+    ticket_id = db.Column(db.Integer, db.ForeignKey("tickets.id"), nullable=False, index=True)
     
     old_status = db.Column(db.Enum(TicketStatus), nullable=True)
     new_status = db.Column(db.Enum(TicketStatus), nullable=False)
@@ -1,9 +1,21 @@
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.ext.orderinglist import ordering_list
 from app.utils.time_utils import utcnow
 from app.core.database import db
 from app.core.constants import UserRole
 
 class User(db.Model):
     __tablename__ = "users"
+    __table_args__ = (
+        # Prefix search in UserService matches on lower(name) / lower(email). On Postgres the
+        # pattern operator class lets LIKE 'prefix%' use the index under any collation.
+        db.Index("ix_users_lower_full_name", db.text("lower(full_name)")).ddl_if(dialect="sqlite"),
+        db.Index("ix_users_lower_email", db.text("lower(email)")).ddl_if(dialect="sqlite"),
+        db.Index("ix_users_lower_full_name", db.text("lower(full_name) text_pattern_ops")).ddl_if(dialect="postgresql"),
+        db.Index("ix_users_lower_email", db.text("lower(email) text_pattern_ops")).ddl_if(dialect="postgresql"),
+        # Role-filtered, newest-first user pages
+        db.Index("ix_users_role_created_at", "role", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -15,12 +27,18 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=utcnow)
     is_active = db.Column(db.Boolean, default=True)
     preferences = db.Column(db.JSON, default={})
-    specializations = db.Column(db.JSON, default=[])
 
     # Relationships
     team = db.relationship("Team", back_populates="members")
     created_tickets = db.relationship("Ticket", foreign_keys="[Ticket.created_by_id]", back_populates="creator")
     assigned_tickets = db.relationship("Ticket", foreign_keys="[Ticket.assigned_to_id]", back_populates="assignee")
+    specialization_entries = db.relationship(
+        "UserSpecialization", back_populates="user", order_by="UserSpecialization.position",
+        collection_class=ordering_list("position"), cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    # Reads and assigns a plain list of names, e.g. ["VPN", "Printers"]
+    specializations = association_proxy("specialization_entries", "name")
 
     def __repr__(self):
         return f"<User {self.email} - {self.role.value}>"
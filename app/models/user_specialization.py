@@ -0,0 +1,26 @@
+from app.core.database import db
+
+class UserSpecialization(db.Model):
+    __tablename__ = "user_specializations"
+    # Exact specialty filters and the distinct specialty list read this index only
+    __table_args__ = (
+        db.Index("ix_user_specializations_name_lower", "name_lower", "user_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    name_lower = db.Column(db.String(100), nullable=False)
+    # Keeps the order the agent entered them in
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    user = db.relationship("User", back_populates="specialization_entries")
+
+    def __init__(self, name=None, **kwargs):
+        if name is not None:
+            name = name.strip()
+            kwargs.setdefault("name_lower", name.lower())
+        super().__init__(name=name, **kwargs)
+
+    def __repr__(self):
+        return f"<UserSpecialization {self.user_id}: {self.name}>"
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class SLAUpdate(BaseModel):
+    response_time_hours: Optional[int] = Field(None, ge=1, description="Hours allowed before first response")
+    resolution_time_hours: Optional[int] = Field(None, ge=1, description="Hours allowed before resolution")
@@ -0,0 +1,106 @@
+from itertools import chain
+from sqlalchemy import event, inspect, select, or_, func
+from sqlalchemy.orm import joinedload, selectinload
+from app.core.database import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.user_specialization import UserSpecialization
+from app.core.constants import UserRole
+from app.services.cache_version_service import CacheVersionService
+from app.utils.cache import TTLCache
+
+SPECIALTIES_CACHE = "agent_specialties"
+
+# The distinct specialty list, invalidated whenever an agent's specialties or status change
+_specialties = TTLCache(maxsize=1, ttl=600)
+
+_AGENT_FIELDS = ("role", "is_active", "email")
+
+def _agent_filters():
+    from app.core.config import Config
+    return (
+        User.role.in_([UserRole.IT_STAFF, UserRole.ADMIN]),
+        User.is_active == True,
+        User.email != Config.DEMO_EMAIL
+    )
+
+class AgentDirectoryService:
+    @staticmethod
+    def search_agents(search=None, specialty=None):
+        """Builds the query for active agents (IT staff and admins), ordered by name.
+
+        Args:
+            search (str, optional): Case-insensitive substring of the agent's name, email,
+                team name or one of their specialties.
+            specialty (str, optional): A specialty the agent must have (case-insensitive).
+
+        Returns:
+            Query: Agents with their team and specialties eagerly loaded.
+        """
+        query = User.query.filter(*_agent_filters())
+
+        if specialty:
+            query = query.filter(User.id.in_(
+                select(UserSpecialization.user_id)
+                .where(UserSpecialization.name_lower == specialty.strip().lower())
+            ))
+
+        if search:
+            term = search.strip().lower()
+            query = query.outerjoin(Team, User.team_id == Team.id).filter(or_(
+                func.lower(User.full_name).contains(term, autoescape=True),
+                func.lower(User.email).contains(term, autoescape=True),
+                func.lower(Team.name).contains(term, autoescape=True),
+                User.id.in_(
+                    select(UserSpecialization.user_id)
+                    .where(UserSpecialization.name_lower.contains(term, autoescape=True))
+                )
+            ))
+
+        return query.options(
+            joinedload(User.team),
+            selectinload(User.specialization_entries)
+        ).order_by(User.full_name, User.id)
+
+    @staticmethod
+    def get_specialties():
+        """Returns the sorted distinct specialties of active agents, cached per worker."""
+        version = CacheVersionService.get_version(SPECIALTIES_CACHE)
+        specialties = _specialties.get("all", version=version)
+        if specialties is None:
+            names = db.session.scalars(
+                select(UserSpecialization.name).distinct()
+                .join(User, User.id == UserSpecialization.user_id)
+                .where(*_agent_filters())
+            ).all()
+            specialties = sorted(name for name in names if name)
+            _specialties.set("all", specialties, version=version)
+        return specialties
+
+    @staticmethod
+    def clear_cache():
+        """Drops this worker's cached specialty list."""
+        _specialties.clear()
+
+@event.listens_for(db.Session, "after_flush")
+def _bump_specialties_version(session, flush_context):
+    if session.info.get('specialties_changed'):
+        return
+    changed = any(
+        isinstance(obj, UserSpecialization) for obj in chain(session.new, session.deleted, session.dirty)
+    ) or any(isinstance(obj, User) for obj in session.deleted) or any(
+        isinstance(obj, User) and any(inspect(obj).attrs[name].history.has_changes() for name in _AGENT_FIELDS)
+        for obj in session.dirty
+    )
+    if changed:
+        CacheVersionService.bump(SPECIALTIES_CACHE, connection=session.connection())
+        session.info['specialties_changed'] = True
+
+@event.listens_for(db.Session, "after_commit")
+def _clear_local_specialties(session):
+    if session.info.pop('specialties_changed', False):
+        _specialties.clear()
+
+@event.listens_for(db.Session, "after_rollback")
+def _discard_specialties_change(session):
+    session.info.pop('specialties_changed', None)
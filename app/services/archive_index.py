@@ -0,0 +1,172 @@
+import gzip
+import json
+import os
+import sqlite3
+import zlib
+from contextlib import closing
+
+INDEX_FILE = "index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived_tickets (
+    ticket_id INTEGER PRIMARY KEY,
+    created_by_id INTEGER,
+    team_id INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_archived_tickets_created_by_id ON archived_tickets (created_by_id, ticket_id);
+CREATE INDEX IF NOT EXISTS ix_archived_tickets_team_id ON archived_tickets (team_id, ticket_id);
+CREATE INDEX IF NOT EXISTS ix_archived_tickets_updated_at ON archived_tickets (updated_at);
+"""
+
+_COLUMNS = ("ticket_id", "created_by_id", "team_id", "created_at", "updated_at", "segment", "offset", "length")
+
+def index_row(record, segment, offset, length):
+    """Builds the index row for one archived ticket record."""
+    return (record["id"], record.get("created_by_id"), record.get("team_id"),
+            record.get("created_at"), record.get("updated_at"), segment, offset, length)
+
+def iter_members(path):
+    """Yields (offset, length, record) for every gzip member of a segment file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset < len(data):
+        decompressor = zlib.decompressobj(wbits=31)
+        payload = decompressor.decompress(data[offset:])
+        length = len(data) - offset - len(decompressor.unused_data)
+        yield offset, length, json.loads(payload)
+        offset += length
+
+class ArchiveIndex:
+    """SQLite sidecar next to the archive segments that maps an archived ticket to the segment
+    and byte range of its record.
+
+    Lookups by ticket id go through the primary key B-tree; creator, team and last-activity
+    date have secondary indexes. The file is derived data and can be rebuilt from the
+    segments at any time with `rebuild`.
+    """
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.path = os.path.join(archive_dir, INDEX_FILE)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def add(self, rows):
+        """Records (or replaces) index rows built with `index_row`."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO archived_tickets ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                rows
+            )
+
+    def lookup(self, ticket_id):
+        """Returns the index entry of an archived ticket as a dict, or None."""
+        if not os.path.exists(self.path):
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM archived_tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+        return dict(row) if row else None
+
+    def lookup_many(self, ticket_ids):
+        """Returns {ticket_id: index entry} for the archived tickets among `ticket_ids`."""
+        if not ticket_ids or not os.path.exists(self.path):
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT * FROM archived_tickets WHERE ticket_id IN ({', '.join('?' for _ in ticket_ids)})",
+                list(ticket_ids)
+            ).fetchall()
+        return {row["ticket_id"]: dict(row) for row in rows}
+
+    def search(self, created_by_id=None, team_id=None, updated_from=None, updated_to=None,
+               after_id=0, limit=100):
+        """Returns index entries matching all given filters, ordered by ticket id.
+
+        Args:
+            created_by_id (int, optional): Creator of the ticket.
+            team_id (int, optional): Team of the ticket.
+            updated_from (str, optional): ISO date; last activity on or after it.
+            updated_to (str, optional): ISO date; last activity before it.
+            after_id (int, optional): Keyset cursor, only tickets with a greater id.
+            limit (int, optional): Maximum number of entries. Defaults to 100.
+
+        Returns:
+            list[dict]: The matching index entries.
+        """
+        if not os.path.exists(self.path):
+            return []
+        clauses, params = ["ticket_id > ?"], [after_id]
+        if created_by_id is not None:
+            clauses.append("created_by_id = ?")
+            params.append(created_by_id)
+        if team_id is not None:
+            clauses.append("team_id = ?")
+            params.append(team_id)
+        if updated_from:
+            clauses.append("updated_at >= ?")
+            params.append(updated_from)
+        if updated_to:
+            clauses.append("updated_at < ?")
+            params.append(updated_to)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT * FROM archived_tickets WHERE {' AND '.join(clauses)} ORDER BY ticket_id LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def read(self, entry):
+        """Reads and decompresses the single record an index entry points at."""
+        return self.read_many([entry])[0]
+
+    def read_many(self, entries):
+        """Reads the records of several index entries, opening each segment once.
+
+        Returns:
+            list[dict]: The records, in the order of `entries`.
+        """
+        records = [None] * len(entries)
+        by_segment = {}
+        for position, entry in enumerate(entries):
+            by_segment.setdefault(entry["segment"], []).append((entry["offset"], position, entry["length"]))
+        for segment, members in by_segment.items():
+            with open(os.path.join(self.archive_dir, segment), "rb") as f:
+                for offset, position, length in sorted(members):
+                    f.seek(offset)
+                    records[position] = json.loads(gzip.decompress(f.read(length)))
+        return records
+
+    def rebuild(self, segments):
+        """Recreates the index by scanning the given segment files.
+
+        Returns:
+            int: The number of records indexed.
+        """
+        tmp_path = self.path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        staging = ArchiveIndex(self.archive_dir)
+        staging.path = tmp_path
+        count = 0
+        for segment in segments:
+            rows = [index_row(record, segment, offset, length)
+                    for offset, length, record in iter_members(os.path.join(self.archive_dir, segment))]
+            staging.add(rows)
+            count += len(rows)
+        if count == 0:
+            # Still create the (empty) schema so the swap below has a file to move
+            with closing(staging._connect()):
+                pass
+        os.replace(tmp_path, self.path)
+        return count
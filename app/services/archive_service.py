@@ -0,0 +1,492 @@
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, insert, delete
+from app.core.database import db
+from app.core.constants import TicketStatus, TicketPriority, SLAStatus
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+from app.models.ticket_status_history import TicketStatusHistory
+from app.models.csat_feedback import CSATFeedback
+from app.models.activity_log import ActivityLog
+from app.models.user import User
+from app.models.team import Team
+from app.services.archive_index import ArchiveIndex, index_row
+from app.utils.time_utils import utcnow
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single-process deployments only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.jsonl"
+CHECKPOINT_FILE = "checkpoint.json"
+LOCK_FILE = ".purge.lock"
+
+def _value(enum_value):
+    return enum_value.value if hasattr(enum_value, 'value') else enum_value
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+def _datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+def _archive_dir():
+    return current_app.config.get('ARCHIVE_FOLDER', os.path.join(os.getcwd(), 'archive'))
+
+def _write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _eligible(cutoff):
+    return (
+        (Ticket.status.in_([TicketStatus.CLOSED, TicketStatus.WITHDRAWN]) | (Ticket.is_deleted == True)),
+        Ticket.updated_at <= cutoff
+    )
+
+class ArchiveService:
+    """Archives and purges tickets past the retention period in fixed-size batches.
+
+    Each batch is written to its own gzip-compressed JSONL segment in ARCHIVE_FOLDER, listed
+    in the append-only `manifest.jsonl`, and then removed from the database with one bulk
+    DELETE per table and one commit. Every ticket record is a separate gzip member, so a
+    segment can be read sequentially with `gzip.open` or one record at a time from its offset.
+
+    Each record's segment and byte range is recorded in the `index.sqlite` sidecar (see
+    `ArchiveIndex`), so a single archived ticket can be fetched or restored without scanning.
+
+    Progress is kept in `checkpoint.json`: a run that is interrupted resumes with the same
+    cutoff after the last purged batch, and a batch that was archived but not yet deleted is
+    deleted without being archived a second time.
+    """
+
+    @staticmethod
+    def archive_and_purge(batch_size: int = None) -> int:
+        """Runs (or resumes) the retention purge.
+
+        Args:
+            batch_size (int, optional): Tickets per segment and transaction. Defaults to
+                ARCHIVE_BATCH_SIZE.
+
+        Returns:
+            int: The number of tickets purged by this call.
+        """
+        config = current_app.config
+        archive_dir = _archive_dir()
+        batch_size = batch_size or config.get('ARCHIVE_BATCH_SIZE', 500)
+        os.makedirs(archive_dir, exist_ok=True)
+
+        with open(os.path.join(archive_dir, LOCK_FILE), "w") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    logger.info("Data retention purge already running in another process; skipping.")
+                    return 0
+            return ArchiveService._run(archive_dir, batch_size, config.get('RETENTION_DAYS', 365))
+
+    @staticmethod
+    def _run(archive_dir, batch_size, retention_days):
+        checkpoint_path = os.path.join(archive_dir, CHECKPOINT_FILE)
+        count = 0
+
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            logger.info(f"Resuming data retention purge {checkpoint['run_id']} after ticket #{checkpoint['last_id']}.")
+            if checkpoint.get("pending"):
+                # Archived before the interruption; only the DELETE may be missing
+                count += ArchiveService._purge(checkpoint["pending"]["ticket_ids"])
+                checkpoint["pending"] = None
+                _write_json_atomic(checkpoint_path, checkpoint)
+        else:
+            now = utcnow()
+            checkpoint = {
+                "run_id": now.strftime("%Y%m%dT%H%M%S"),
+                "cutoff": (now - timedelta(days=retention_days)).isoformat(),
+                "last_id": 0,
+                "next_segment": 1,
+                "pending": None
+            }
+            logger.info(f"[{now}] Starting data retention purge (cutoff date: {checkpoint['cutoff']}, retention: {retention_days} days)...")
+
+        cutoff = datetime.fromisoformat(checkpoint["cutoff"])
+        while True:
+            ticket_ids = db.session.scalars(
+                select(Ticket.id)
+                .where(*_eligible(cutoff), Ticket.id > checkpoint["last_id"])
+                .order_by(Ticket.id)
+                .limit(batch_size)
+                .execution_options(include_deleted=True)
+            ).all()
+            if not ticket_ids:
+                break
+
+            segment = f"tickets-{checkpoint['run_id']}-{checkpoint['next_segment']:05d}.jsonl.gz"
+            records = ArchiveService._load_records(ticket_ids)
+            entry = ArchiveService._write_segment(archive_dir, segment, records)
+            with open(os.path.join(archive_dir, MANIFEST_FILE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            checkpoint.update(
+                last_id=ticket_ids[-1],
+                next_segment=checkpoint["next_segment"] + 1,
+                pending={"segment": segment, "ticket_ids": ticket_ids}
+            )
+            _write_json_atomic(checkpoint_path, checkpoint)
+
+            count += ArchiveService._purge(ticket_ids)
+            checkpoint["pending"] = None
+            _write_json_atomic(checkpoint_path, checkpoint)
+            logger.info(f"Archived {len(records)} tickets to {segment}.")
+
+        # A run that found nothing to archive never wrote a checkpoint
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        if count > 0:
+            logger.info(f"Successfully archived and purged {count} tickets.")
+        else:
+            logger.info("No tickets met the retention criteria for purging.")
+        return count
+
+    @staticmethod
+    def _load_records(ticket_ids):
+        """Builds the archive records of a batch with one query per table."""
+        tickets = db.session.execute(
+            select(Ticket.__table__).where(Ticket.id.in_(ticket_ids)).order_by(Ticket.id)
+        ).all()
+
+        comments = defaultdict(list)
+        for c in db.session.execute(
+            select(Comment.__table__, User.full_name.label("author_name"))
+            .outerjoin(User, User.id == Comment.user_id)
+            .where(Comment.ticket_id.in_(ticket_ids))
+            .order_by(Comment.id)
+        ):
+            comments[c.ticket_id].append({
+                "id": c.id,
+                "text": c.text,
+                "user_id": c.user_id,
+                "parent_id": c.parent_id,
+                "author_name": c.author_name or "Unknown",
+                "created_at": _iso(c.created_at)
+            })
+
+        history = defaultdict(list)
+        for h in db.session.execute(
+            select(TicketStatusHistory.__table__)
+            .where(TicketStatusHistory.ticket_id.in_(ticket_ids))
+            .order_by(TicketStatusHistory.id)
+        ):
+            history[h.ticket_id].append({
+                "id": h.id,
+                "old_status": _value(h.old_status) if h.old_status else None,
+                "new_status": _value(h.new_status),
+                "changed_by_id": h.changed_by_id,
+                "changed_at": _iso(h.changed_at)
+            })
+
+        feedback = {
+            f.ticket_id: {
+                "id": f.id,
+                "rating": f.rating,
+                "comment": f.comment,
+                "user_id": f.user_id,
+                "created_at": _iso(f.created_at)
+            }
+            for f in db.session.execute(
+                select(CSATFeedback.__table__).where(CSATFeedback.ticket_id.in_(ticket_ids))
+            )
+        }
+
+        return [{
+            "id": t.id,
+            "title": t.title,
+            "description": t.description,
+            "category": t.category,
+            "status": _value(t.status),
+            "priority": _value(t.priority),
+            "is_demo": t.is_demo,
+            "created_by_id": t.created_by_id,
+            "assigned_to_id": t.assigned_to_id,
+            "team_id": t.team_id,
+            "github_pr_url": t.github_pr_url,
+            "sla_due_at": _iso(t.sla_due_at),
+            "first_resolved_at": _iso(t.first_resolved_at),
+            "sla_state": _value(t.sla_state) if t.sla_state else None,
+            "created_at": _iso(t.created_at),
+            "updated_at": _iso(t.updated_at),
+            "is_deleted": t.is_deleted,
+            "deleted_at": _iso(t.deleted_at),
+            "comments": comments[t.id],
+            "status_history": history[t.id],
+            "feedback": feedback.get(t.id)
+        } for t in tickets]
+
+    @staticmethod
+    def _write_segment(archive_dir, segment, records):
+        path = os.path.join(archive_dir, segment)
+        tmp_path = path + ".tmp"
+        index_rows = []
+        with open(tmp_path, "wb") as f:
+            for record in records:
+                member = gzip.compress(json.dumps(record).encode("utf-8") + b"\n")
+                index_rows.append(index_row(record, segment, f.tell(), len(member)))
+                f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        # Written before the tickets are deleted, so every purged ticket is always findable
+        ArchiveIndex(archive_dir).add(index_rows)
+        return {
+            "segment": segment,
+            "count": len(records),
+            "first_id": records[0]["id"],
+            "last_id": records[-1]["id"],
+            "bytes": os.path.getsize(path),
+            "created_at": utcnow().isoformat()
+        }
+
+    @staticmethod
+    def _purge(ticket_ids):
+        """Deletes a batch of tickets and their dependent rows in one transaction.
+
+        Safe to repeat: tickets that are already gone are skipped.
+
+        Returns:
+            int: The number of tickets deleted.
+        """
+        from app.services.ticket_stats_service import TicketStatsService
+        from app.services.cache_version_service import CacheVersionService
+        from app.services.csat_service import CSAT_CACHE, CSATService
+
+        # Bulk DELETEs bypass the ORM flush hooks, so the rollup and CSAT cache are updated here
+        live = db.session.execute(
+            select(Ticket.is_demo, Ticket.team_id, Ticket.category, Ticket.priority, Ticket.status)
+            .where(Ticket.id.in_(ticket_ids), Ticket.is_deleted == False)
+            .execution_options(include_deleted=True)
+        ).all()
+        has_feedback = db.session.execute(
+            select(CSATFeedback.id).where(CSATFeedback.ticket_id.in_(ticket_ids)).limit(1)
+        ).first() is not None
+
+        for model in (ActivityLog, CSATFeedback, Comment, TicketStatusHistory):
+            db.session.execute(
+                delete(model).where(model.ticket_id.in_(ticket_ids)),
+                execution_options={"synchronize_session": False}
+            )
+        result = db.session.execute(
+            delete(Ticket).where(Ticket.id.in_(ticket_ids)),
+            execution_options={"synchronize_session": False, "include_deleted": True}
+        )
+
+        today = utcnow().date()
+        deltas = defaultdict(lambda: [0, 0, 0])
+        for is_demo, team_id, category, priority, status in live:
+            deltas[(today, bool(is_demo), team_id, category, priority, status)][2] += 1
+        TicketStatsService.apply_deltas(deltas)
+        if has_feedback:
+            CacheVersionService.bump(CSAT_CACHE)
+
+        db.session.commit()
+        if has_feedback:
+            CSATService.clear_cache()
+        return result.rowcount
+
+    @staticmethod
+    def read_manifest(archive_dir: str = None) -> list:
+        """Returns the manifest entries ('segment', 'count', 'first_id', 'last_id', 'bytes',
+        'created_at'), oldest first."""
+        archive_dir = archive_dir or _archive_dir()
+        path = os.path.join(archive_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def iter_records(archive_dir: str = None):
+        """Yields every archived ticket record, segment by segment, in archive order."""
+        archive_dir = archive_dir or _archive_dir()
+        for entry in ArchiveService.read_manifest(archive_dir):
+            with gzip.open(os.path.join(archive_dir, entry["segment"]), "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+
+    @staticmethod
+    def get_archived_ticket(ticket_id: int) -> dict:
+        """Fetches one archived ticket through the index.
+
+        Returns:
+            dict: The archived record (with comments, status history and feedback), or None.
+        """
+        index = ArchiveIndex(_archive_dir())
+        entry = index.lookup(ticket_id)
+        return index.read(entry) if entry else None
+
+    @staticmethod
+    def search_archive(**filters) -> list:
+        """Lists index entries of archived tickets; see `ArchiveIndex.search` for the filters."""
+        return ArchiveIndex(_archive_dir()).search(**filters)
+
+    @staticmethod
+    def rebuild_index() -> int:
+        """Recreates `index.sqlite` from the segments listed in the manifest.
+
+        Returns:
+            int: The number of records indexed.
+        """
+        archive_dir = _archive_dir()
+        segments = [entry["segment"] for entry in ArchiveService.read_manifest(archive_dir)]
+        return ArchiveIndex(archive_dir).rebuild(segments)
+
+    @staticmethod
+    def restore(ticket_ids, batch_size: int = None) -> dict:
+        """Re-inserts archived tickets with their comments, status history and feedback.
+
+        Rows keep their original ids and are inserted with one multi-row INSERT per table
+        per batch. Tickets that still exist are left alone; references to users or teams
+        that no longer exist are cleared, and rows that cannot exist without their user
+        (the ticket itself for a missing creator, comments, feedback) are skipped.
+
+        A restored ticket keeps its status and deletion flag, but its `updated_at` is set to
+        the restore time, so it stays for another full retention period instead of being
+        archived and purged again by the next run.
+
+        Args:
+            ticket_ids (list[int]): The archived tickets to restore.
+            batch_size (int, optional): Tickets per transaction. Defaults to ARCHIVE_BATCH_SIZE.
+
+        Returns:
+            dict: 'restored', 'already_present', 'not_archived' and 'skipped' ticket id lists.
+        """
+        from app.services.ticket_stats_service import TicketStatsService
+        from app.services.cache_version_service import CacheVersionService
+        from app.services.csat_service import CSAT_CACHE, CSATService
+
+        batch_size = batch_size or current_app.config.get('ARCHIVE_BATCH_SIZE', 500)
+        index = ArchiveIndex(_archive_dir())
+        ticket_ids = sorted(set(ticket_ids))
+        result = {"restored": [], "already_present": [], "not_archived": [], "skipped": []}
+
+        for start in range(0, len(ticket_ids), batch_size):
+            chunk = ticket_ids[start:start + batch_size]
+            present = set(db.session.scalars(
+                select(Ticket.id).where(Ticket.id.in_(chunk)).execution_options(include_deleted=True)
+            ))
+            entries = index.lookup_many([i for i in chunk if i not in present])
+            result["already_present"].extend(i for i in chunk if i in present)
+            result["not_archived"].extend(i for i in chunk if i not in present and i not in entries)
+            ordered = [entries[i] for i in chunk if i in entries]
+            if not ordered:
+                continue
+            records = index.read_many(ordered)
+
+            user_ids, team_ids = set(), set()
+            for r in records:
+                user_ids.update(u for u in (r["created_by_id"], r["assigned_to_id"]) if u)
+                user_ids.update(c["user_id"] for c in r["comments"])
+                user_ids.update(h["changed_by_id"] for h in r["status_history"] if h["changed_by_id"])
+                if r.get("feedback"):
+                    user_ids.add(r["feedback"]["user_id"])
+                if r["team_id"]:
+                    team_ids.add(r["team_id"])
+            users = set(db.session.scalars(select(User.id).where(User.id.in_(user_ids)))) if user_ids else set()
+            teams = set(db.session.scalars(select(Team.id).where(Team.id.in_(team_ids)))) if team_ids else set()
+
+            tickets, comments, history, feedback = [], [], [], []
+            deltas = defaultdict(lambda: [0, 0, 0])
+            now = utcnow()
+            today = now.date()
+            for r in records:
+                if r["created_by_id"] not in users:
+                    result["skipped"].append(r["id"])
+                    continue
+                status, priority = TicketStatus(r["status"]), TicketPriority(r["priority"])
+                team_id = r["team_id"] if r["team_id"] in teams else None
+                tickets.append({
+                    "id": r["id"],
+                    "title": r["title"],
+                    "description": r["description"],
+                    "category": r["category"],
+                    "status": status,
+                    "priority": priority,
+                    "is_demo": r["is_demo"],
+                    "created_by_id": r["created_by_id"],
+                    "assigned_to_id": r["assigned_to_id"] if r["assigned_to_id"] in users else None,
+                    "team_id": team_id,
+                    "github_pr_url": r.get("github_pr_url"),
+                    "sla_due_at": _datetime(r.get("sla_due_at")),
+                    "first_resolved_at": _datetime(r.get("first_resolved_at")),
+                    "sla_state": SLAStatus(r["sla_state"]) if r.get("sla_state") else None,
+                    "created_at": _datetime(r["created_at"]),
+                    "updated_at": now,
+                    "is_deleted": r["is_deleted"],
+                    "deleted_at": _datetime(r["deleted_at"])
+                })
+                restored_comment_ids = {c["id"] for c in r["comments"] if c["user_id"] in users}
+                comments.extend({
+                    "id": c["id"],
+                    "ticket_id": r["id"],
+                    "user_id": c["user_id"],
+                    "text": c["text"],
+                    "parent_id": c.get("parent_id") if c.get("parent_id") in restored_comment_ids else None,
+                    "created_at": _datetime(c["created_at"])
+                } for c in r["comments"] if c["id"] in restored_comment_ids)
+                history.extend({
+                    "id": h["id"],
+                    "ticket_id": r["id"],
+                    "old_status": TicketStatus(h["old_status"]) if h["old_status"] else None,
+                    "new_status": TicketStatus(h["new_status"]),
+                    "changed_by_id": h["changed_by_id"] if h["changed_by_id"] in users else None,
+                    "changed_at": _datetime(h["changed_at"])
+                } for h in r["status_history"])
+                fb = r.get("feedback")
+                if fb and fb["user_id"] in users:
+                    feedback.append({
+                        "id": fb["id"],
+                        "ticket_id": r["id"],
+                        "user_id": fb["user_id"],
+                        "rating": fb["rating"],
+                        "comment": fb["comment"],
+                        "created_at": _datetime(fb["created_at"])
+                    })
+                if not r["is_deleted"]:
+                    # Core INSERTs bypass the rollup flush hooks; the ticket re-enters its status today
+                    deltas[(today, bool(r["is_demo"]), team_id, r["category"], priority, status)][1] += 1
+                result["restored"].append(r["id"])
+
+            if not tickets:
+                continue
+            db.session.execute(insert(Ticket.__table__), tickets)
+            # Ordered by id so parent comments are inserted before their replies
+            for table, rows in ((Comment.__table__, sorted(comments, key=lambda c: c["id"])),
+                                (TicketStatusHistory.__table__, history),
+                                (CSATFeedback.__table__, feedback)):
+                if rows:
+                    db.session.execute(insert(table), rows)
+            TicketStatsService.apply_deltas(deltas)
+            if feedback:
+                CacheVersionService.bump(CSAT_CACHE)
+            db.session.commit()
+            if feedback:
+                CSATService.clear_cache()
+            logger.info(f"Restored {len(tickets)} archived tickets.")
+
+        from app.services.duplicate_service import DuplicateService
+        DuplicateService.reindex(result["restored"])
+        return result
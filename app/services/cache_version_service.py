@@ -0,0 +1,53 @@
+from sqlalchemy import select, update, insert
+from app.core.database import db
+from app.models.cache_version import CacheVersion
+from app.utils.time_utils import utcnow
+
+class CacheVersionService:
+    """Shared version counters used to invalidate per-process caches across workers.
+
+    Each worker keeps the version it loaded alongside its cached data. Writers bump the
+    counter in the same transaction as the change, so any worker that re-reads the counter
+    after the commit sees a newer version and reloads.
+    """
+
+    @staticmethod
+    def get_version(name: str) -> int:
+        """Returns the current version for a named cache (0 if it was never bumped)."""
+        version = db.session.execute(
+            select(CacheVersion.version).where(CacheVersion.name == name)
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def get_versions(names) -> dict:
+        """Returns the current versions of several named caches with one query.
+
+        Returns:
+            dict: {name: version}, with 0 for names that were never bumped.
+        """
+        names = list(names)
+        rows = db.session.execute(
+            select(CacheVersion.name, CacheVersion.version).where(CacheVersion.name.in_(names))
+        ).all() if names else []
+        versions = dict.fromkeys(names, 0)
+        versions.update({name: version for name, version in rows})
+        return versions
+
+    @staticmethod
+    def bump(name: str, connection=None):
+        """Increments the version for a named cache.
+
+        Args:
+            name (str): The cache name.
+            connection (Connection, optional): Connection to run on, e.g. from inside a flush
+                event so the bump commits atomically with the change. Defaults to the session.
+        """
+        execute = connection.execute if connection is not None else db.session.execute
+        result = execute(
+            update(CacheVersion.__table__)
+            .where(CacheVersion.__table__.c.name == name)
+            .values(version=CacheVersion.__table__.c.version + 1, updated_at=utcnow())
+        )
+        if result.rowcount == 0:
+            execute(insert(CacheVersion.__table__).values(name=name, version=1, updated_at=utcnow()))
@@ -0,0 +1,142 @@
+from datetime import timedelta
+from itertools import chain
+from flask import current_app
+from sqlalchemy import event, select, func, case
+from sqlalchemy.orm import joinedload
+from app.core.database import db
+from app.models.csat_feedback import CSATFeedback
+from app.models.ticket import Ticket
+from app.models.team import Team
+from app.models.user import User
+from app.services.cache_version_service import CacheVersionService
+from app.utils.cache import TTLCache
+from app.utils.time_utils import utcnow
+
+CSAT_CACHE = "csat_feedback"
+
+RATINGS = (1, 2, 3, 4, 5)
+
+# group_by name -> (key column, label column, extra join)
+GROUPINGS = {
+    "team": (Ticket.team_id, Team.name, (Team, Team.id == Ticket.team_id)),
+    "assignee": (Ticket.assigned_to_id, User.full_name, (User, User.id == Ticket.assigned_to_id)),
+    "category": (Ticket.category, Ticket.category, None),
+}
+
+_results = TTLCache(maxsize=256)
+
+def _aggregates():
+    return [
+        func.count(CSATFeedback.id),
+        func.avg(CSATFeedback.rating),
+        *(func.sum(case((CSATFeedback.rating == r, 1), else_=0)) for r in RATINGS)
+    ]
+
+def _summarize(total, average, *buckets):
+    return {
+        "total": total or 0,
+        "average": round(float(average), 2) if total else 0.0,
+        "breakdown": {str(r): int(count or 0) for r, count in zip(RATINGS, buckets)}
+    }
+
+class CSATService:
+    @staticmethod
+    def get_stats(is_demo: bool = False, group_by: str = None, days: int = None, team_id: int = None,
+                  assigned_to_id: int = None, category: str = None, recent: int = 0) -> dict:
+        """Aggregates CSAT ratings in SQL, optionally broken down and filtered.
+
+        Results are cached per argument set for CSAT_CACHE_SECONDS and dropped in every
+        worker as soon as any feedback is written.
+
+        Args:
+            is_demo (bool, optional): Whether to report on demo or real tickets. Defaults to False.
+            group_by (str, optional): One of 'team', 'assignee' or 'category'.
+            days (int, optional): Only include feedback submitted in the last N days.
+            team_id (int, optional): Only include tickets of this team.
+            assigned_to_id (int, optional): Only include tickets assigned to this user.
+            category (str, optional): Only include tickets in this category.
+            recent (int, optional): Number of most recent feedback entries to include.
+
+        Returns:
+            dict: 'total', 'average' and 'breakdown' (count per rating "1".."5"), plus 'groups'
+                when group_by is set and 'recent' when requested.
+
+        Raises:
+            ValueError: If group_by is not a supported breakdown.
+        """
+        if group_by is not None and group_by not in GROUPINGS:
+            raise ValueError(f"group_by must be one of: {', '.join(GROUPINGS)}")
+
+        cache_key = (is_demo, group_by, days, team_id, assigned_to_id, category, recent)
+        version = CacheVersionService.get_version(CSAT_CACHE)
+        cached = _results.get(cache_key, version=version)
+        if cached is not None:
+            return cached
+
+        filters = [Ticket.is_demo == is_demo]
+        if days:
+            filters.append(CSATFeedback.created_at >= utcnow() - timedelta(days=days))
+        if team_id is not None:
+            filters.append(Ticket.team_id == team_id)
+        if assigned_to_id is not None:
+            filters.append(Ticket.assigned_to_id == assigned_to_id)
+        if category is not None:
+            filters.append(Ticket.category == category)
+
+        base = select(*_aggregates()).select_from(CSATFeedback).join(Ticket).where(*filters)
+        stats = _summarize(*db.session.execute(base).one())
+
+        if group_by:
+            key_col, label_col, join = GROUPINGS[group_by]
+            query = select(key_col, label_col, *_aggregates()).select_from(CSATFeedback).join(Ticket)
+            if join is not None:
+                query = query.outerjoin(*join)
+            rows = db.session.execute(
+                query.where(*filters).group_by(key_col, label_col).order_by(func.count(CSATFeedback.id).desc())
+            ).all()
+            stats["groups"] = [
+                {"key": key, "label": label or "Unassigned", **_summarize(*aggregates)}
+                for key, label, *aggregates in rows
+            ]
+
+        if recent:
+            feedbacks = db.session.scalars(
+                select(CSATFeedback).join(Ticket).where(*filters)
+                .options(joinedload(CSATFeedback.ticket), joinedload(CSATFeedback.user))
+                .order_by(CSATFeedback.created_at.desc()).limit(recent)
+            ).all()
+            stats["recent"] = [{
+                "ticketId": fb.ticket_id,
+                "ticketTitle": fb.ticket.title,
+                "rating": fb.rating,
+                "comment": fb.comment,
+                "userName": fb.user.full_name,
+                "createdAt": fb.created_at.isoformat()
+            } for fb in feedbacks]
+
+        _results.set(cache_key, stats, version=version, ttl=current_app.config.get('CSAT_CACHE_SECONDS', 60))
+        return stats
+
+    @staticmethod
+    def clear_cache():
+        """Drops this worker's cached CSAT results."""
+        _results.clear()
+
+
+@event.listens_for(db.Session, "after_flush")
+def _bump_csat_version(session, flush_context):
+    # Same transaction as the feedback write, so no worker can cache stale results after the commit
+    if session.info.get('csat_changed'):
+        return
+    if any(isinstance(obj, CSATFeedback) for obj in chain(session.new, session.dirty, session.deleted)):
+        CacheVersionService.bump(CSAT_CACHE, connection=session.connection())
+        session.info['csat_changed'] = True
+
+@event.listens_for(db.Session, "after_commit")
+def _clear_local_csat_results(session):
+    if session.info.pop('csat_changed', False):
+        _results.clear()
+
+@event.listens_for(db.Session, "after_rollback")
+def _discard_csat_change(session):
+    session.info.pop('csat_changed', None)
@@ -0,0 +1,314 @@
+import re
+import threading
+import time
+import zlib
+import numpy as np
+from sqlalchemy import select, func
+from app.core.database import db
+from app.models.ticket import Ticket
+from app.core.constants import TicketStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 96
+# 32 bands of 3 rows: a pair with Jaccard similarity 0.5 shares a band with ~98%
+# probability, an unrelated pair (~0.1) with ~3%
+LSH_BANDS = 32
+# Estimated similarity a candidate needs to be reported
+DUPLICATE_THRESHOLD = 0.5
+# Only the start of the description counts, so long stack traces do not drown the title
+DESCRIPTION_CHARS = 300
+REBUILD_BATCH_SIZE = 1000
+
+_INACTIVE = (TicketStatus.RESOLVED, TicketStatus.CLOSED)
+_STOP_WORDS = frozenset(
+    "a an and are at be but by can cannot for from has have i in is it its me my no not "
+    "of on or our so that the this to was we when with".split()
+)
+# Multiply-add-shift hashes of the 32-bit shingles: ((a * x + b) mod 2^64) >> 32, odd a
+_rng = np.random.default_rng(1729)
+_MULTIPLIERS = _rng.integers(0, 2**64, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2**64, NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+def shingles(title, description=None):
+    """Returns the character 3-gram shingles of the ticket text, hashed to 32 bits.
+
+    Shingles are taken inside each lower-cased word padded with spaces, so word order
+    and punctuation do not matter and inflections ("disconnects", "disconnected") still
+    share most of their shingles. Stop words are skipped.
+    """
+    text = f"{title or ''} {(description or '')[:DESCRIPTION_CHARS]}".lower()
+    result = set()
+    for word in re.findall(r"\w+", text):
+        if word in _STOP_WORDS:
+            continue
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            result.add(zlib.crc32(padded[i:i + 3].encode()))
+    return result
+
+def signature(shingle_set):
+    """Computes the MinHash signature of a shingle set as a NUM_PERM uint64 array.
+
+    All NUM_PERM hashes of all shingles are computed as one (NUM_PERM, n) array; overflow
+    wraps, which is the mod 2^64 the hash family needs.
+    """
+    if not shingle_set:
+        return None
+    values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+    hashed = (np.outer(_MULTIPLIERS, values) + _OFFSETS[:, None]) >> _SHIFT
+    return hashed.min(axis=1)
+
+class MinHashLSH:
+    """Thread-safe in-memory LSH index from keys to MinHash signatures."""
+
+    def __init__(self, bands=LSH_BANDS):
+        self.rows = NUM_PERM // bands
+        self._buckets = [{} for _ in range(bands)]
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, sig):
+        raw, step = sig.tobytes(), self.rows * sig.itemsize
+        return [raw[i * step:(i + 1) * step] for i in range(len(self._buckets))]
+
+    def add(self, key, sig, meta=None):
+        if sig is None:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (sig, meta)
+            for bucket, band in zip(self._buckets, self._band_keys(sig)):
+                bucket.setdefault(band, set()).add(key)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket, band in zip(self._buckets, self._band_keys(entry[0])):
+            keys = bucket.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band]
+
+    def query(self, sig):
+        """Returns [(key, estimated Jaccard similarity, meta)] for keys sharing a band with `sig`."""
+        if sig is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for bucket, band in zip(self._buckets, self._band_keys(sig)):
+                candidates.update(bucket.get(band, ()))
+            if not candidates:
+                return []
+            keys = list(candidates)
+            entries = [self._entries[key] for key in keys]
+        matches = np.count_nonzero(np.stack([other for other, _ in entries]) == sig, axis=1)
+        return [(key, int(count) / NUM_PERM, meta)
+                for key, count, (_, meta) in zip(keys, matches, entries)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for bucket in self._buckets:
+                bucket.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+# A title typed into the form is compared with titles; a full ticket with title and description
+_title_index = MinHashLSH()
+_text_index = MinHashLSH()
+_state_lock = threading.Lock()
+# Highest ticket id the index has seen; None until the first (re)build
+_high_water = None
+
+class DuplicateService:
+    """Finds likely duplicates of a new ticket among open tickets without scanning the table.
+
+    Each worker keeps MinHash/LSH indexes over the title shingles and the title and
+    description shingles of open tickets. They are built from the database in the
+    background at startup (or on first use), updated as tickets are created, reopened or
+    restored, and catch up on tickets created elsewhere with a primary key range read.
+    Candidates are re-checked against the database, so tickets that were resolved or deleted
+    since they were indexed are dropped (and pruned from the index) instead of reported.
+    """
+
+    @staticmethod
+    def reset():
+        """Empties the indexes; the next lookup rebuilds them."""
+        global _high_water
+        with _state_lock:
+            _title_index.clear()
+            _text_index.clear()
+            _high_water = None
+
+    @staticmethod
+    def rebuild() -> int:
+        """Rebuilds the indexes from all open tickets.
+
+        Returns:
+            int: The number of tickets indexed.
+        """
+        with _state_lock:
+            return DuplicateService._build()
+
+    @staticmethod
+    def start_background_build(app):
+        """Builds the indexes in a daemon thread so app startup does not wait for them.
+
+        Lookups made while the build runs wait for it; if it fails, the first lookup retries.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        def run():
+            with app.app_context():
+                try:
+                    DuplicateService.rebuild()
+                except Exception as e:
+                    logger.error(f"Failed to build duplicate ticket index: {e}")
+                finally:
+                    db.session.remove()
+
+        thread = threading.Thread(target=run, name="duplicate-index-build", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _build() -> int:
+        # Callers hold _state_lock
+        global _high_water
+        started = time.perf_counter()
+        _title_index.clear()
+        _text_index.clear()
+        high_water = db.session.execute(
+            select(func.max(Ticket.id)).execution_options(include_deleted=True)
+        ).scalar() or 0
+        count = DuplicateService._index_rows(
+            select(Ticket.id, Ticket.title, Ticket.description, Ticket.is_demo)
+            .where(Ticket.id <= high_water, Ticket.status.notin_(_INACTIVE))
+        )
+        _high_water = high_water
+        logger.info(f"Duplicate index built with {count} open tickets in "
+                    f"{(time.perf_counter() - started) * 1000:.0f}ms")
+        return count
+
+    @staticmethod
+    def _index_rows(stmt) -> int:
+        count = 0
+        for row in db.session.execute(stmt.execution_options(yield_per=REBUILD_BATCH_SIZE)):
+            DuplicateService._add(row.id, row.title, row.description, row.is_demo)
+            count += 1
+        return count
+
+    @staticmethod
+    def _add(ticket_id, title, description, is_demo):
+        _title_index.add(ticket_id, signature(shingles(title)), bool(is_demo))
+        _text_index.add(ticket_id, signature(shingles(title, description)), bool(is_demo))
+
+    @staticmethod
+    def _catch_up():
+        """Indexes tickets created since the last build or catch-up, e.g. by another worker."""
+        global _high_water
+        with _state_lock:
+            if _high_water is None:
+                DuplicateService._build()
+                return
+            latest = db.session.execute(
+                select(func.max(Ticket.id)).execution_options(include_deleted=True)
+            ).scalar() or 0
+            if latest > _high_water:
+                DuplicateService._index_rows(
+                    select(Ticket.id, Ticket.title, Ticket.description, Ticket.is_demo)
+                    .where(Ticket.id > _high_water, Ticket.id <= latest,
+                           Ticket.status.notin_(_INACTIVE))
+                )
+                _high_water = latest
+
+    @staticmethod
+    def add_ticket(ticket):
+        """Indexes a newly created ticket."""
+        global _high_water
+        if _high_water is None:
+            # Not built yet; the first lookup builds the index, including this ticket
+            return
+        DuplicateService._add(ticket.id, ticket.title, ticket.description, ticket.is_demo)
+        with _state_lock:
+            # Lower ids may belong to other workers' tickets not seen yet; leave them to _catch_up
+            if ticket.id == _high_water + 1:
+                _high_water = ticket.id
+
+    @staticmethod
+    def reindex(ticket_ids):
+        """Re-reads existing tickets into the indexes, e.g. after a reopen or a restore.
+
+        Their ids are below the catch-up high-water mark, so nothing else would index them.
+        Tickets that are not open (or are deleted) are removed instead.
+
+        Args:
+            ticket_ids (list[int]): The tickets to re-index.
+        """
+        if _high_water is None or not ticket_ids:
+            # Not built yet; the build reads them from the database
+            return
+        ticket_ids = list(ticket_ids)
+        # Soft-deleted tickets are filtered out by the session hook
+        rows = db.session.execute(
+            select(Ticket.id, Ticket.title, Ticket.description, Ticket.is_demo)
+            .where(Ticket.id.in_(ticket_ids), Ticket.status.notin_(_INACTIVE))
+        ).all()
+        for row in rows:
+            DuplicateService._add(row.id, row.title, row.description, row.is_demo)
+        for stale in set(ticket_ids) - {row.id for row in rows}:
+            _title_index.remove(stale)
+            _text_index.remove(stale)
+
+    @staticmethod
+    def find_similar(user, title, description=None, exclude_id=None, limit=5):
+        """Finds open tickets that are probably about the same problem.
+
+        Args:
+            user (User): The user asking; candidates are limited to what they may see.
+            title (str): Title of the new ticket.
+            description (str, optional): Description of the new ticket.
+            exclude_id (int, optional): A ticket id to leave out, e.g. the ticket itself.
+            limit (int, optional): Maximum number of visible matches returned. Defaults to 5.
+
+        Returns:
+            tuple: (list of (Ticket, similarity) the user may see, best first; total number
+                of open matches including tickets the user cannot see).
+        """
+        from app.core.config import Config
+        from app.services.ticket_service import TicketService
+
+        DuplicateService._catch_up()
+        is_demo_user = (user.email == Config.DEMO_EMAIL)
+        index = _text_index if description else _title_index
+        matches = {
+            key: similarity
+            for key, similarity, is_demo in index.query(signature(shingles(title, description)))
+            if similarity >= DUPLICATE_THRESHOLD and is_demo == is_demo_user and key != exclude_id
+        }
+        if not matches:
+            return [], 0
+
+        # Soft-deleted tickets are filtered out by the session hook
+        open_ids = set(db.session.execute(
+            select(Ticket.id).where(Ticket.id.in_(matches), Ticket.status.notin_(_INACTIVE))
+        ).scalars())
+        for stale in matches.keys() - open_ids:
+            _title_index.remove(stale)
+            _text_index.remove(stale)
+
+        visible = TicketService._scoped_ticket_query(user).filter(Ticket.id.in_(open_ids)).all()
+        ranked = sorted(visible, key=lambda t: (-matches[t.id], -t.id))[:limit]
+        return [(t, matches[t.id]) for t in ranked], len(open_ids)
@@ -1,15 +1,39 @@
-import smtplib
+import base64
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from app.core.config import Config
+from email.mime.application import MIMEApplication
+from flask import current_app
+from sqlalchemy import select, func
+from app.core.database import db
+from app.models.email_outbox import EmailOutbox
+from app.utils.time_utils import utcnow
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _render_ticket_pdf(spec):
+    from app.services.ticket_service import TicketService
+    from app.services.ticket_pdf_service import TicketPdfService
+
+    ticket = TicketService.get_ticket_by_id(spec["ticket_id"])
+    if not ticket:
+        return None
+    return TicketPdfService.generate_ticket_pdf(ticket)
+
+# Attachments that are expensive to produce are described on the outbox row and only
+# rendered by the email worker when the message goes out
+DEFERRED_ATTACHMENT_RENDERERS = {
+    "ticket_pdf": _render_ticket_pdf,
+}
+
 class EmailService:
     @staticmethod
-    def send_email(to_email: str, subject: str, body: str, attachments=None, reply_to=None, sender_name=None):
-        """Sends an HTML email with optional attachments and custom headers.
+    def send_email(to_email: str, subject: str, body: str, attachments=None, reply_to=None, sender_name=None,
+                   deferred_attachments=None):
+        """Queues an HTML email with optional attachments and custom headers.
+
+        The message is stored in the `email_outbox` table and delivered by the email worker
+        pool (see `app/services/email_worker.py`), so SMTP latency never adds to the request.
 
         Args:
             to_email (str): The recipient's email address.
@@ -18,43 +42,136 @@ class EmailService:
             attachments (list, optional): A list of tuples containing (filename, content) for attachments.
             reply_to (str, optional): A custom Reply-To email address.
             sender_name (str, optional): A custom display name for the sender.
+            deferred_attachments (list, optional): Attachments rendered by the worker at send time,
+                as dicts with a 'kind' from DEFERRED_ATTACHMENT_RENDERERS, a 'filename' and the
+                renderer's arguments (e.g. 'ticket_id').
+
+        Returns:
+            EmailOutbox: The queued row, or None if email is not configured or queueing failed.
         """
-        if not Config.MAIL_SERVER or not Config.MAIL_USERNAME:
+        config = current_app.config
+        if not config.get('MAIL_SERVER') or not config.get('MAIL_USERNAME'):
             logger.warning("Email configuration missing. Skipping email send.")
             logger.info(f"Would have sent email to {to_email}: {subject}")
-            return
+            return None
 
         try:
-            from email.mime.application import MIMEApplication
-            msg = MIMEMultipart()
-            
-            if sender_name:
-                # Format: "Sender Name" <system@email.com>
-                msg['From'] = f'"{sender_name}" <{Config.MAIL_USERNAME}>'
-            else:
-                msg['From'] = Config.MAIL_USERNAME
-                
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'html'))
-            
-            if reply_to:
-                msg.add_header('Reply-To', reply_to)
-
-            if attachments:
-                for filename, content in attachments:
-                    part = MIMEApplication(content)
-                    part.add_header('Content-Disposition', 'attachment', filename=filename)
-                    msg.attach(part)
-
-            server = smtplib.SMTP(Config.MAIL_SERVER, Config.MAIL_PORT)
-            if Config.MAIL_USE_TLS:
-                server.starttls()
-            
-            server.login(Config.MAIL_USERNAME, Config.MAIL_PASSWORD)
-            server.send_message(msg)
-            server.quit()
-            logger.info(f"Email sent to {to_email}")
+            entry = EmailOutbox(
+                to_email=to_email,
+                subject=subject,
+                body=body,
+                reply_to=reply_to,
+                sender_name=sender_name,
+                attachments=[
+                    {"filename": filename, "content": base64.b64encode(content).decode('ascii')}
+                    for filename, content in attachments
+                ] if attachments else None,
+                deferred_attachments=deferred_attachments or None,
+                next_attempt_at=utcnow()
+            )
+            db.session.add(entry)
+            db.session.commit()
         except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+            db.session.rollback()
+            logger.error(f"Failed to queue email to {to_email}: {e}")
+            return None
+
+        from app.services.email_worker import email_worker_pool
+        email_worker_pool.wake()
+        logger.info(f"Email to {to_email} queued (#{entry.id})")
+        return entry
+
+    @staticmethod
+    def send_emails(messages) -> int:
+        """Queues several plain HTML emails with one commit, e.g. a notice to every new member.
+
+        Args:
+            messages (list[dict]): Each with 'to_email', 'subject' and 'body'.
+
+        Returns:
+            int: The number of emails queued (0 if email is not configured or queueing failed).
+        """
+        if not messages:
+            return 0
+        config = current_app.config
+        if not config.get('MAIL_SERVER') or not config.get('MAIL_USERNAME'):
+            logger.warning("Email configuration missing. Skipping email send.")
+            logger.info(f"Would have sent {len(messages)} emails: {messages[0]['subject']}")
+            return 0
+
+        now = utcnow()
+        try:
+            db.session.add_all([
+                EmailOutbox(to_email=m['to_email'], subject=m['subject'], body=m['body'], next_attempt_at=now)
+                for m in messages
+            ])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to queue {len(messages)} emails: {e}")
+            return 0
+
+        from app.services.email_worker import email_worker_pool
+        email_worker_pool.wake()
+        logger.info(f"{len(messages)} emails queued")
+        return len(messages)
+
+    @staticmethod
+    def build_message(entry: EmailOutbox, sender: str) -> MIMEMultipart:
+        """Builds the MIME message for a queued email, rendering any deferred attachments.
+
+        Args:
+            entry (EmailOutbox): The queued email.
+            sender (str): The envelope sender address (MAIL_USERNAME).
+
+        Returns:
+            MIMEMultipart: The message ready to be passed to `smtplib.SMTP.send_message`.
+        """
+        msg = MIMEMultipart()
+
+        if entry.sender_name:
+            # Format: "Sender Name" <system@email.com>
+            msg['From'] = f'"{entry.sender_name}" <{sender}>'
+        else:
+            msg['From'] = sender
+
+        msg['To'] = entry.to_email
+        msg['Subject'] = entry.subject
+        msg.attach(MIMEText(entry.body, 'html'))
+
+        if entry.reply_to:
+            msg.add_header('Reply-To', entry.reply_to)
+
+        files = [(a["filename"], base64.b64decode(a["content"])) for a in entry.attachments or []]
+        for spec in entry.deferred_attachments or []:
+            content = DEFERRED_ATTACHMENT_RENDERERS[spec["kind"]](spec)
+            if content is None:
+                logger.warning(f"Skipping {spec['kind']} attachment for email #{entry.id}: source no longer exists")
+                continue
+            files.append((spec["filename"], content))
+
+        for filename, content in files:
+            part = MIMEApplication(content)
+            part.add_header('Content-Disposition', 'attachment', filename=filename)
+            msg.attach(part)
+
+        return msg
+
+    @staticmethod
+    def get_queue_stats() -> dict:
+        """Returns outbox depth per status and the age of the oldest pending email.
+
+        Returns:
+            dict: 'pending', 'sending', 'sent', 'failed' counts and 'oldest_pending_seconds'.
+        """
+        counts = dict(db.session.execute(
+            select(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status)
+        ).all())
+        oldest = db.session.execute(
+            select(func.min(EmailOutbox.created_at)).where(EmailOutbox.status == EmailOutbox.PENDING)
+        ).scalar()
 
+        stats = {status: counts.get(status, 0) for status in
+                 (EmailOutbox.PENDING, EmailOutbox.SENDING, EmailOutbox.SENT, EmailOutbox.FAILED)}
+        stats["oldest_pending_seconds"] = round((utcnow() - oldest).total_seconds(), 1) if oldest else 0
+        return stats
@@ -0,0 +1,253 @@
+import smtplib
+import threading
+import time
+from datetime import timedelta
+from sqlalchemy import select, update, or_, and_
+from app.core.database import db
+from app.models.email_outbox import EmailOutbox
+from app.utils.time_utils import utcnow
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A row stuck in 'sending' this long belongs to a worker that died; it is picked up again
+SENDING_LOCK_SECONDS = 600
+
+class PooledSMTPConnection:
+    """One authenticated SMTP session reused across messages by a single worker thread.
+
+    The session is opened lazily, probed with NOOP after it has been idle, and reopened once
+    if the server dropped it.
+    """
+
+    def __init__(self, config, metrics=None):
+        self.config = config
+        self.metrics = metrics
+        self._smtp = None
+        self._last_used = 0.0
+
+    def _open(self):
+        smtp = smtplib.SMTP(self.config['MAIL_SERVER'], self.config['MAIL_PORT'],
+                            timeout=self.config.get('MAIL_TIMEOUT_SECONDS', 30))
+        if self.config.get('MAIL_USE_TLS'):
+            smtp.starttls()
+        smtp.login(self.config['MAIL_USERNAME'], self.config.get('MAIL_PASSWORD') or '')
+        if self.metrics:
+            self.metrics.incr('connections_opened')
+        return smtp
+
+    def _connection(self):
+        if self._smtp is not None and time.monotonic() - self._last_used > self.config.get('MAIL_CONNECTION_IDLE_SECONDS', 60):
+            try:
+                if self._smtp.noop()[0] != 250:
+                    self.close()
+            except smtplib.SMTPException:
+                self.close()
+            except OSError:
+                self.close()
+        if self._smtp is None:
+            self._smtp = self._open()
+        return self._smtp
+
+    def send(self, msg):
+        try:
+            self._connection().send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # Server closed an idle session between our NOOP and the send; retry once on a fresh one
+            self.close()
+            self._connection().send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+
+class EmailMetrics:
+    """In-process counters for the email workers, exposed on the admin email queue endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {'sent': 0, 'retried': 0, 'failed': 0, 'connections_opened': 0}
+            self._send_ms_total = 0.0
+            self._queue_ms_total = 0.0
+            self.last_send_ms = None
+
+    def incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def record_sent(self, send_ms, queued_ms):
+        with self._lock:
+            self.counters['sent'] += 1
+            self._send_ms_total += send_ms
+            self._queue_ms_total += queued_ms
+            self.last_send_ms = round(send_ms, 1)
+
+    def snapshot(self):
+        with self._lock:
+            sent = self.counters['sent']
+            return {
+                **self.counters,
+                'avg_send_ms': round(self._send_ms_total / sent, 1) if sent else None,
+                'avg_queue_latency_ms': round(self._queue_ms_total / sent, 1) if sent else None,
+                'last_send_ms': self.last_send_ms
+            }
+
+
+def _due_filter(now):
+    return or_(
+        and_(EmailOutbox.status == EmailOutbox.PENDING, EmailOutbox.next_attempt_at <= now),
+        and_(EmailOutbox.status == EmailOutbox.SENDING,
+             EmailOutbox.locked_at <= now - timedelta(seconds=SENDING_LOCK_SECONDS))
+    )
+
+def _is_permanent(error):
+    # 5xx replies (bad recipient, message rejected) will not succeed on retry
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+
+
+class EmailWorkerPool:
+    """Threads that drain the `email_outbox` table, each over its own pooled SMTP session.
+
+    Rows are claimed with a conditional UPDATE, so several workers (or several app processes)
+    can poll the same table without sending a message twice. Failed sends are retried with
+    exponential backoff until MAIL_MAX_ATTEMPTS.
+    """
+
+    def __init__(self):
+        self.metrics = EmailMetrics()
+        self._app = None
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self, app):
+        """Starts MAIL_WORKERS daemon threads for the given app (no-op if already running)."""
+        if self._threads:
+            return
+        self._app = app
+        self._stop.clear()
+        for i in range(app.config.get('MAIL_WORKERS', 2)):
+            thread = threading.Thread(target=self._run, name=f"email-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {len(self._threads)} email workers")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        """Tells idle workers new mail is queued instead of waiting for the next poll."""
+        self._wake.set()
+
+    def _run(self):
+        connection = PooledSMTPConnection(self._app.config, self.metrics)
+        poll_seconds = self._app.config.get('MAIL_POLL_SECONDS', 5)
+        try:
+            while not self._stop.is_set():
+                with self._app.app_context():
+                    try:
+                        processed = self.process_due(connection)
+                    except Exception as e:
+                        logger.error(f"Email worker error: {e}", exc_info=True)
+                        processed = 0
+                    finally:
+                        db.session.remove()
+                if not processed:
+                    self._wake.wait(poll_seconds)
+                    self._wake.clear()
+        finally:
+            connection.close()
+
+    def claim(self, limit=20):
+        """Claims up to `limit` due emails for this worker.
+
+        Returns:
+            list[int]: The ids of the claimed rows.
+        """
+        now = utcnow()
+        candidates = db.session.scalars(
+            select(EmailOutbox.id).where(_due_filter(now)).order_by(EmailOutbox.id).limit(limit)
+        ).all()
+        claimed = []
+        for email_id in candidates:
+            result = db.session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == email_id, _due_filter(now))
+                .values(status=EmailOutbox.SENDING, locked_at=now)
+            )
+            if result.rowcount == 1:
+                claimed.append(email_id)
+        db.session.commit()
+        return claimed
+
+    def process_due(self, connection, limit=20):
+        """Claims due emails and sends them over `connection`. Must run in an app context.
+
+        Returns:
+            int: The number of emails attempted.
+        """
+        from flask import current_app
+        from app.services.email_service import EmailService
+
+        config = current_app.config
+        claimed = self.claim(limit)
+        for email_id in claimed:
+            entry = db.session.get(EmailOutbox, email_id)
+            started = time.monotonic()
+            try:
+                connection.send(EmailService.build_message(entry, config['MAIL_USERNAME']))
+            except Exception as e:
+                if not isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                    # Anything but a server reply may have left the session unusable
+                    connection.close()
+                self._record_failure(entry, e, config)
+            else:
+                now = utcnow()
+                entry.status = EmailOutbox.SENT
+                entry.sent_at = now
+                entry.attempts += 1
+                entry.last_error = None
+                self.metrics.record_sent(
+                    send_ms=(time.monotonic() - started) * 1000,
+                    queued_ms=(now - entry.created_at).total_seconds() * 1000
+                )
+                logger.info(f"Email sent to {entry.to_email} (#{entry.id})")
+            db.session.commit()
+        return len(claimed)
+
+    def _record_failure(self, entry, error, config):
+        entry.attempts += 1
+        entry.last_error = str(error)[:1000]
+        if _is_permanent(error) or entry.attempts >= config.get('MAIL_MAX_ATTEMPTS', 5):
+            entry.status = EmailOutbox.FAILED
+            self.metrics.incr('failed')
+            logger.error(f"Giving up on email #{entry.id} to {entry.to_email} after {entry.attempts} attempts: {error}")
+            return
+
+        delay = min(
+            config.get('MAIL_RETRY_BASE_SECONDS', 30) * (2 ** (entry.attempts - 1)),
+            config.get('MAIL_RETRY_MAX_SECONDS', 3600)
+        )
+        entry.status = EmailOutbox.PENDING
+        entry.next_attempt_at = utcnow() + timedelta(seconds=delay)
+        self.metrics.incr('retried')
+        logger.warning(f"Email #{entry.id} to {entry.to_email} failed ({error}); retrying in {delay}s")
+
+
+email_worker_pool = EmailWorkerPool()
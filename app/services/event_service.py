@@ -0,0 +1,88 @@
+from sqlalchemy.orm import joinedload
+from app.models.event import Event
+from app.utils.time_utils import utcnow
+
+ICS_PRODID = "-//ITSM//Calendar//EN"
+
+def _ics_escape(text):
+    return (text or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")\
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+
+def _ics_time(value):
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+def _fold(line):
+    """Folds a content line to 75 octets as RFC 5545 requires, without splitting characters."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts, current, size, limit = [], "", 0, 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            parts.append(current)
+            # Continuation lines start with a space, which counts towards their 75 octets
+            current, size, limit = "", 0, 74
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+class EventService:
+    @staticmethod
+    def get_events(start=None, end=None) -> list:
+        """Returns the events overlapping a time window, ordered by start time.
+
+        The window is half-open; an event is included if it ends after `start` and begins
+        before `end`. The bound on `start_time` is served by the (start_time, end_time) index.
+
+        Args:
+            start (datetime, optional): Naive UTC start of the window.
+            end (datetime, optional): Naive UTC end of the window.
+
+        Returns:
+            list[Event]: The events, with their creators loaded in the same query.
+        """
+        query = Event.query.options(joinedload(Event.creator))
+        if end is not None:
+            query = query.filter(Event.start_time < end)
+        if start is not None:
+            query = query.filter(Event.end_time > start)
+        return query.order_by(Event.start_time.asc(), Event.id.asc()).all()
+
+    @staticmethod
+    def to_ics(events, host="localhost") -> str:
+        """Renders events as an iCalendar (RFC 5545) document.
+
+        Args:
+            events (list[Event]): The events to include.
+            host (str, optional): Domain part of the event UIDs. Defaults to "localhost".
+
+        Returns:
+            str: The calendar, with CRLF line endings.
+        """
+        stamp = _ics_time(utcnow())
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{ICS_PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            "X-WR-CALNAME:IT Calendar",
+        ]
+        for event in events:
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:event-{event.id}@{host}",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{_ics_time(event.start_time)}",
+                f"DTEND:{_ics_time(event.end_time)}",
+                f"LAST-MODIFIED:{_ics_time(event.updated_at or event.created_at)}",
+                f"SUMMARY:{_ics_escape(event.title)}",
+                f"CATEGORIES:{_ics_escape(event.event_type)}",
+            ]
+            if event.description:
+                lines.append(f"DESCRIPTION:{_ics_escape(event.description)}")
+            lines.append("END:VEVENT")
+        lines.append("END:VCALENDAR")
+        return "\r\n".join(_fold(line) for line in lines) + "\r\n"
@@ -0,0 +1,116 @@
+import csv
+import json
+from sqlalchemy import select
+from app.core.database import db
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+from app.utils.time_utils import utcnow
+
+# Rows fetched per round trip while streaming; memory stays bounded by one batch
+EXPORT_BATCH_SIZE = 500
+
+class _Echo:
+    """File-like object that hands each CSV line back to the caller instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+def _iter_tickets(ticket_filters):
+    if not ticket_filters:
+        return
+    # Plain column rows: nothing is added to the session's identity map
+    yield from db.session.execute(
+        select(Ticket.id, Ticket.title, Ticket.status, Ticket.priority,
+               Ticket.category, Ticket.created_at, Ticket.updated_at)
+        .where(*ticket_filters)
+        .order_by(Ticket.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+def _iter_comments(user_id):
+    yield from db.session.execute(
+        select(Comment.id, Comment.ticket_id, Comment.text, Comment.created_at)
+        .where(Comment.user_id == user_id)
+        .order_by(Comment.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+class ExportService:
+    @staticmethod
+    def iter_csv(user, ticket_filters):
+        """Yields the user's data export as CSV lines, reading tickets and comments in batches.
+
+        Args:
+            user (User): The exporting user.
+            ticket_filters (list): SQL expressions selecting the user's tickets; empty for none.
+
+        Yields:
+            str: One CSV line at a time.
+        """
+        writer = csv.writer(_Echo())
+
+        # User Info
+        yield writer.writerow(['User Profile'])
+        yield writer.writerow(['Name', user.full_name])
+        yield writer.writerow(['Email', user.email])
+        yield writer.writerow(['Role', user.role.value])
+        yield writer.writerow([])
+
+        # Tickets
+        yield writer.writerow(['Tickets'])
+        yield writer.writerow(['ID', 'Title', 'Status', 'Priority', 'Category', 'Created At'])
+        for t in _iter_tickets(ticket_filters):
+            yield writer.writerow([t.id, t.title, t.status.value, t.priority.value, t.category, t.created_at])
+        yield writer.writerow([])
+
+        # Comments
+        yield writer.writerow(['My Comments'])
+        yield writer.writerow(['Ticket ID', 'Comment', 'Date'])
+        for c in _iter_comments(user.id):
+            yield writer.writerow([c.ticket_id, c.text, c.created_at])
+
+    @staticmethod
+    def iter_ndjson(user, ticket_filters):
+        """Yields the user's data export as newline-delimited JSON, one record per line.
+
+        The first line is the 'user' record; each following line is a 'ticket' or 'comment'
+        record with the same fields as the JSON export.
+
+        Args:
+            user (User): The exporting user.
+            ticket_filters (list): SQL expressions selecting the user's tickets; empty for none.
+
+        Yields:
+            str: One JSON document followed by a newline.
+        """
+        def line(record):
+            return json.dumps(record) + "\n"
+
+        yield line({
+            "type": "user",
+            "id": user.id,
+            "name": user.full_name,
+            "email": user.email,
+            "role": user.role.value,
+            "joined": user.created_at.isoformat() if user.created_at else None,
+            "exported_at": utcnow().isoformat()
+        })
+        for t in _iter_tickets(ticket_filters):
+            yield line({
+                "type": "ticket",
+                "id": t.id,
+                "title": t.title,
+                "status": t.status.value,
+                "priority": t.priority.value,
+                "category": t.category,
+                "created_at": t.created_at.isoformat(),
+                "updated_at": t.updated_at.isoformat() if t.updated_at else None
+            })
+        for c in _iter_comments(user.id):
+            yield line({
+                "type": "comment",
+                "id": c.id,
+                "ticket_id": c.ticket_id,
+                "text": c.text,
+                "created_at": c.created_at.isoformat()
+            })
@@ -1,10 +1,23 @@
+from itertools import chain
+from sqlalchemy import event, insert, inspect, select
 from app.core.database import db
 from app.models.notification import Notification
+from app.models.user import User
+from app.core.constants import UserRole
 from app.core.extensions import socketio
+from app.services.cache_version_service import CacheVersionService
+from app.utils.cache import TTLCache
+from app.utils.time_utils import utcnow
+from app.websocket.rooms import user_room, demo_room, DEMO_ROOM, NON_DEMO_ROOM
 import logging
 
 logger = logging.getLogger(__name__)
 
+RECIPIENTS_CACHE = "notification_recipients"
+
+# Recipient id lists per role/team, invalidated whenever a user's role or team changes
+_recipients = TTLCache(maxsize=256, ttl=300)
+
 class NotificationService:
     @staticmethod
     def create_notification(user_id, title, message, type='info'):
@@ -19,19 +32,71 @@ class NotificationService:
         db.session.add(notification)
         db.session.commit()
 
-        # Emit socket event to the specific user room or just broadcast if simple
-        # For scalable apps, we'd emit to room `user_{user_id}`
-        # For now, let's emit 'new_notification' with data including user_id, 
-        # and client will filter or we rely on socket rooms if set up.
-        # Looking at ticket_socket.py, it's very basic.
-        # Let's emit a global event and client checks ID, or better, emit to a room.
-        # We need to ensure client joins room on connect.
-        
-        notification_data = notification.to_dict()
-        socketio.emit('new_notification', notification_data)
+        # Only the recipient's sockets are in their user room
+        socketio.emit('new_notification', notification.to_dict(), to=user_room(user_id))
         
         return notification
 
+    @staticmethod
+    def create_notifications(entries):
+        """Create many notifications with one INSERT and one commit, then push one batch per user.
+
+        Args:
+            entries (list[dict]): Each with 'user_id', 'title', 'message' and optional 'type'.
+
+        Returns:
+            list[Notification]: The created notifications.
+        """
+        if not entries:
+            return []
+
+        now = utcnow()
+        rows = [{
+            'user_id': entry['user_id'],
+            'title': entry['title'],
+            'message': entry['message'],
+            'type': entry.get('type', 'info'),
+            'is_read': False,
+            'created_at': now
+        } for entry in entries]
+        notifications = db.session.scalars(insert(Notification).returning(Notification), rows).all()
+        db.session.commit()
+
+        # One batched push per recipient room
+        by_user = {}
+        for n in notifications:
+            by_user.setdefault(n.user_id, []).append(n.to_dict())
+        for user_id, batch in by_user.items():
+            socketio.emit('new_notifications', batch, to=user_room(user_id))
+        return notifications
+
+    @staticmethod
+    def get_recipient_ids(role, team_id=None):
+        """Returns the ids of users with a role (optionally within a team), cached per worker.
+
+        Args:
+            role (UserRole): The role to match.
+            team_id (int, optional): Restrict to members of this team.
+
+        Returns:
+            list[int]: Matching user ids.
+        """
+        key = (role, team_id)
+        version = CacheVersionService.get_version(RECIPIENTS_CACHE)
+        ids = _recipients.get(key, version=version)
+        if ids is None:
+            query = select(User.id).where(User.role == role)
+            if team_id is not None:
+                query = query.where(User.team_id == team_id)
+            ids = db.session.scalars(query.order_by(User.id)).all()
+            _recipients.set(key, ids, version=version)
+        return ids
+
+    @staticmethod
+    def clear_recipient_cache():
+        """Drops this worker's cached recipient lists."""
+        _recipients.clear()
+
     @staticmethod
     def get_notifications(user_id, limit=20, unread_only=False):
         """Get notifications for a user"""
@@ -72,45 +137,32 @@ class NotificationService:
 
     @staticmethod
     def notify_ticket_created(ticket, creator):
-        """Notify Admins and IT Staff about a new ticket"""
-        from app.models.user import User
-        from app.core.constants import UserRole
-
+        """Notify the creator, all Admins and the team's IT Staff about a new ticket"""
         # Notify Creator
-        NotificationService.create_notification(
-            user_id=creator.id,
-            title="Ticket Created Successfully",
-            message=f"Your ticket #{ticket.id} '{ticket.title}' has been received.",
-            type='success'
-        )
+        entries = [{
+            'user_id': creator.id,
+            'title': "Ticket Created Successfully",
+            'message': f"Your ticket #{ticket.id} '{ticket.title}' has been received.",
+            'type': 'success'
+        }]
 
         # Notify All Admins
-        admins = User.query.filter_by(role=UserRole.ADMIN).all()
-        for admin in admins:
-            NotificationService.create_notification(
-                user_id=admin.id,
-                title="New Ticket Created",
-                message=f"Ticket #{ticket.id}: {ticket.title} was created by {creator.full_name}",
-                type='info'
-            )
+        entries += [{
+            'user_id': admin_id,
+            'title': "New Ticket Created",
+            'message': f"Ticket #{ticket.id}: {ticket.title} was created by {creator.full_name}",
+            'type': 'info'
+        } for admin_id in NotificationService.get_recipient_ids(UserRole.ADMIN)]
 
-        # Notify IT Staff (All or Team specific?)
-        # For simplicity, notify all IT staff for now, or those in the team if assigned
-        if ticket.team_id:
-            # Notify members of the team
-            # We don't have a direct 'team.members' relationship easily accessible maybe?
-            # Let's query users with that team_id
-            staff_members = User.query.filter_by(role=UserRole.IT_STAFF, team_id=ticket.team_id).all()
-        else:
-            staff_members = User.query.filter_by(role=UserRole.IT_STAFF).all()
-
-        for staff in staff_members:
-             NotificationService.create_notification(
-                user_id=staff.id,
-                title="New Ticket Assigned to Team",
-                message=f"Ticket #{ticket.id}: {ticket.title} is waiting for action.",
-                type='info'
-            )
+        # Notify IT Staff of the ticket's team, or all IT Staff if it has none
+        entries += [{
+            'user_id': staff_id,
+            'title': "New Ticket Assigned to Team",
+            'message': f"Ticket #{ticket.id}: {ticket.title} is waiting for action.",
+            'type': 'info'
+        } for staff_id in NotificationService.get_recipient_ids(UserRole.IT_STAFF, ticket.team_id)]
+
+        NotificationService.create_notifications(entries)
 
     @staticmethod
     def notify_status_change(ticket, old_status, new_status):
@@ -118,7 +170,6 @@ class NotificationService:
         from app.core.constants import TicketStatus
         from app.services.email_service import EmailService
         from app.services.email_templates import get_ticket_resolved_email
-        from app.services.ticket_pdf_service import TicketPdfService
 
         # 1. Internal Notification
         NotificationService.create_notification(
@@ -134,10 +185,6 @@ class NotificationService:
         
         if status_val == TicketStatus.RESOLVED.value:
             try:
-                # 3. Generate PDF
-                pdf_content = TicketPdfService.generate_ticket_pdf(ticket)
-                
-                # 4. Prepare and Send Email
                 creator_name = ticket.creator.full_name if ticket.creator else "User"
                 creator_email = ticket.creator.email if ticket.creator else None
                 
@@ -148,11 +195,16 @@ class NotificationService:
                         ticket.title
                     )
                     
+                    # The summary PDF is rendered by the email worker, off the request path
                     EmailService.send_email(
                         to_email=creator_email,
                         subject=f"Resolved: Ticket #{ticket.id} - {ticket.title}",
                         body=email_body,
-                        attachments=[(f"Ticket_{ticket.id}_Summary.pdf", pdf_content)]
+                        deferred_attachments=[{
+                            "kind": "ticket_pdf",
+                            "ticket_id": ticket.id,
+                            "filename": f"Ticket_{ticket.id}_Summary.pdf"
+                        }]
                     )
                 else:
                     logger.warning(f"Could not send resolution email for ticket {ticket.id}: No creator email.")
@@ -178,13 +230,12 @@ class NotificationService:
             
         # If no assignee, but assigned to team, maybe notify team? (Too noisy maybe, let's stick to specific people)
         
-        for user_id in recipients:
-            NotificationService.create_notification(
-                user_id=user_id,
-                title=f"New Comment on Ticket #{ticket.id}",
-                message=f"{commenter.full_name} commented: {comment.text[:50]}...",
-                type='info'
-            )
+        NotificationService.create_notifications([{
+            'user_id': user_id,
+            'title': f"New Comment on Ticket #{ticket.id}",
+            'message': f"{commenter.full_name} commented: {comment.text[:50]}...",
+            'type': 'info'
+        } for user_id in sorted(recipients)])
 
         # Broadcast live activity
         try:
@@ -233,7 +284,7 @@ class NotificationService:
 
     @staticmethod
     def broadcast_live_activity(category, ticket_id, message, created_by):
-        """Broadcast live activity event to all connected sockets"""
+        """Broadcast live activity event to the sockets of demo or non-demo users, matching the ticket"""
         from app.utils.time_utils import utcnow
         from app.models.ticket import Ticket
         from app.core.database import db
@@ -254,7 +305,7 @@ class NotificationService:
             "created_by": created_by,
             "is_demo": is_demo
         }
-        socketio.emit('live_activity', activity_data)
+        socketio.emit('live_activity', activity_data, to=demo_room(is_demo))
 
         # Persist to database
         try:
@@ -273,11 +324,35 @@ class NotificationService:
 
     @staticmethod
     def broadcast_calendar_event(action, event_data):
-        """Broadcast calendar update event to all connected sockets"""
+        """Broadcast calendar update event to all authenticated sockets"""
         socketio.emit('calendar_update', {
             'action': action,
             'event': event_data
-        })
+        }, to=[DEMO_ROOM, NON_DEMO_ROOM])
+
+
 
 
 
+@event.listens_for(db.Session, "after_flush")
+def _bump_recipients_version(session, flush_context):
+    if session.info.get('recipients_changed'):
+        return
+    changed = any(isinstance(obj, User) for obj in chain(session.new, session.deleted)) or any(
+        isinstance(obj, User) and (
+            inspect(obj).attrs.role.history.has_changes() or inspect(obj).attrs.team_id.history.has_changes()
+        )
+        for obj in session.dirty
+    )
+    if changed:
+        CacheVersionService.bump(RECIPIENTS_CACHE, connection=session.connection())
+        session.info['recipients_changed'] = True
+
+@event.listens_for(db.Session, "after_commit")
+def _clear_local_recipients(session):
+    if session.info.pop('recipients_changed', False):
+        _recipients.clear()
+
+@event.listens_for(db.Session, "after_rollback")
+def _discard_recipients_change(session):
+    session.info.pop('recipients_changed', None)
@@ -0,0 +1,137 @@
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+from flask import current_app
+from sqlalchemy import select, func
+from app.core.database import db
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+from app.models.ticket_status_history import TicketStatusHistory
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Serializes eviction scans within a worker; files are only ever replaced atomically, so
+# other processes sharing the folder at worst evict slightly more than needed
+_evict_lock = threading.Lock()
+
+def _ticket_files(folder, ticket_id):
+    return glob.glob(os.path.join(folder, f"ticket_{ticket_id}_*.pdf"))
+
+class PDFCacheService:
+    """Caches rendered ticket PDFs on disk, keyed by ticket id and content version.
+
+    A version changes whenever the ticket row is updated or a comment or status history
+    entry is added or removed, so a cached file is never served for content that changed.
+    The folder is bounded to PDF_CACHE_MAX_BYTES by evicting the least recently served files.
+    """
+
+    @staticmethod
+    def get_version(ticket_id: int):
+        """Reads what the PDF depends on with one small query instead of loading the ticket.
+
+        Args:
+            ticket_id (int): The ID of the ticket.
+
+        Returns:
+            tuple: (Row with id, created_by_id, assigned_to_id and team_id, version string),
+                or (None, None) if the ticket does not exist.
+        """
+        comment_count = select(func.count(Comment.id)).where(Comment.ticket_id == Ticket.id).scalar_subquery()
+        history_count = select(func.count(TicketStatusHistory.id))\
+            .where(TicketStatusHistory.ticket_id == Ticket.id).scalar_subquery()
+        row = db.session.execute(
+            select(Ticket.id, Ticket.created_by_id, Ticket.assigned_to_id, Ticket.team_id,
+                   Ticket.updated_at, comment_count, history_count)
+            .where(Ticket.id == ticket_id)
+        ).first()
+        if row is None:
+            return None, None
+
+        updated_at = row.updated_at.isoformat() if row.updated_at else ""
+        key = f"{row.id}:{updated_at}:{row[5]}:{row[6]}"
+        return row, hashlib.sha1(key.encode()).hexdigest()[:20]
+
+    @staticmethod
+    def get_path(ticket_id: int, version: str) -> str:
+        """Returns the path of the cached PDF for this version, rendering it on a miss.
+
+        Args:
+            ticket_id (int): The ID of the ticket.
+            version (str): The version returned by `get_version`.
+
+        Returns:
+            str: Path to the PDF file, or None if the ticket no longer exists.
+        """
+        folder = current_app.config['PDF_CACHE_FOLDER']
+        path = os.path.join(folder, f"ticket_{ticket_id}_{version}.pdf")
+        try:
+            # mtime doubles as the last-served time for LRU eviction
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        from app.services.ticket_service import TicketService
+        from app.services.pdf_service import PDFService
+
+        ticket = TicketService.get_ticket_by_id(ticket_id)
+        if not ticket:
+            return None
+        content = PDFService.generate_ticket_pdf(ticket).getvalue()
+
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        logger.debug(f"Cached PDF for ticket {ticket_id} ({len(content)} bytes)")
+
+        # Older versions of this ticket can never be served again
+        for stale in _ticket_files(folder, ticket_id):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+        PDFCacheService.evict(keep=path)
+        return path
+
+    @staticmethod
+    def evict(keep: str = None) -> int:
+        """Deletes least recently served PDFs until the folder fits PDF_CACHE_MAX_BYTES.
+
+        Args:
+            keep (str, optional): A path that must survive, e.g. the file about to be served.
+
+        Returns:
+            int: The number of files removed.
+        """
+        folder = current_app.config['PDF_CACHE_FOLDER']
+        max_bytes = current_app.config.get('PDF_CACHE_MAX_BYTES', 100 * 1024 * 1024)
+        removed = 0
+        with _evict_lock:
+            entries = []
+            for path in glob.glob(os.path.join(folder, "ticket_*.pdf")):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+        return removed
@@ -0,0 +1,129 @@
+import time
+import threading
+from sqlalchemy import event, inspect
+from app.core.database import db
+from app.models.user import User
+from app.services.cache_version_service import CacheVersionService
+from app.utils.cache import TTLCache
+
+PRINCIPAL_CACHE = "auth_principals"
+
+# Fields cached per principal; changing any of them (or deleting the user) bumps the version
+_CACHED_FIELDS = ("id", "email", "role", "team_id", "is_active")
+
+# How long a worker trusts its last read of the shared version before re-reading it. Changes
+# made by this worker apply immediately; changes from other workers within this window.
+VERSION_CHECK_SECONDS = 5.0
+
+_principals = TTLCache(maxsize=4096, ttl=300)
+_version_lock = threading.Lock()
+_version = None
+_version_checked_at = 0.0
+
+class Principal:
+    """The authenticated user of a request.
+
+    Carries the fields authorization needs (id, email, role, team_id, is_active and the
+    demo flag) without a database round trip. Any other attribute, e.g. `full_name` or a
+    relationship, loads the User row on first use; assignments go to that row as well, so
+    handlers can keep treating `g.user` as the ORM user.
+    """
+
+    def __init__(self, fields, user=None):
+        object.__setattr__(self, "_fields", dict(fields))
+        object.__setattr__(self, "_user", user)
+
+    @property
+    def is_demo(self):
+        from app.core.config import Config
+        return self._fields["email"] == Config.DEMO_EMAIL
+
+    def load(self):
+        """Returns the User row, loading it on first use."""
+        user = object.__getattribute__(self, "_user")
+        if user is None:
+            user = db.session.get(User, self._fields["id"])
+            object.__setattr__(self, "_user", user)
+        return user
+
+    def __getattr__(self, name):
+        fields = object.__getattribute__(self, "_fields")
+        if name in fields:
+            return fields[name]
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.load(), name, value)
+        if name in self._fields:
+            self._fields[name] = value
+
+    def __repr__(self):
+        return f"<Principal {self._fields['id']} - {self._fields['role'].value}>"
+
+def _current_version():
+    global _version, _version_checked_at
+    now = time.monotonic()
+    with _version_lock:
+        if _version is not None and now - _version_checked_at < VERSION_CHECK_SECONDS:
+            return _version
+    version = CacheVersionService.get_version(PRINCIPAL_CACHE)
+    with _version_lock:
+        _version, _version_checked_at = version, now
+    return version
+
+class PrincipalService:
+    @staticmethod
+    def get_principal(user_id: int, token: str):
+        """Returns the principal for a decoded token, cached per worker by user id and token.
+
+        Args:
+            user_id (int): The token subject.
+            token (str): The raw token; a new token gets its own entry.
+
+        Returns:
+            Principal: The principal, or None if the user does not exist.
+        """
+        key = (user_id, token)
+        version = _current_version()
+        fields = _principals.get(key, version=version)
+        if fields is not None:
+            return Principal(fields)
+
+        # On a miss the row is needed anyway; hand it to the principal so it is not read twice
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        fields = {name: getattr(user, name) for name in _CACHED_FIELDS}
+        _principals.set(key, fields, version=version)
+        return Principal(fields, user)
+
+    @staticmethod
+    def clear_cache():
+        """Drops this worker's cached principals."""
+        global _version
+        _principals.clear()
+        with _version_lock:
+            _version = None
+
+@event.listens_for(db.Session, "after_flush")
+def _bump_principal_version(session, flush_context):
+    if session.info.get('principals_changed'):
+        return
+    changed = any(isinstance(obj, User) for obj in session.deleted) or any(
+        isinstance(obj, User) and any(
+            inspect(obj).attrs[name].history.has_changes() for name in _CACHED_FIELDS + ("password_hash",)
+        )
+        for obj in session.dirty
+    )
+    if changed:
+        CacheVersionService.bump(PRINCIPAL_CACHE, connection=session.connection())
+        session.info['principals_changed'] = True
+
+@event.listens_for(db.Session, "after_commit")
+def _clear_local_principals(session):
+    if session.info.pop('principals_changed', False):
+        PrincipalService.clear_cache()
+
+@event.listens_for(db.Session, "after_rollback")
+def _discard_principals_change(session):
+    session.info.pop('principals_changed', None)
@@ -0,0 +1,95 @@
+from sqlalchemy import select, func, or_
+from sqlalchemy.orm import joinedload, selectinload
+from app.core.database import db
+from app.models.project import Project
+from app.models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ProjectService:
+    @staticmethod
+    def list_query():
+        """Builds the project list query, newest first, with creators and members batch-loaded.
+
+        Creators are joined into the page query and all members of the page come from one
+        extra SELECT over `project_team`, so serializing a page costs a fixed number of queries.
+
+        Returns:
+            Query: The unpaginated project query.
+        """
+        return Project.query.options(
+            joinedload(Project.creator),
+            selectinload(Project.team)
+        ).order_by(Project.created_at.desc(), Project.id.desc())
+
+    @staticmethod
+    def resolve_members(member_data) -> list:
+        """Resolves team member entries to users with a single IN query.
+
+        Each entry's identifier is its 'email', or its 'name' if no email is given. An exact
+        email match wins; otherwise the identifier is compared case-insensitively with full
+        names. Unknown identifiers are skipped.
+
+        Args:
+            member_data (list[dict]): Entries from the request body, e.g. [{"email": ...}].
+
+        Returns:
+            list[User]: The matching users in request order, without duplicates.
+        """
+        identifiers = [m.get('email') or m.get('name') for m in member_data or [] if isinstance(m, dict)]
+        identifiers = [i.strip() for i in identifiers if isinstance(i, str) and i.strip()]
+        if not identifiers:
+            return []
+
+        lowered = {i.lower() for i in identifiers}
+        users = db.session.scalars(
+            select(User).where(or_(User.email.in_(identifiers), func.lower(User.full_name).in_(lowered)))
+            .order_by(User.id)
+        ).all()
+        by_email = {u.email: u for u in users}
+        by_name = {}
+        for u in users:
+            by_name.setdefault(u.full_name.lower(), u)
+
+        members, seen = [], set()
+        for identifier in identifiers:
+            user = by_email.get(identifier) or by_name.get(identifier.lower())
+            if user and user.id not in seen:
+                seen.add(user.id)
+                members.append(user)
+        return members
+
+    @staticmethod
+    def queue_assignment_emails(project, members, exclude_user_id=None) -> int:
+        """Queues one assignment email per new member in the outbox with a single commit.
+
+        Args:
+            project (Project): The project the members were added to.
+            members (list[User]): The newly assigned members.
+            exclude_user_id (int, optional): A user not to notify, e.g. the admin making the change.
+
+        Returns:
+            int: The number of emails queued.
+        """
+        from app.services.email_service import EmailService
+        from app.services.email_templates import get_project_assignment_email
+
+        start_date = project.start_date.strftime('%Y-%m-%d') if project.start_date else 'N/A'
+        deadline = project.deadline.strftime('%Y-%m-%d') if project.deadline else 'N/A'
+        messages = [{
+            "to_email": member.email,
+            "subject": f"New Project Assignment - {project.name} 📋",
+            "body": get_project_assignment_email(
+                name=member.full_name,
+                project_name=project.name,
+                role="Team Member", # detailed role not in Many-to-Many, generic "Team Member"
+                start_date=start_date,
+                deadline=deadline
+            )
+        } for member in members if member.id != exclude_user_id]
+        try:
+            return EmailService.send_emails(messages)
+        except Exception as e:
+            logger.error(f"Failed to queue project assignment emails: {e}")
+            return 0
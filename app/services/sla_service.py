@@ -1,9 +1,46 @@
-from datetime import datetime
+import time
+import threading
+from datetime import datetime, timezone
+from itertools import chain
+from flask import current_app
+from sqlalchemy import event
 from app.models.sla import SLA
 from app.models.ticket import Ticket
 from app.core.constants import SLAStatus, TicketPriority, TicketStatus
 from app.utils.time_utils import calculate_sla_deadline
 from app.core.database import db
+from app.services.cache_version_service import CacheVersionService
+
+SLA_POLICY_CACHE = "sla_policies"
+
+# Fallback values matching frontend if SLA configuration is missing
+DEFAULT_RESOLUTION_HOURS = {
+    TicketPriority.CRITICAL: 4,
+    TicketPriority.HIGH: 8,
+    TicketPriority.MEDIUM: 24,
+    TicketPriority.LOW: 48
+}
+
+class _SLAPolicyCache:
+    """Per-process copy of the SLA resolution hours, keyed by priority.
+
+    The shared version counter is re-checked at most every SLA_CACHE_CHECK_SECONDS, so
+    between checks deadline lookups do no I/O at all.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hours = None
+        self.version = None
+        self.checked_at = 0.0
+
+    def invalidate(self):
+        with self.lock:
+            self.hours = None
+            self.version = None
+            self.checked_at = 0.0
+
+_policy_cache = _SLAPolicyCache()
 
 class SLAService:
     @staticmethod
@@ -23,15 +60,119 @@ class SLAService:
         except Exception as e:
             db.session.rollback()
 
+    @staticmethod
+    def get_policy_hours() -> dict:
+        """Returns the resolution hours per priority from the in-process policy cache.
+
+        Reloads (seeding defaults if needed) only when the cache is empty or another
+        worker bumped the shared version since it was loaded.
+
+        Returns:
+            dict: A mapping of TicketPriority to resolution hours.
+        """
+        cache = _policy_cache
+        interval = current_app.config.get('SLA_CACHE_CHECK_SECONDS', 30)
+        now = time.monotonic()
+        with cache.lock:
+            if cache.hours is not None and now - cache.checked_at < interval:
+                return cache.hours
+
+        version = CacheVersionService.get_version(SLA_POLICY_CACHE)
+        with cache.lock:
+            if cache.hours is not None and cache.version == version:
+                cache.checked_at = now
+                return cache.hours
+
+        SLAService.seed_default_slas()
+        version = CacheVersionService.get_version(SLA_POLICY_CACHE)
+        hours = dict(DEFAULT_RESOLUTION_HOURS)
+        for cfg in SLA.query.all():
+            hours[cfg.priority] = cfg.resolution_time_hours
+
+        with cache.lock:
+            cache.hours = hours
+            cache.version = version
+            cache.checked_at = now
+        return hours
+
+    @staticmethod
+    def invalidate_policy_cache():
+        """Drops this worker's cached SLA policies so the next lookup reloads them."""
+        _policy_cache.invalidate()
+
     @staticmethod
     def set_sla_deadlines(ticket: Ticket):
-        """Calculates and sets the SLA deadlines on a ticket based on its priority.
+        """Calculates and sets the SLA deadline on a ticket based on its priority.
+
+        Must be called once the ticket has a `created_at` (i.e. after a flush) and again
+        whenever its priority changes. If the ticket was already resolved, its SLA state
+        is re-evaluated against the new deadline.
 
         Args:
             ticket (Ticket): The Ticket database model instance.
         """
-        # Dynamic deadline is used, but we keep this method interface for compatibility
-        pass
+        ticket.sla_due_at = SLAService.get_deadline(ticket)
+        ticket.sla_state = SLAService._resolved_state(ticket)
+
+    @staticmethod
+    def record_resolution(ticket: Ticket, resolved_at: datetime):
+        """Records the first time a ticket reached a resolved state and settles its SLA state.
+
+        Later resolutions (e.g. after a reopen) do not move `first_resolved_at`, matching
+        the earliest-RESOLVED-history rule used by `check_sla_status`.
+
+        Args:
+            ticket (Ticket): The Ticket database model instance.
+            resolved_at (datetime): When the ticket was resolved. Aware values are converted to naive UTC.
+        """
+        if ticket.first_resolved_at is not None:
+            return
+        if resolved_at.tzinfo is not None:
+            resolved_at = resolved_at.astimezone(timezone.utc).replace(tzinfo=None)
+        ticket.first_resolved_at = resolved_at
+        if ticket.sla_due_at is None:
+            ticket.sla_due_at = SLAService.get_deadline(ticket)
+        ticket.sla_state = SLAService._resolved_state(ticket)
+
+    @staticmethod
+    def _resolved_state(ticket: Ticket) -> SLAStatus:
+        if ticket.first_resolved_at is None:
+            return SLAStatus.PENDING
+        if ticket.first_resolved_at <= ticket.sla_due_at:
+            return SLAStatus.ACHIEVED
+        return SLAStatus.BREACHED
+
+    @staticmethod
+    def get_compliance_counts(is_demo: bool = False) -> dict:
+        """Counts tickets that met, missed or are still pending their SLA.
+
+        Uses the materialized `sla_state` / `sla_due_at` columns in a single GROUP BY.
+        Open tickets whose deadline has passed count as missed. Withdrawn tickets are excluded.
+
+        Args:
+            is_demo (bool, optional): Whether to count demo tickets instead of real ones.
+
+        Returns:
+            dict: A dictionary with 'met', 'missed' and 'pending' counts.
+        """
+        from sqlalchemy import case, func
+        from app.utils.time_utils import utcnow
+
+        bucket = case(
+            (Ticket.sla_state == SLAStatus.ACHIEVED, 'met'),
+            (Ticket.sla_state == SLAStatus.BREACHED, 'missed'),
+            (Ticket.sla_due_at < utcnow(), 'missed'),
+            else_='pending'
+        )
+        rows = db.session.query(bucket, func.count(Ticket.id)).filter(
+            Ticket.is_demo == is_demo,
+            Ticket.status != TicketStatus.WITHDRAWN
+        ).group_by(bucket).all()
+
+        counts = {"met": 0, "missed": 0, "pending": 0}
+        for key, count in rows:
+            counts[key] = count
+        return counts
 
     @staticmethod
     def get_deadline(ticket: Ticket) -> datetime:
@@ -43,20 +184,7 @@ class SLAService:
         Returns:
             datetime: The calculated SLA resolution deadline timestamp.
         """
-        SLAService.seed_default_slas()
-        sla_config = SLA.query.filter_by(priority=ticket.priority).first()
-        if not sla_config:
-            # Fallback values matching frontend if SLA configuration is missing
-            defaults = {
-                TicketPriority.CRITICAL: 4,
-                TicketPriority.HIGH: 8,
-                TicketPriority.MEDIUM: 24,
-                TicketPriority.LOW: 48
-            }
-            hours = defaults.get(ticket.priority, 24)
-        else:
-            hours = sla_config.resolution_time_hours
-            
+        hours = SLAService.get_policy_hours().get(ticket.priority, 24)
         return calculate_sla_deadline(ticket.created_at, hours)
 
     @staticmethod
@@ -69,6 +197,12 @@ class SLAService:
         Returns:
             SLAStatus: The current SLA status of the ticket.
         """
+        if ticket.sla_due_at is not None:
+            # Materialized fields are maintained on create, priority change and resolve
+            if ticket.first_resolved_at is not None:
+                return SLAService._resolved_state(ticket)
+            return SLAService._pending_state(ticket, ticket.sla_due_at)
+
         resolved_at = None
         # Eager load status history to find resolution time
         for history in ticket.status_history:
@@ -86,6 +220,10 @@ class SLAService:
             else:
                 return SLAStatus.BREACHED
                 
+        return SLAService._pending_state(ticket, deadline)
+
+    @staticmethod
+    def _pending_state(ticket: Ticket, deadline: datetime) -> SLAStatus:
         from app.utils.time_utils import utcnow
         now = utcnow()
         if now > deadline:
@@ -98,3 +236,22 @@ class SLAService:
             return SLAStatus.APPROACHING
             
         return SLAStatus.PENDING
+
+
+@event.listens_for(db.Session, "after_flush")
+def _bump_sla_policy_version(session, flush_context):
+    # Bump inside the writing transaction so other workers never see the new version before the new rows
+    if session.info.get('sla_policy_changed'):
+        return
+    if any(isinstance(obj, SLA) for obj in chain(session.new, session.dirty, session.deleted)):
+        CacheVersionService.bump(SLA_POLICY_CACHE, connection=session.connection())
+        session.info['sla_policy_changed'] = True
+
+@event.listens_for(db.Session, "after_commit")
+def _invalidate_local_sla_policies(session):
+    if session.info.pop('sla_policy_changed', False):
+        _policy_cache.invalidate()
+
+@event.listens_for(db.Session, "after_rollback")
+def _discard_sla_policy_change(session):
+    session.info.pop('sla_policy_changed', None)
@@ -0,0 +1,111 @@
+from itertools import chain
+from sqlalchemy import event, select, func
+from app.core.database import db
+from app.models.cache_version import CacheVersion
+from app.services.cache_version_service import CacheVersionService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tables with an indexed `updated_at` that every write moves (onupdate=utcnow). Their version
+# is max(updated_at) plus the row count, which also catches deletes, so writers to these busy
+# tables never touch a shared row.
+AGGREGATE_TABLES = frozenset({
+    "tickets",
+    "events",
+})
+# Tables without such a column get a counter in cache_versions, bumped after the writing
+# transaction commits. Tracking is limited to tables read endpoints depend on, so busy tables
+# such as the email outbox or notifications do not pay for a counter update on every write.
+COUNTER_TABLES = frozenset({
+    "csat_feedbacks",
+    "users",
+    "teams",
+    "team_mappings",
+    "announcements",
+})
+VERSIONED_TABLES = AGGREGATE_TABLES | COUNTER_TABLES
+
+def _counter_name(table):
+    return f"table:{table}"
+
+class TableVersionService:
+    """Per-table versions that conditional GETs build their ETags from.
+
+    Aggregate tables are versioned from their own rows. For counter tables, unit-of-work
+    changes are seen by a flush hook and bulk or Core INSERT/UPDATE/DELETE statements run
+    through the session by an execute hook; the tables are collected per transaction and
+    their counters bumped once after it commits, in a separate short transaction, so
+    writers do not hold the counter row lock for the length of their own transaction.
+    """
+
+    @staticmethod
+    def get_versions(tables) -> dict:
+        """Returns the current versions of the given tables with one query.
+
+        Args:
+            tables (Iterable[str]): Names from VERSIONED_TABLES.
+
+        Returns:
+            dict: {table: version}.
+        """
+        tables = list(tables)
+        columns = []
+        for table in tables:
+            if table in AGGREGATE_TABLES:
+                t = db.metadata.tables[table]
+                columns.append(select(func.max(t.c.updated_at)).scalar_subquery())
+                columns.append(select(func.count()).select_from(t).scalar_subquery())
+            else:
+                columns.append(select(CacheVersion.version)
+                               .where(CacheVersion.name == _counter_name(table)).scalar_subquery())
+        values = iter(db.session.execute(
+            select(*columns).execution_options(include_deleted=True)
+        ).one()) if columns else iter(())
+
+        versions = {}
+        for table in tables:
+            if table in AGGREGATE_TABLES:
+                latest, count = next(values), next(values)
+                versions[table] = f"{latest.isoformat() if latest else ''}/{count}"
+            else:
+                versions[table] = next(values) or 0
+        return versions
+
+def _record(session, tables):
+    session.info.setdefault('changed_tables', set()).update(set(tables) & COUNTER_TABLES)
+
+@event.listens_for(db.Session, "after_flush")
+def _record_flushed_tables(session, flush_context):
+    changed = {obj.__tablename__ for obj in chain(session.new, session.deleted)} | {
+        obj.__tablename__ for obj in session.dirty if session.is_modified(obj, include_collections=False)
+    }
+    if changed:
+        _record(session, changed)
+
+@event.listens_for(db.Session, "do_orm_execute")
+def _record_bulk_tables(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement.table, "name", None)
+    if table in COUNTER_TABLES:
+        _record(orm_execute_state.session, {table})
+
+@event.listens_for(db.Session, "after_commit")
+def _bump_committed_tables(session):
+    tables = session.info.pop('changed_tables', None)
+    if not tables:
+        return
+    # The session cannot run SQL after its commit; a failed bump leaves validators stale until
+    # the table's next write, so it is logged rather than raised to a writer that succeeded
+    try:
+        with db.engine.begin() as connection:
+            # Always in the same order, so two bumps of several counters cannot deadlock
+            for table in sorted(tables):
+                CacheVersionService.bump(_counter_name(table), connection=connection)
+    except Exception as e:
+        logger.error(f"Failed to bump table versions {sorted(tables)}: {e}")
+
+@event.listens_for(db.Session, "after_rollback")
+def _discard_changed_tables(session):
+    session.info.pop('changed_tables', None)
@@ -5,6 +5,9 @@ from app.models.ticket import Ticket
 from app.models.ticket_status_history import TicketStatusHistory
 from app.schemas.ticket_schema import TicketCreate, TicketUpdate
 from app.services.notification_service import NotificationService
+from app.services.sla_service import SLAService
+# Imported for its flush hook, which keeps the dashboard rollup in step with ticket changes
+from app.services.ticket_stats_service import TicketStatsService
 from app.core.constants import TicketStatus
 import logging
 
@@ -78,6 +81,7 @@ class TicketService:
         )
         db.session.add(new_ticket)
         db.session.flush() # Get ID
+        SLAService.set_sla_deadlines(new_ticket)
         
         # Initial History
         history = TicketStatusHistory(
@@ -88,6 +92,9 @@ class TicketService:
         )
         db.session.add(history)
         db.session.commit()
+
+        from app.services.duplicate_service import DuplicateService
+        DuplicateService.add_ticket(new_ticket)
         
         # Notify
         NotificationService.notify_ticket_created(new_ticket, new_ticket.creator)
@@ -181,10 +188,13 @@ class TicketService:
                 changed_by_id=user_id
             )
             db.session.add(history)
+            if data.status in [TicketStatus.RESOLVED, TicketStatus.CLOSED]:
+                SLAService.record_resolution(ticket, utcnow())
             updated = True
             
         if data.priority:
             ticket.priority = data.priority
+            SLAService.set_sla_deadlines(ticket)
             updated = True
 
         if data.category:
@@ -208,6 +218,11 @@ class TicketService:
             db.session.commit()
 
             if old_status != ticket.status:
+                if old_status in (TicketStatus.RESOLVED, TicketStatus.CLOSED) and \
+                        ticket.status not in (TicketStatus.RESOLVED, TicketStatus.CLOSED):
+                    # The duplicate index dropped the ticket when it was resolved
+                    from app.services.duplicate_service import DuplicateService
+                    DuplicateService.reindex([ticket.id])
                 NotificationService.notify_status_change(ticket, old_status, ticket.status)
                 # Broadcast live activity status change
                 old_status_val = old_status.value if hasattr(old_status, 'value') else str(old_status)
@@ -239,8 +254,8 @@ class TicketService:
         return ticket
 
     @staticmethod
-    def get_tickets(user, page=1, per_page=20):
-        """Retrieves a paginated list of tickets tailored to the user's role and type.
+    def _scoped_ticket_query(user):
+        """Builds the base ticket query visible to the given user.
 
         Demo users can only see demo tickets, while normal users can only see non-demo tickets.
         Employees see only their created tickets. IT Staff see tickets for their team or
@@ -248,47 +263,177 @@ class TicketService:
 
         Args:
             user (User): The user requesting the tickets.
-            page (int, optional): The page number for pagination. Defaults to 1.
-            per_page (int, optional): The number of tickets per page. Defaults to 20.
 
         Returns:
-            Pagination: A Flask-SQLAlchemy Pagination object containing the tickets.
+            Query: An unordered query scoped to the user's role and demo status.
         """
         from app.core.constants import UserRole
         from app.core.config import Config
-        
+
         # Check if user is Demo User
         is_demo_user = (user.email == Config.DEMO_EMAIL)
-        
+
         # Base query
         query = Ticket.query
-        
-        # FILTER: 
+
+        # FILTER:
         # - Demo User sees ONLY Demo tickets
         # - Normal Users see ONLY Non-Demo tickets
         if is_demo_user:
             query = query.filter_by(is_demo=True)
         else:
             query = query.filter_by(is_demo=False)
-        
-        # Add a default sort (newest first) for consistent pagination
-        query = query.order_by(Ticket.created_at.desc())
-        
+
         if user.role == UserRole.EMPLOYEE:
-             return query.filter_by(created_by_id=user.id).paginate(page=page, per_page=per_page, error_out=False)
-             
+            return query.filter_by(created_by_id=user.id)
+
         if user.role == UserRole.IT_STAFF:
             # IT Staff should see tickets for their team OR tickets specifically assigned to them
             if user.team_id:
                 return query.filter(
-                    (Ticket.team_id == user.team_id) | 
+                    (Ticket.team_id == user.team_id) |
                     (Ticket.assigned_to_id == user.id)
-                ).paginate(page=page, per_page=per_page, error_out=False)
+                )
             # If no team assigned, show all tickets (scoped by demo filter)
-            return query.paginate(page=page, per_page=per_page, error_out=False)
+            return query
+
+        return query
 
+    @staticmethod
+    def _with_list_relations(query):
+        """Eagerly joins the many-to-one relations rendered by ticket list endpoints.
+
+        Without this, serializing a page touches `creator`, `team` and `assignee` lazily,
+        issuing up to three extra SELECTs per row.
+        """
+        from sqlalchemy.orm import joinedload
+
+        return query.options(
+            joinedload(Ticket.creator),
+            joinedload(Ticket.team),
+            joinedload(Ticket.assignee)
+        )
+
+    @staticmethod
+    def get_tickets(user, page=1, per_page=20):
+        """Retrieves a paginated list of tickets tailored to the user's role and type.
+
+        Scoping rules are described in `_scoped_ticket_query`.
+
+        Args:
+            user (User): The user requesting the tickets.
+            page (int, optional): The page number for pagination. Defaults to 1.
+            per_page (int, optional): The number of tickets per page. Defaults to 20.
+
+        Returns:
+            Pagination: A Flask-SQLAlchemy Pagination object containing the tickets.
+        """
+        # Add a default sort (newest first) for consistent pagination
+        query = TicketService._scoped_ticket_query(user).order_by(Ticket.created_at.desc())
+        query = TicketService._with_list_relations(query)
         return query.paginate(page=page, per_page=per_page, error_out=False)
 
+    @staticmethod
+    def get_tickets_by_cursor(user, cursor=None, per_page=20, include_total=False) -> dict:
+        """Retrieves a page of tickets using keyset pagination on (created_at, id).
+
+        Unlike `get_tickets`, this does not issue an OFFSET or a COUNT(*) unless the total
+        is explicitly requested, so deep pages cost the same as the first one. The same
+        role and demo scoping rules apply.
+
+        Args:
+            user (User): The user requesting the tickets.
+            cursor (str, optional): Opaque token returned as `next_cursor` by a previous call.
+                None or an empty string starts from the newest ticket.
+            per_page (int, optional): The number of tickets per page. Defaults to 20.
+            include_total (bool, optional): Whether to also count all matching tickets.
+
+        Returns:
+            dict: A dictionary with 'items', 'next_cursor' (None on the last page) and
+                'total' (None unless include_total is set).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        from app.utils.pagination import encode_cursor, decode_cursor
+
+        base_query = TicketService._scoped_ticket_query(user)
+        query = TicketService._with_list_relations(base_query)
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            query = query.filter(
+                (Ticket.created_at < created_at) |
+                ((Ticket.created_at == created_at) & (Ticket.id < last_id))
+            )
+
+        # Fetch one extra row to know whether another page exists
+        rows = query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(per_page + 1).all()
+        items = rows[:per_page]
+
+        next_cursor = None
+        if len(rows) > per_page:
+            last = items[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "total": base_query.order_by(None).count() if include_total else None
+        }
+
+    @staticmethod
+    def search_tickets(user, q: str, limit: int = 20, offset: int = 0) -> list:
+        """Ranks the tickets visible to a user by full-text relevance to `q`.
+
+        Matches title, description and comment text through the full-text index (see
+        `app/models/ticket_search.py`): a GIN-indexed tsvector on Postgres, FTS5 on SQLite.
+        Title matches rank above description matches, which rank above comment matches.
+        Scoping is the same as `get_tickets`.
+
+        Args:
+            user (User): The user searching.
+            q (str): The search text. Words are matched by stem; on Postgres, quoted
+                phrases, 'or' and '-word' are also understood.
+            limit (int, optional): Maximum number of results. Defaults to 20.
+            offset (int, optional): Number of results to skip. Defaults to 0.
+
+        Returns:
+            list[tuple[Ticket, float]]: (ticket, score) pairs, best match first. Higher
+                scores are better.
+
+        Raises:
+            ValueError: If `q` contains no searchable words.
+        """
+        import re
+        from sqlalchemy import func, literal_column, text, Integer, Float
+        from app.models.ticket_search import SQLITE_FTS_TABLE
+
+        terms = re.findall(r"\w+", q or "")
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+
+        query = TicketService._with_list_relations(TicketService._scoped_ticket_query(user))
+        if db.engine.dialect.name == "postgresql":
+            tsquery = func.websearch_to_tsquery('english', q)
+            vector = literal_column("tickets.search_vector")
+            score = func.ts_rank(vector, tsquery)
+            query = query.filter(vector.op("@@")(tsquery))
+        else:
+            # Quoting every word keeps FTS5 operators in user input from being interpreted
+            match = " ".join(f'"{term}"' for term in terms)
+            fts = text(
+                f"SELECT rowid AS ticket_id, bm25({SQLITE_FTS_TABLE}, 10.0, 4.0, 1.0) AS rank "
+                f"FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match"
+            ).bindparams(match=match).columns(ticket_id=Integer, rank=Float).subquery()
+            # bm25 is lower-is-better; negate it so both backends sort by score descending
+            score = -fts.c.rank
+            query = query.join(fts, fts.c.ticket_id == Ticket.id)
+
+        rows = query.add_columns(score.label("score"))\
+            .order_by(score.desc(), Ticket.id.desc())\
+            .limit(limit).offset(offset).all()
+        return [(ticket, float(score or 0)) for ticket, score in rows]
+
     @staticmethod
     def claim_ticket(ticket_id: int, user_id: int) -> Ticket:
         """Allows an IT staff member to claim a ticket for progression.
@@ -378,150 +523,116 @@ class TicketService:
         return ticket
 
     @staticmethod
-    def auto_close_resolved_tickets():
+    def auto_close_resolved_tickets(batch_size: int = 500) -> int:
         """Automatically closes tickets that have been in 'Resolved' status for more than 7 days.
 
-        Processes all tickets in batch. Records status history changes under the system account (None).
+        Works set-based in batches of eligible ids: one conditional UPDATE ... RETURNING per
+        batch closes the tickets (skipping any another worker closed first), followed by one
+        bulk insert of status history under the system account (None), one commit and one
+        batched notification insert. Only eligible rows are read, so the run time follows
+        the number of tickets to close rather than the whole Resolved backlog.
+
+        Args:
+            batch_size (int, optional): Tickets closed per transaction. Defaults to 500.
+
+        Returns:
+            int: The number of tickets closed.
         """
-        from datetime import datetime, timedelta
+        import time
+        from collections import defaultdict
+        from datetime import timedelta
+        from sqlalchemy import select, update, insert, func
         from app.utils.time_utils import utcnow
-        from app.core.constants import TicketStatus
-        from app.models.ticket import Ticket
-        from app.core.database import db
-        from app.models.ticket_status_history import TicketStatusHistory
 
-        logger.info(f"[{utcnow()}] Starting auto-close check for Resolved tickets (7 days cutoff)...")
+        started = time.monotonic()
         cutoff_date = utcnow() - timedelta(days=7)
-        
-        # Batch processing recommended for large datasets
-        resolved_tickets = Ticket.query.filter(
-            Ticket.status == TicketStatus.RESOLVED
-        ).all()
-        
-        logger.info(f"Found {len(resolved_tickets)} tickets in Resolved status.")
-        count = 0
-        now = utcnow()
-        for ticket in resolved_tickets:
-            # Use updated_at if available, otherwise createdAt
-            last_activity = ticket.updated_at if ticket.updated_at else ticket.created_at
-            
-            if last_activity <= cutoff_date:
-                logger.info(f"Auto-closing Ticket #{ticket.id} (Last activity: {last_activity})")
-                old_status = ticket.status
-                ticket.status = TicketStatus.CLOSED
-                ticket.updated_at = now
-                
-                # Add History - System Action
-                history = TicketStatusHistory(
-                    ticket_id=ticket.id,
-                    old_status=old_status,
-                    new_status=TicketStatus.CLOSED,
-                    changed_by_id=None # System
-                )
-                db.session.add(history)
-                count += 1
-            else:
-                logger.info(f"Skipping Ticket #{ticket.id} - too recent ({last_activity})")
-            
-        db.session.commit()
-        logger.info(f"Auto-close task finished. Closed {count} tickets.")
+        last_activity = func.coalesce(Ticket.updated_at, Ticket.created_at)
+        logger.info(f"[{utcnow()}] Starting auto-close check for Resolved tickets (7 days cutoff)...")
+
+        count = batches = 0
+        last_id = 0
+        while True:
+            candidates = db.session.execute(
+                select(Ticket.id, Ticket.created_by_id, Ticket.title, Ticket.is_demo, Ticket.team_id,
+                       Ticket.category, Ticket.priority, Ticket.first_resolved_at, last_activity.label("last_activity"))
+                .where(Ticket.status == TicketStatus.RESOLVED, last_activity <= cutoff_date, Ticket.id > last_id)
+                .order_by(Ticket.id)
+                .limit(batch_size)
+            ).all()
+            if not candidates:
+                break
+            last_id = candidates[-1].id
+            batches += 1
+
+            now = utcnow()
+            # Re-checking the status in the UPDATE makes concurrent runs (one per worker) safe
+            closed_ids = set(db.session.scalars(
+                update(Ticket)
+                .where(Ticket.id.in_([c.id for c in candidates]), Ticket.status == TicketStatus.RESOLVED)
+                .values(status=TicketStatus.CLOSED, updated_at=now)
+                .returning(Ticket.id),
+                execution_options={"synchronize_session": False}
+            ))
+            closed = [c for c in candidates if c.id in closed_ids]
+            if not closed:
+                continue
+
+            db.session.execute(insert(TicketStatusHistory), [{
+                "ticket_id": c.id,
+                "old_status": TicketStatus.RESOLVED,
+                "new_status": TicketStatus.CLOSED,
+                "changed_by_id": None,  # System
+                "changed_at": now
+            } for c in closed])
+
+            # Normally set when the ticket was resolved; only tickets resolved outside
+            # TicketService (e.g. seeded data) still need their SLA outcome settled
+            unsettled = [c.id for c in closed if c.first_resolved_at is None]
+            if unsettled:
+                resolved_at = {c.id: c.last_activity for c in closed}
+                for ticket in db.session.scalars(
+                    select(Ticket).where(Ticket.id.in_(unsettled)).execution_options(populate_existing=True)
+                ):
+                    SLAService.record_resolution(ticket, resolved_at[ticket.id])
+
+            # Bulk UPDATEs bypass the rollup flush hooks
+            today = now.date()
+            deltas = defaultdict(lambda: [0, 0, 0])
+            for c in closed:
+                key = (today, bool(c.is_demo), c.team_id, c.category, c.priority)
+                deltas[key + (TicketStatus.RESOLVED,)][2] += 1
+                deltas[key + (TicketStatus.CLOSED,)][1] += 1
+            TicketStatsService.apply_deltas(deltas)
+            db.session.commit()
+
+            NotificationService.create_notifications([{
+                "user_id": c.created_by_id,
+                "title": "Ticket Closed",
+                "message": f"Your ticket #{c.id} '{c.title}' was closed automatically after 7 days in Resolved.",
+                "type": "info"
+            } for c in closed])
+            count += len(closed)
+
+        logger.info(
+            f"Auto-close task finished. Closed {count} tickets in {batches} batches "
+            f"({(time.monotonic() - started) * 1000:.0f} ms)."
+        )
+        return count
 
     @staticmethod
     def archive_and_purge_old_tickets() -> int:
         """Archives and permanently purges tickets older than the configured retention period.
 
         Tickets in terminal states (CLOSED or WITHDRAWN) or soft-deleted (is_deleted=True)
-        that have not been updated since the cutoff date are serialized to JSON files in the
-        configured archive folder, and then permanently deleted from the database along with
-        their comments and status history.
+        that have not been updated since the cutoff date are written to compressed JSONL
+        segments in the configured archive folder, and then permanently deleted from the
+        database along with their comments, status history and feedback. The work is done in
+        batches by `ArchiveService`, and an interrupted run resumes where it stopped.
 
         Returns:
             int: The number of tickets archived and purged.
         """
-        import os
-        import json
-        from datetime import timedelta
-        from app.utils.time_utils import utcnow
-        from flask import current_app
-        from app.core.database import db
-        from app.models.ticket import Ticket
-        from app.core.constants import TicketStatus
-
-        retention_days = current_app.config.get('RETENTION_DAYS', 365)
-        cutoff_date = utcnow() - timedelta(days=retention_days)
-        archive_dir = current_app.config.get('ARCHIVE_FOLDER', os.path.join(os.getcwd(), 'archive'))
-
-        logger.info(f"[{utcnow()}] Starting data retention purge (cutoff date: {cutoff_date}, retention: {retention_days} days)...")
+        from app.services.archive_service import ArchiveService
 
-        # Ensure archive directory exists
-        os.makedirs(archive_dir, exist_ok=True)
-
-        # Query all tickets matching terminal states or soft-deleted, and updated_at <= cutoff_date
-        query = Ticket.query.execution_options(include_deleted=True).filter(
-            (Ticket.status.in_([TicketStatus.CLOSED, TicketStatus.WITHDRAWN])) | (Ticket.is_deleted == True)
-        ).filter(
-            Ticket.updated_at <= cutoff_date
-        )
-        old_tickets = query.all()
-
-        logger.info(f"Found {len(old_tickets)} tickets eligible for archiving and purging.")
-        count = 0
-        for ticket in old_tickets:
-            # Construct dictionary
-            archive_data = {
-                "id": ticket.id,
-                "title": ticket.title,
-                "description": ticket.description,
-                "category": ticket.category,
-                "status": ticket.status.value if hasattr(ticket.status, 'value') else str(ticket.status),
-                "priority": ticket.priority.value if hasattr(ticket.priority, 'value') else str(ticket.priority),
-                "is_demo": ticket.is_demo,
-                "created_by_id": ticket.created_by_id,
-                "assigned_to_id": ticket.assigned_to_id,
-                "team_id": ticket.team_id,
-                "created_at": ticket.created_at.isoformat() if ticket.created_at else None,
-                "updated_at": ticket.updated_at.isoformat() if ticket.updated_at else None,
-                "is_deleted": ticket.is_deleted,
-                "deleted_at": ticket.deleted_at.isoformat() if ticket.deleted_at else None,
-                "comments": [
-                    {
-                        "id": comment.id,
-                        "text": comment.text,
-                        "user_id": comment.user_id,
-                        "author_name": comment.author.full_name if comment.author else "Unknown",
-                        "created_at": comment.created_at.isoformat() if comment.created_at else None
-                    }
-                    for comment in ticket.comments
-                ],
-                "status_history": [
-                    {
-                        "id": h.id,
-                        "old_status": h.old_status.value if (h.old_status and hasattr(h.old_status, 'value')) else str(h.old_status) if h.old_status else None,
-                        "new_status": h.new_status.value if hasattr(h.new_status, 'value') else str(h.new_status),
-                        "changed_by_id": h.changed_by_id,
-                        "changed_at": h.changed_at.isoformat() if h.changed_at else None
-                    }
-                    for h in ticket.status_history
-                ]
-            }
-
-            archive_file_path = os.path.join(archive_dir, f"ticket_archive_{ticket.id}.json")
-            try:
-                with open(archive_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(archive_data, f, indent=4)
-                
-                db.session.delete(ticket)
-                count += 1
-            except Exception as e:
-                logger.error(f"Failed to archive ticket #{ticket.id}: {e}")
-                db.session.rollback()
-                raise e
-
-        if count > 0:
-            db.session.commit()
-            logger.info(f"Successfully archived and purged {count} tickets.")
-        else:
-            logger.info("No tickets met the retention criteria for purging.")
-
-        return count
+        return ArchiveService.archive_and_purge()
 
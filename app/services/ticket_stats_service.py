@@ -0,0 +1,268 @@
+from collections import defaultdict
+from datetime import timedelta
+from sqlalchemy import event, select, update, insert, delete, func, case, inspect
+from app.core.database import db
+from app.core.constants import TicketStatus
+from app.models.ticket import Ticket
+from app.models.ticket_daily_stat import TicketDailyStat
+from app.utils.time_utils import utcnow
+import logging
+
+logger = logging.getLogger(__name__)
+
+_stats = TicketDailyStat.__table__
+
+# Counter columns in the order deltas are accumulated
+_CREATED, _ENTERED, _EXITED = 0, 1, 2
+
+def _ticket_key(is_demo, team_id, category, priority, status):
+    return (bool(is_demo), team_id, category, priority, status)
+
+def _old_value(state, attr):
+    history = state.attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, attr)
+
+class TicketStatsService:
+    """Maintains and reads the `ticket_daily_stats` rollup used by the admin dashboard.
+
+    Every ticket insert, status/team/category/priority change, soft delete and hard delete
+    is turned into counter deltas by a session flush hook, so the rollup is written in the
+    same transaction as the ticket change regardless of which code path made it.
+    """
+
+    @staticmethod
+    def apply_deltas(deltas: dict, connection=None):
+        """Adds counter deltas to the rollup rows, creating rows that do not exist yet.
+
+        Args:
+            deltas (dict): Maps (stat_date, is_demo, team_id, category, priority, status)
+                to [created, entered, exited] increments.
+            connection (Connection, optional): Connection to run on. Defaults to the session.
+        """
+        execute = connection.execute if connection is not None else db.session.execute
+        # Sorted so concurrent writers touch rows in the same order
+        for key in sorted(deltas, key=lambda k: tuple(str(part) for part in k)):
+            created, entered, exited = deltas[key]
+            if not (created or entered or exited):
+                continue
+            stat_date, is_demo, team_id, category, priority, status = key
+            result = execute(
+                update(_stats)
+                .where(
+                    _stats.c.stat_date == stat_date,
+                    _stats.c.is_demo == is_demo,
+                    _stats.c.team_id.is_not_distinct_from(team_id),
+                    _stats.c.category.is_not_distinct_from(category),
+                    _stats.c.priority == priority,
+                    _stats.c.status == status
+                )
+                .values(
+                    created_count=_stats.c.created_count + created,
+                    entered_count=_stats.c.entered_count + entered,
+                    exited_count=_stats.c.exited_count + exited
+                )
+            )
+            if result.rowcount == 0:
+                execute(insert(_stats).values(
+                    stat_date=stat_date, is_demo=is_demo, team_id=team_id, category=category,
+                    priority=priority, status=status,
+                    created_count=created, entered_count=entered, exited_count=exited
+                ))
+
+    @staticmethod
+    def get_dashboard_counts(is_demo: bool = False, days: int = 7) -> dict:
+        """Reads the dashboard ticket counters from the rollup.
+
+        Args:
+            is_demo (bool, optional): Whether to read demo or real tickets. Defaults to False.
+            days (int, optional): Length of the created/resolved trend, ending today. Defaults to 7.
+
+        Returns:
+            dict: 'total', 'by_status', 'by_category', 'by_priority', 'resolved_today' and
+                'trends' ({'dates', 'created', 'resolved'}).
+        """
+        current = func.sum(_stats.c.entered_count - _stats.c.exited_count)
+        snapshot = db.session.execute(
+            select(_stats.c.status, _stats.c.category, _stats.c.priority, current)
+            .where(_stats.c.is_demo == is_demo)
+            .group_by(_stats.c.status, _stats.c.category, _stats.c.priority)
+        ).all()
+
+        by_status, by_category, by_priority = defaultdict(int), defaultdict(int), defaultdict(int)
+        for status, category, priority, count in snapshot:
+            if not count:
+                continue
+            by_status[status] += count
+            by_category[category or "Uncategorized"] += count
+            by_priority[priority.value] += count
+
+        today = utcnow().date()
+        start = today - timedelta(days=days - 1)
+        trend_rows = db.session.execute(
+            select(
+                _stats.c.stat_date,
+                func.sum(_stats.c.created_count),
+                func.sum(case((_stats.c.status == TicketStatus.RESOLVED, _stats.c.entered_count), else_=0))
+            )
+            .where(_stats.c.is_demo == is_demo, _stats.c.stat_date >= start)
+            .group_by(_stats.c.stat_date)
+        ).all()
+        by_date = {stat_date: (created or 0, resolved or 0) for stat_date, created, resolved in trend_rows}
+
+        dates = [start + timedelta(days=i) for i in range(days)]
+        return {
+            "total": sum(by_status.values()),
+            "by_status": dict(by_status),
+            "by_category": dict(by_category),
+            "by_priority": dict(by_priority),
+            "resolved_today": by_date.get(today, (0, 0))[1],
+            "trends": {
+                "dates": [d.isoformat() for d in dates],
+                "created": [by_date.get(d, (0, 0))[0] for d in dates],
+                "resolved": [by_date.get(d, (0, 0))[1] for d in dates]
+            }
+        }
+
+    @staticmethod
+    def rebuild(batch_size: int = 500) -> int:
+        """Recomputes the whole rollup from tickets and their status history.
+
+        Historic category/priority/team changes are not recorded anywhere, so every event of
+        a ticket is attributed to its current values; the per-key totals still match the
+        incremental rollup.
+
+        Args:
+            batch_size (int, optional): Tickets loaded per round trip. Defaults to 500.
+
+        Returns:
+            int: The number of tickets processed.
+        """
+        from sqlalchemy.orm import selectinload
+
+        deltas = defaultdict(lambda: [0, 0, 0])
+        count = 0
+        last_id = 0
+        while True:
+            batch = db.session.scalars(
+                select(Ticket)
+                .options(selectinload(Ticket.status_history))
+                .where(Ticket.id > last_id)
+                .order_by(Ticket.id)
+                .limit(batch_size)
+                .execution_options(include_deleted=True)
+            ).all()
+            if not batch:
+                break
+            for ticket in batch:
+                _add_ticket_events(deltas, ticket)
+                # Cascades to the loaded status history, keeping the identity map small
+                db.session.expunge(ticket)
+            count += len(batch)
+            last_id = batch[-1].id
+
+        db.session.execute(delete(_stats))
+        rows = [
+            dict(
+                stat_date=key[0], is_demo=key[1], team_id=key[2], category=key[3],
+                priority=key[4], status=key[5],
+                created_count=created, entered_count=entered, exited_count=exited
+            )
+            for key, (created, entered, exited) in deltas.items()
+        ]
+        if rows:
+            db.session.execute(insert(_stats), rows)
+        db.session.commit()
+        logger.info(f"Rebuilt ticket_daily_stats from {count} tickets ({len(deltas)} rows).")
+        return count
+
+
+def _add_ticket_events(deltas, ticket):
+    def add(when, status, column):
+        stat_date = (when or ticket.created_at or utcnow()).date()
+        key = _ticket_key(ticket.is_demo, ticket.team_id, ticket.category, ticket.priority, status)
+        deltas[(stat_date,) + key][column] += 1
+
+    history = sorted(ticket.status_history, key=lambda h: (h.changed_at or ticket.created_at, h.id))
+    if history and history[0].old_status is None:
+        status = history[0].new_status
+    elif history:
+        status = history[0].old_status
+    else:
+        status = ticket.status
+
+    add(ticket.created_at, status, _CREATED)
+    add(ticket.created_at, status, _ENTERED)
+    for h in history:
+        if h.old_status is None or h.new_status == status:
+            continue
+        add(h.changed_at, status, _EXITED)
+        add(h.changed_at, h.new_status, _ENTERED)
+        status = h.new_status
+
+    # History can be missing for tickets changed outside TicketService (e.g. seeded data)
+    if status != ticket.status:
+        add(ticket.updated_at, status, _EXITED)
+        add(ticket.updated_at, ticket.status, _ENTERED)
+        status = ticket.status
+
+    if ticket.is_deleted:
+        add(ticket.deleted_at or ticket.updated_at, status, _EXITED)
+
+
+_KEY_ATTRS = ("is_demo", "team_id", "category", "priority", "status", "is_deleted")
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+# Make attribute history carry the previous value even when it was expired (e.g. after a commit)
+for _attr in _KEY_ATTRS:
+    event.listen(getattr(Ticket, _attr), "set", _keep_old_value, active_history=True, retval=True)
+
+@event.listens_for(db.Session, "before_flush")
+def _collect_ticket_changes(session, flush_context, instances):
+    # Old values must be read before the flush resets attribute history
+    deltas = session.info.setdefault('ticket_stats_deltas', defaultdict(lambda: [0, 0, 0]))
+    today = utcnow().date()
+
+    for obj in session.dirty:
+        if not isinstance(obj, Ticket):
+            continue
+        state = inspect(obj)
+        old = {attr: _old_value(state, attr) for attr in _KEY_ATTRS}
+        new = {attr: getattr(obj, attr) for attr in _KEY_ATTRS}
+        if old == new:
+            continue
+        if not old["is_deleted"]:
+            key = _ticket_key(old["is_demo"], old["team_id"], old["category"], old["priority"], old["status"])
+            deltas[(today,) + key][_EXITED] += 1
+        if not new["is_deleted"]:
+            key = _ticket_key(new["is_demo"], new["team_id"], new["category"], new["priority"], new["status"])
+            deltas[(today,) + key][_ENTERED] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Ticket):
+            state = inspect(obj)
+            if not _old_value(state, "is_deleted"):
+                key = _ticket_key(*(_old_value(state, attr) for attr in _KEY_ATTRS[:5]))
+                deltas[(today,) + key][_EXITED] += 1
+
+@event.listens_for(db.Session, "after_flush")
+def _track_ticket_stats(session, flush_context):
+    deltas = session.info.pop('ticket_stats_deltas', None) or defaultdict(lambda: [0, 0, 0])
+
+    # New tickets are counted after the insert so column defaults (status, created_at) are populated
+    for obj in session.new:
+        if isinstance(obj, Ticket) and not obj.is_deleted:
+            key = _ticket_key(obj.is_demo, obj.team_id, obj.category, obj.priority, obj.status)
+            created_date = (obj.created_at or utcnow()).date()
+            deltas[(created_date,) + key][_CREATED] += 1
+            deltas[(created_date,) + key][_ENTERED] += 1
+
+    if deltas:
+        TicketStatsService.apply_deltas(deltas, connection=session.connection())
+
+@event.listens_for(db.Session, "after_rollback")
+def _discard_ticket_changes(session):
+    session.info.pop('ticket_stats_deltas', None)
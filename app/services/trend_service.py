@@ -0,0 +1,118 @@
+from datetime import datetime, date, timedelta
+from sqlalchemy import select, func
+from app.core.database import db
+from app.core.constants import TicketStatus
+from app.models.ticket import Ticket
+from app.models.ticket_status_history import TicketStatusHistory
+from app.utils.time_utils import utcnow
+
+WINDOWS = (7, 30, 90, 365)
+GRANULARITIES = ("hour", "day", "week")
+
+# Hourly buckets for a quarter or a year would be thousands of points
+MAX_HOURLY_WINDOW = 30
+
+_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+def _bucket_expr(column, granularity):
+    """Truncates a timestamp column to the start of its bucket, in SQL."""
+    if db.engine.dialect.name == "sqlite":
+        if granularity == "hour":
+            return func.strftime("%Y-%m-%d %H:00:00", column)
+        if granularity == "day":
+            return func.strftime("%Y-%m-%d", column)
+        # ISO weeks start on Monday, matching date_trunc('week') on Postgres
+        return func.date(column, "weekday 0", "-6 days")
+    return func.date_trunc(granularity, column)
+
+def _to_datetime(value):
+    # Postgres returns datetimes, SQLite returns the formatted text
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(value)
+
+def _bucket_starts(window_days, granularity, now):
+    if granularity == "hour":
+        last = now.replace(minute=0, second=0, microsecond=0)
+        count = window_days * 24
+    else:
+        last = datetime.combine(now.date(), datetime.min.time())
+        count = window_days
+        if granularity == "week":
+            first_day = last - timedelta(days=window_days - 1)
+            first = first_day - timedelta(days=first_day.weekday())
+            last = last - timedelta(days=last.weekday())
+            count = (last - first).days // 7 + 1
+    step = _STEPS[granularity]
+    return [last - step * i for i in range(count - 1, -1, -1)]
+
+def _label(bucket, granularity):
+    if granularity == "hour":
+        return bucket.strftime("%Y-%m-%dT%H:00")
+    return bucket.date().isoformat()
+
+class TrendService:
+    @staticmethod
+    def get_trends(ticket_filters, window_days: int = 7, granularity: str = "day") -> dict:
+        """Counts created and resolved tickets per time bucket, grouped in SQL.
+
+        Created counts come from `Ticket.created_at`; resolved counts come from transitions
+        into Resolved in `TicketStatusHistory`, so a ticket that was resolved and later closed
+        still counts on the day it was resolved.
+
+        Args:
+            ticket_filters (list): SQL expressions on Ticket limiting the scope (e.g. demo or team).
+            window_days (int, optional): One of WINDOWS, ending now. Defaults to 7.
+            granularity (str, optional): One of GRANULARITIES. Defaults to 'day'.
+
+        Returns:
+            dict: 'window', 'granularity', 'buckets' (bucket start labels, oldest first), and
+                the matching 'created' and 'resolved' counts.
+
+        Raises:
+            ValueError: If the window or granularity is not supported.
+        """
+        if window_days not in WINDOWS:
+            raise ValueError(f"window must be one of: {', '.join(str(w) for w in WINDOWS)}")
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+        if granularity == "hour" and window_days > MAX_HOURLY_WINDOW:
+            raise ValueError(f"hour granularity is limited to windows of {MAX_HOURLY_WINDOW} days or less")
+
+        starts = _bucket_starts(window_days, granularity, utcnow())
+        since = starts[0]
+
+        created_bucket = _bucket_expr(Ticket.created_at, granularity)
+        created_rows = db.session.execute(
+            select(created_bucket, func.count(Ticket.id))
+            .where(*ticket_filters, Ticket.created_at >= since)
+            .group_by(created_bucket)
+        ).all()
+
+        resolved_bucket = _bucket_expr(TicketStatusHistory.changed_at, granularity)
+        resolved_rows = db.session.execute(
+            select(resolved_bucket, func.count(TicketStatusHistory.id))
+            .join(Ticket, Ticket.id == TicketStatusHistory.ticket_id)
+            .where(
+                *ticket_filters,
+                TicketStatusHistory.new_status == TicketStatus.RESOLVED,
+                TicketStatusHistory.changed_at >= since
+            )
+            .group_by(resolved_bucket)
+        ).all()
+
+        created = {_to_datetime(bucket): count for bucket, count in created_rows if bucket is not None}
+        resolved = {_to_datetime(bucket): count for bucket, count in resolved_rows if bucket is not None}
+        return {
+            "window": window_days,
+            "granularity": granularity,
+            "buckets": [_label(start, granularity) for start in starts],
+            "created": [created.get(start, 0) for start in starts],
+            "resolved": [resolved.get(start, 0) for start in starts]
+        }
@@ -0,0 +1,144 @@
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import joinedload
+from app.core.database import db
+from app.models.user import User
+from app.models.ticket import Ticket
+from app.core.constants import UserRole, TicketStatus
+
+def _prefix_match(column, prefix):
+    """Case-insensitive prefix match that can use the index on lower(column).
+
+    Postgres serves `LIKE 'prefix%'` from the text_pattern_ops index whatever the database
+    collation. SQLite does not use an expression index for LIKE, so there the index serves a
+    range, which is exact under SQLite's byte-wise collation, and the LIKE re-checks it.
+    """
+    lowered = func.lower(column)
+    if db.engine.dialect.name == "postgresql":
+        return lowered.startswith(prefix, autoescape=True)
+    return and_(
+        lowered >= prefix,
+        lowered < prefix + "\uffff",
+        lowered.startswith(prefix, autoescape=True)
+    )
+
+class UserService:
+    @staticmethod
+    def _filtered_query(search=None, role=None, exclude_role=None):
+        from app.core.config import Config
+
+        query = User.query.filter(User.email != Config.DEMO_EMAIL)
+        if search:
+            prefix = search.strip().lower()
+            query = query.filter(_prefix_match(User.full_name, prefix) | _prefix_match(User.email, prefix))
+        if role:
+            query = query.filter(User.role == role)
+        if exclude_role:
+            query = query.filter(User.role != exclude_role)
+        return query
+
+    @staticmethod
+    def list_users(search=None, role=None, exclude_role=None):
+        """Returns all matching users (without the demo user), newest first.
+
+        Args:
+            search (str, optional): Case-insensitive prefix of the name or email.
+            role (UserRole, optional): Only users with this role.
+            exclude_role (UserRole, optional): Leave out users with this role.
+
+        Returns:
+            list[User]: The users, with their team loaded.
+        """
+        return UserService._filtered_query(search, role, exclude_role)\
+            .options(joinedload(User.team))\
+            .order_by(User.created_at.desc(), User.id.desc()).all()
+
+    @staticmethod
+    def get_users_by_cursor(search=None, role=None, exclude_role=None, cursor=None, per_page=50,
+                            include_total=False) -> dict:
+        """Retrieves a page of users using keyset pagination on (created_at, id), newest first.
+
+        Filters are the same as `list_users`.
+
+        Args:
+            cursor (str, optional): Opaque token returned as `next_cursor` by a previous call.
+            per_page (int, optional): The number of users per page. Defaults to 50.
+            include_total (bool, optional): Whether to also count all matching users.
+
+        Returns:
+            dict: A dictionary with 'items', 'next_cursor' (None on the last page) and
+                'total' (None unless include_total is set).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        from app.utils.pagination import encode_cursor, decode_cursor
+
+        base_query = UserService._filtered_query(search, role, exclude_role)
+        query = base_query.options(joinedload(User.team))
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            query = query.filter(
+                (User.created_at < created_at) |
+                ((User.created_at == created_at) & (User.id < last_id))
+            )
+
+        # Fetch one extra row to know whether another page exists
+        rows = query.order_by(User.created_at.desc(), User.id.desc()).limit(per_page + 1).all()
+        items = rows[:per_page]
+
+        next_cursor = None
+        if len(rows) > per_page:
+            last = items[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "total": base_query.order_by(None).count() if include_total else None
+        }
+
+    @staticmethod
+    def get_ticket_counts(user_ids) -> dict:
+        """Counts raised and resolved tickets for a set of users with two grouped queries.
+
+        Returns:
+            dict: {user_id: (tickets raised, tickets resolved or closed as assignee)}.
+        """
+        if not user_ids:
+            return {}
+        raised = dict(db.session.execute(
+            select(Ticket.created_by_id, func.count(Ticket.id))
+            .where(Ticket.created_by_id.in_(user_ids))
+            .group_by(Ticket.created_by_id)
+        ).all())
+        resolved = dict(db.session.execute(
+            select(Ticket.assigned_to_id, func.count(Ticket.id))
+            .where(Ticket.assigned_to_id.in_(user_ids),
+                   Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]))
+            .group_by(Ticket.assigned_to_id)
+        ).all())
+        return {user_id: (raised.get(user_id, 0), resolved.get(user_id, 0)) for user_id in user_ids}
+
+    @staticmethod
+    def get_role_summary() -> dict:
+        """Counts users (without the demo user) per role in one grouped query.
+
+        Returns:
+            dict: 'total', 'active', and 'by_role' mapping each role value to
+                {'total', 'active'}.
+        """
+        from app.core.config import Config
+
+        rows = db.session.execute(
+            select(User.role, func.count(User.id), func.count(User.id).filter(User.is_active == True))
+            .where(User.email != Config.DEMO_EMAIL)
+            .group_by(User.role)
+        ).all()
+        by_role = {role.value: {"total": 0, "active": 0} for role in UserRole}
+        for role, total, active in rows:
+            by_role[role.value] = {"total": total, "active": active}
+        return {
+            "total": sum(r["total"] for r in by_role.values()),
+            "active": sum(r["active"] for r in by_role.values()),
+            "by_role": by_role
+        }
@@ -550,25 +550,46 @@ function filterAdminTickets(status) {
     event.target.closest('.nav-link').classList.add('active');
 }
 
+// Fetch one page of users (newest first); returns { items, nextCursor }
+async function fetchUserPage(role, cursor) {
+    const params = new URLSearchParams({ role: role, pagination: 'cursor', per_page: 50 });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`/api/v1/users?${params}`, {
+        headers: { 'Authorization': `Bearer ${getAuthToken()}` }
+    });
+    if (!response.ok) return null;
+    const data = await response.json();
+    return { items: data.items, nextCursor: data.meta.nextCursor };
+}
+
+// Append a "Load more" row to a table body while more pages exist
+function renderLoadMoreRow(tbody, colspan, nextCursor, loadPage) {
+    const existing = tbody.querySelector('.load-more-row');
+    if (existing) existing.remove();
+    if (!nextCursor) return;
+    const row = document.createElement('tr');
+    row.className = 'load-more-row';
+    row.innerHTML = `<td colspan="${colspan}" class="text-center"><button class="btn btn-sm btn-outline-secondary">Load more</button></td>`;
+    row.querySelector('button').addEventListener('click', () => loadPage(nextCursor));
+    tbody.appendChild(row);
+}
+
 // Load users (Employees only)
-async function loadUsers() {
+async function loadUsers(cursor) {
     try {
-        // Fetch only employees
-        const response = await fetch('/api/v1/users?role=employee', {
-            headers: { 'Authorization': `Bearer ${getAuthToken()}` }
-        });
-
-        if (!response.ok) return;
+        // Fetch only employees, one page at a time
+        const page = await fetchUserPage('employee', cursor);
+        if (!page) return;
 
-        const users = await response.json();
+        const users = page.items;
         const tbody = document.getElementById('usersTableBody');
 
-        if (users.length === 0) {
+        if (!cursor && users.length === 0) {
             tbody.innerHTML = '<tr><td colspan="5" class="text-center py-5"><div class="text-muted"><i class="fas fa-users fa-3x mb-3"></i><p>No employees found</p></div></td></tr>';
             return;
         }
 
-        tbody.innerHTML = users.map(user => `
+        const rows = users.map(user => `
             <tr>
                 <td><strong>${user.full_name}</strong></td>
                 <td>${user.email}</td>
@@ -577,6 +598,12 @@ async function loadUsers() {
                 <td>${user.created_at ? new Date(user.created_at).toLocaleDateString() : 'N/A'}</td>
             </tr>
         `).join('');
+        if (cursor) {
+            tbody.insertAdjacentHTML('beforeend', rows);
+        } else {
+            tbody.innerHTML = rows;
+        }
+        renderLoadMoreRow(tbody, 5, page.nextCursor, loadUsers);
 
     } catch (e) {
         console.error("Failed to load users", e);
@@ -584,23 +611,20 @@ async function loadUsers() {
 }
 
 // Load IT staff from API
-async function loadITStaff() {
+async function loadITStaff(cursor) {
     try {
-        const response = await fetch('/api/v1/users?role=it_staff', {
-            headers: { 'Authorization': `Bearer ${getAuthToken()}` }
-        });
+        const page = await fetchUserPage('it_staff', cursor);
+        if (!page) return;
 
-        if (!response.ok) return;
-
-        const staff = await response.json();
+        const staff = page.items;
         const tbody = document.getElementById('staffTableBody');
 
-        if (staff.length === 0) {
+        if (!cursor && staff.length === 0) {
             tbody.innerHTML = '<tr><td colspan="5" class="text-center py-5"><div class="text-muted"><i class="fas fa-user-cog fa-3x mb-3"></i><p>No IT staff members</p></div></td></tr>';
             return;
         }
 
-        tbody.innerHTML = staff.map((member) => `
+        const rows = staff.map((member) => `
             <tr>
                 <td><strong>${member.full_name}</strong></td>
                 <td>${member.email}</td>
@@ -614,6 +638,12 @@ async function loadITStaff() {
                 </td>
             </tr>
         `).join('');
+        if (cursor) {
+            tbody.insertAdjacentHTML('beforeend', rows);
+        } else {
+            tbody.innerHTML = rows;
+        }
+        renderLoadMoreRow(tbody, 6, page.nextCursor, loadITStaff);
     } catch (e) {
         console.error("Failed to load IT staff", e);
     }
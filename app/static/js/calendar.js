@@ -58,7 +58,12 @@ function initializeCalendar() {
 
 async function fetchEventsForCalendar(fetchInfo, successCallback, failureCallback) {
     try {
-        const response = await fetch('/api/v1/events', {
+        // Only the visible range; FullCalendar calls this again when the view moves
+        const params = new URLSearchParams({
+            start: fetchInfo.start.toISOString(),
+            end: fetchInfo.end.toISOString()
+        });
+        const response = await fetch(`/api/v1/events?${params}`, {
             headers: { 'Authorization': `Bearer ${getAuthToken()}` }
         });
 
@@ -112,6 +112,11 @@ function setupEventListeners() {
                         warningEl.querySelector('span').innerHTML =
                             `You already have an open ticket similar to this: <strong>${data.ticket.title}</strong> (ID: T-${1000 + data.ticket.id}).`;
                         warningEl.classList.remove('d-none');
+                    } else if (data.similar_count > 0) {
+                        warningEl.querySelector('span').textContent = data.similar_count === 1
+                            ? 'A similar issue has already been reported and is being worked on.'
+                            : `${data.similar_count} similar issues have already been reported and are being worked on.`;
+                        warningEl.classList.remove('d-none');
                     } else {
                         warningEl.classList.add('d-none');
                     }
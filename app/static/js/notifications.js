@@ -26,11 +26,15 @@ function setupNotifications() {
 
     // 3. Listen for Socket Events
     if (typeof socket !== 'undefined') {
+        // The server only pushes to this user's room, so no client-side filtering is needed
         socket.on('new_notification', function (data) {
-            // Check if notification is for current user
-            const currentUser = getCurrentUser();
-            if (currentUser && data.user_id === currentUser.id) {
-                handleNewNotification(data);
+            handleNewNotification(data);
+        });
+
+        // Bulk fan-out (e.g. new tickets) arrives as one batch per user
+        socket.on('new_notifications', function (batch) {
+            if (batch.length > 0) {
+                handleNewNotification(batch[batch.length - 1]);
             }
         });
     }
@@ -0,0 +1,21 @@
+import base64
+import json
+from datetime import datetime
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encodes a (created_at, id) keyset position into an opaque URL-safe token."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decodes a token produced by encode_cursor back into (created_at, id).
+
+    Raises:
+        ValueError: If the token is malformed or was not produced by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,25 @@
+# Socket.IO room names. Clients are placed in these on connect (see ticket_socket.py)
+# and NotificationService emits to them instead of broadcasting to every socket.
+DEMO_ROOM = "demo"
+NON_DEMO_ROOM = "non_demo"
+
+def user_room(user_id):
+    return f"user_{user_id}"
+
+def team_room(team_id):
+    return f"team_{team_id}"
+
+def role_room(role):
+    return f"role_{role.value if hasattr(role, 'value') else role}"
+
+def demo_room(is_demo):
+    return DEMO_ROOM if is_demo else NON_DEMO_ROOM
+
+def rooms_for(user):
+    """Returns every room a connected user belongs to."""
+    from app.core.config import Config
+
+    rooms = [user_room(user.id), role_room(user.role), demo_room(user.email == Config.DEMO_EMAIL)]
+    if user.team_id:
+        rooms.append(team_room(user.team_id))
+    return rooms
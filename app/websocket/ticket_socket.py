@@ -1,17 +1,43 @@
-from flask_socketio import emit
+from flask_socketio import join_room
 from flask import request
-# Note: SocketIO events are registered in main or via Blueprint-like structure if using extension.
-# Here we define handlers that can be imported or registered.
-# For simplicity in this structure, we'll define a function to register events.
+from app.websocket.rooms import rooms_for
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _authenticate(auth):
+    """Resolves the user from the JWT sent in the handshake, or None if it is missing or invalid."""
+    from app.core.database import db
+    from app.models.user import User
+    from app.utils.jwt import decode_token
+
+    token = (auth or {}).get('token') if isinstance(auth, dict) else None
+    # Fallback for clients that cannot send an auth payload
+    token = token or request.args.get('token')
+    if not token:
+        return None
+    try:
+        payload = decode_token(token)
+        return db.session.get(User, int(payload['sub']))
+    except Exception as e:
+        logger.info(f"Rejected socket connection {request.sid}: {e}")
+        return None
 
 def register_socket_events(socketio):
     @socketio.on('connect')
-    def handle_connect():
-        print(f"Client connected: {request.sid}")
+    def handle_connect(auth=None):
+        user = _authenticate(auth)
+        if not user or user.is_active is False:
+            # Refuses the handshake; the client receives a connect_error
+            return False
+
+        for room in rooms_for(user):
+            join_room(room)
+        logger.debug(f"Client connected: {request.sid} (user {user.id})")
 
     @socketio.on('disconnect')
-    def handle_disconnect():
-        print(f"Client disconnected: {request.sid}")
+    def handle_disconnect(*args):
+        logger.debug(f"Client disconnected: {request.sid}")
     
     # Custom events if needed, e.g. client sending message
     # Most logic is server->client (emitting) which is done in Services.
@@ -0,0 +1,47 @@
+"""Index tickets.updated_at and events.updated_at for conditional GET validators
+
+Revision ID: 2f8a6c1d9e47
+Revises: 7c1e4a9d2b58
+Create Date: 2026-10-17 23:02:51.614208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f8a6c1d9e47'
+down_revision = '7c1e4a9d2b58'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_tickets_updated_at', 'tickets'),
+    ('ix_events_updated_at', 'events'),
+]
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if _is_postgres():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for name, table in INDEXES:
+                op.create_index(name, table, ['updated_at'], postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table in INDEXES:
+            op.create_index(name, table, ['updated_at'])
+
+
+def downgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _ in INDEXES:
+            op.execute(f'DROP INDEX IF EXISTS {name}')
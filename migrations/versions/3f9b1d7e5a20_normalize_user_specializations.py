@@ -0,0 +1,101 @@
+"""Move user specializations into the user_specializations table
+
+Revision ID: 3f9b1d7e5a20
+Revises: 8d2f4b6a9c13
+Create Date: 2026-10-17 21:04:12.318440
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9b1d7e5a20'
+down_revision = '8d2f4b6a9c13'
+branch_labels = None
+depends_on = None
+
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.Integer),
+    sa.column('specializations', sa.JSON),
+)
+
+user_specializations = sa.table(
+    'user_specializations',
+    sa.column('user_id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('name_lower', sa.String),
+    sa.column('position', sa.Integer),
+)
+
+
+def _names(value):
+    # Older rows may hold the JSON as text depending on the driver
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    if not isinstance(value, list):
+        return []
+    names, seen = [], set()
+    for item in value:
+        name = str(item).strip()[:100]
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def upgrade():
+    op.create_table('user_specializations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('name_lower', sa.String(length=100), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('user_specializations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_specializations_user_id'), ['user_id'], unique=False)
+        batch_op.create_index('ix_user_specializations_name_lower', ['name_lower', 'user_id'], unique=False)
+
+    bind = op.get_bind()
+    rows = []
+    for user_id, value in bind.execute(
+        sa.select(users.c.id, users.c.specializations).where(users.c.specializations.isnot(None))
+    ):
+        rows.extend(
+            {'user_id': user_id, 'name': name, 'name_lower': name.lower(), 'position': position}
+            for position, name in enumerate(_names(value))
+        )
+    if rows:
+        op.bulk_insert(user_specializations, rows)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('specializations')
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('specializations', sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    by_user = {}
+    for user_id, name in bind.execute(
+        sa.select(user_specializations.c.user_id, user_specializations.c.name)
+        .order_by(user_specializations.c.user_id, user_specializations.c.position)
+    ):
+        by_user.setdefault(user_id, []).append(name)
+    for user_id, names in by_user.items():
+        bind.execute(users.update().where(users.c.id == user_id).values(specializations=names))
+
+    with op.batch_alter_table('user_specializations', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_specializations_name_lower')
+        batch_op.drop_index(batch_op.f('ix_user_specializations_user_id'))
+
+    op.drop_table('user_specializations')
@@ -0,0 +1,77 @@
+"""Add secondary indexes for hot query predicates
+
+Revision ID: 3f9c2a7d1b64
+Revises: 99762bfbe9c3
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d1b64'
+down_revision = '99762bfbe9c3'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_tickets_is_demo_created_at', 'tickets', ['is_demo', 'created_at'], {}),
+    ('ix_tickets_team_id_status', 'tickets', ['team_id', 'status'], {}),
+    ('ix_tickets_assigned_to_id_status', 'tickets', ['assigned_to_id', 'status'], {}),
+    ('ix_tickets_created_by_id_status', 'tickets', ['created_by_id', 'status'], {}),
+    ('ix_tickets_github_pr_url', 'tickets', ['github_pr_url'], {
+        'postgresql_where': sa.text('github_pr_url IS NOT NULL'),
+        'sqlite_where': sa.text('github_pr_url IS NOT NULL'),
+    }),
+    ('ix_ticket_status_history_ticket_id', 'ticket_status_history', ['ticket_id'], {}),
+    ('ix_comments_ticket_id', 'comments', ['ticket_id'], {}),
+    ('ix_notifications_user_id_is_read_created_at', 'notifications', ['user_id', 'is_read', 'created_at'], {}),
+    ('ix_activity_logs_timestamp', 'activity_logs', ['timestamp'], {}),
+]
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def _applicable_indexes():
+    # Some columns/tables (e.g. tickets.is_demo, comments) were historically created via
+    # db.create_all() rather than a revision, so only index what actually exists.
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    applicable = []
+    for name, table, columns, kwargs in INDEXES:
+        existing = {c['name'] for c in inspector.get_columns(table)} if table in tables else set()
+        if not set(columns) <= existing:
+            logger.warning(f"Skipping index {name}: {table}({', '.join(columns)}) not present")
+            continue
+        applicable.append((name, table, columns, kwargs))
+    return applicable
+
+
+def upgrade():
+    indexes = _applicable_indexes()
+    if _is_postgres():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in indexes:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+    else:
+        for name, table, columns, kwargs in indexes:
+            op.create_index(name, table, columns, **kwargs)
+
+
+def downgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _, _ in reversed(INDEXES):
+            op.execute(f'DROP INDEX IF EXISTS {name}')
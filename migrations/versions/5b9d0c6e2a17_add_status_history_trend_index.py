@@ -0,0 +1,40 @@
+"""Add status history index for trend queries
+
+Revision ID: 5b9d0c6e2a17
+Revises: e4b7a91c3f28
+Create Date: 2026-10-17 15:40:12.004117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9d0c6e2a17'
+down_revision = 'e4b7a91c3f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Build without blocking writes to the history table
+        with op.get_context().autocommit_block():
+            op.create_index('ix_ticket_status_history_new_status_changed_at', 'ticket_status_history',
+                            ['new_status', 'changed_at'], unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        with op.batch_alter_table('ticket_status_history', schema=None) as batch_op:
+            batch_op.create_index('ix_ticket_status_history_new_status_changed_at', ['new_status', 'changed_at'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_ticket_status_history_new_status_changed_at', table_name='ticket_status_history',
+                          postgresql_concurrently=True, if_exists=True)
+    else:
+        with op.batch_alter_table('ticket_status_history', schema=None) as batch_op:
+            batch_op.drop_index('ix_ticket_status_history_new_status_changed_at')
@@ -0,0 +1,56 @@
+"""Add expression indexes for user prefix search and role listing
+
+Revision ID: 6b2e8c4f1a37
+Revises: 3f9b1d7e5a20
+Create Date: 2026-10-17 21:48:03.771925
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2e8c4f1a37'
+down_revision = '3f9b1d7e5a20'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_users_lower_full_name', [sa.text('lower(full_name)')]),
+    ('ix_users_lower_email', [sa.text('lower(email)')]),
+    ('ix_users_role_created_at', ['role', 'created_at']),
+]
+
+# Postgres prefix search uses LIKE 'prefix%', which needs the pattern operator class to use
+# an index under a non-C collation
+PG_INDEXES = [
+    ('ix_users_lower_full_name', [sa.text('lower(full_name) text_pattern_ops')]),
+    ('ix_users_lower_email', [sa.text('lower(email) text_pattern_ops')]),
+    ('ix_users_role_created_at', ['role', 'created_at']),
+]
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if _is_postgres():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for name, columns in PG_INDEXES:
+                op.create_index(name, 'users', columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, 'users', columns)
+
+
+def downgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(INDEXES):
+                op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _ in reversed(INDEXES):
+            op.execute(f'DROP INDEX IF EXISTS {name}')
@@ -0,0 +1,41 @@
+"""Add a (start_time, end_time) index for calendar window queries
+
+Revision ID: 7c1e4a9d2b58
+Revises: 6b2e8c4f1a37
+Create Date: 2026-10-17 22:14:37.208413
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4a9d2b58'
+down_revision = '6b2e8c4f1a37'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_events_start_time_end_time'
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if _is_postgres():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            op.create_index(INDEX_NAME, 'events', ['start_time', 'end_time'],
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index(INDEX_NAME, 'events', ['start_time', 'end_time'])
+
+
+def downgrade():
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX_NAME, table_name='events', postgresql_concurrently=True, if_exists=True)
+    else:
+        op.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
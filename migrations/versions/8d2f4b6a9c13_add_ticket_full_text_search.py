@@ -0,0 +1,132 @@
+"""Add ticket full-text search index
+
+Revision ID: 8d2f4b6a9c13
+Revises: 1c7a5e9d4f62
+Create Date: 2026-10-17 21:31:08.640227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4b6a9c13'
+down_revision = '1c7a5e9d4f62'
+branch_labels = None
+depends_on = None
+
+# Mirrors app/models/ticket_search.py at the time of this revision.
+# Note: on SQLite, a later batch_alter_table('tickets') recreates the table and drops these
+# triggers; such a migration has to re-create them.
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts "
+    "USING fts5(title, description, comments, tokenize = 'porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_insert AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts (rowid, title, description, comments)
+        VALUES (new.id, new.title, new.description, '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_update AFTER UPDATE OF title, description ON tickets BEGIN
+        UPDATE tickets_fts SET title = new.title, description = new.description WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_delete AFTER DELETE ON tickets BEGIN
+        DELETE FROM tickets_fts WHERE rowid = old.id;
+    END""",
+]
+
+SQLITE_COMMENTS_UPGRADE = [
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+        UPDATE tickets_fts SET comments = (SELECT group_concat(text, ' ') FROM comments WHERE ticket_id = new.ticket_id)
+        WHERE rowid = new.ticket_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF text ON comments BEGIN
+        UPDATE tickets_fts SET comments = (SELECT group_concat(text, ' ') FROM comments WHERE ticket_id = new.ticket_id)
+        WHERE rowid = new.ticket_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+        UPDATE tickets_fts SET comments = coalesce((SELECT group_concat(text, ' ') FROM comments WHERE ticket_id = old.ticket_id), '')
+        WHERE rowid = old.ticket_id;
+    END""",
+]
+
+SQLITE_BACKFILL = "INSERT INTO tickets_fts (rowid, title, description, comments) SELECT id, title, description, {comments} FROM tickets"
+SQLITE_COMMENTS_TEXT = "coalesce((SELECT group_concat(text, ' ') FROM comments WHERE comments.ticket_id = tickets.id), '')"
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS comments_fts_delete",
+    "DROP TRIGGER IF EXISTS comments_fts_update",
+    "DROP TRIGGER IF EXISTS comments_fts_insert",
+    "DROP TRIGGER IF EXISTS tickets_fts_delete",
+    "DROP TRIGGER IF EXISTS tickets_fts_update",
+    "DROP TRIGGER IF EXISTS tickets_fts_insert",
+    "DROP TABLE IF EXISTS tickets_fts",
+]
+
+POSTGRES_UPGRADE = [
+    "ALTER TABLE tickets ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """CREATE OR REPLACE FUNCTION tickets_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT string_agg(text, ' ') FROM comments WHERE ticket_id = NEW.id), '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER tickets_search_vector BEFORE INSERT OR UPDATE OF title, description ON tickets
+    FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_refresh()""",
+]
+
+POSTGRES_COMMENTS_UPGRADE = [
+    """CREATE OR REPLACE FUNCTION comments_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        UPDATE tickets SET title = title
+        WHERE id = CASE WHEN TG_OP = 'DELETE' THEN OLD.ticket_id ELSE NEW.ticket_id END;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER comments_search_vector AFTER INSERT OR DELETE OR UPDATE OF text ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_refresh()""",
+]
+
+# Backfill without firing the row trigger per ticket
+POSTGRES_BACKFILL = """UPDATE tickets SET search_vector =
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('english', {comments}), 'C')"""
+POSTGRES_COMMENTS_TEXT = "coalesce((SELECT string_agg(text, ' ') FROM comments WHERE comments.ticket_id = tickets.id), '')"
+
+POSTGRES_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS comments_search_vector ON comments",
+    "DROP FUNCTION IF EXISTS comments_search_vector_refresh()",
+    "DROP TRIGGER IF EXISTS tickets_search_vector ON tickets",
+    "DROP FUNCTION IF EXISTS tickets_search_vector_refresh()",
+    "DROP INDEX IF EXISTS ix_tickets_search_vector",
+    "ALTER TABLE tickets DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Databases built only from migrations may not have the comments table
+    has_comments = sa.inspect(bind).has_table('comments')
+    if bind.dialect.name == 'postgresql':
+        for statement in POSTGRES_UPGRADE + (POSTGRES_COMMENTS_UPGRADE if has_comments else []):
+            op.execute(statement)
+        op.execute(POSTGRES_BACKFILL.format(comments=POSTGRES_COMMENTS_TEXT if has_comments else "''"))
+        # Built after the backfill, without blocking ticket writes
+        with op.get_context().autocommit_block():
+            op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_search_vector "
+                       "ON tickets USING gin (search_vector)")
+    else:
+        for statement in SQLITE_UPGRADE + (SQLITE_COMMENTS_UPGRADE if has_comments else []):
+            op.execute(statement)
+        op.execute(SQLITE_BACKFILL.format(comments=SQLITE_COMMENTS_TEXT if has_comments else "''"))
+
+
+def downgrade():
+    bind = op.get_bind()
+    statements = POSTGRES_DOWNGRADE if bind.dialect.name == 'postgresql' else SQLITE_DOWNGRADE
+    for statement in statements:
+        op.execute(statement)
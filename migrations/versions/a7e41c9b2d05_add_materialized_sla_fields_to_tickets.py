@@ -0,0 +1,107 @@
+"""Add materialized SLA fields to tickets
+
+Revision ID: a7e41c9b2d05
+Revises: 3f9c2a7d1b64
+Create Date: 2026-10-17 11:03:18.224690
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e41c9b2d05'
+down_revision = '3f9c2a7d1b64'
+branch_labels = None
+depends_on = None
+
+sla_status = sa.Enum('PENDING', 'ACHIEVED', 'BREACHED', 'APPROACHING', name='slastatus')
+
+# Mirrors the fallback hours in SLAService.get_deadline
+DEFAULT_RESOLUTION_HOURS = {'CRITICAL': 4, 'HIGH': 8, 'MEDIUM': 24, 'LOW': 48}
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        sla_status.create(bind, checkfirst=True)
+
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sla_due_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('first_resolved_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('sla_state', sla_status, nullable=True))
+
+    _backfill(bind)
+
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('tickets')}
+    if 'is_demo' in columns:
+        op.create_index('ix_tickets_is_demo_sla_state_sla_due_at', 'tickets', ['is_demo', 'sla_state', 'sla_due_at'])
+
+
+def _backfill(bind):
+    hours = dict(DEFAULT_RESOLUTION_HOURS)
+    for priority, resolution_hours in bind.execute(sa.text('SELECT priority, resolution_time_hours FROM slas')):
+        hours[priority] = resolution_hours
+
+    # Earliest transition to Resolved per ticket, as SLAService.check_sla_status uses
+    first_resolved = dict(bind.execute(sa.text(
+        "SELECT ticket_id, MIN(changed_at) FROM ticket_status_history "
+        "WHERE new_status = 'RESOLVED' GROUP BY ticket_id"
+    )).fetchall())
+
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.text(
+            'SELECT id, priority, status, created_at, updated_at FROM tickets '
+            'WHERE id > :last_id ORDER BY id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        for ticket_id, priority, status, created_at, updated_at in rows:
+            if created_at is None:
+                continue
+            created_at = _as_datetime(created_at)
+            due_at = created_at + timedelta(hours=hours.get(priority, 24))
+            resolved_at = _as_datetime(first_resolved.get(ticket_id))
+            if resolved_at is None and status in ('RESOLVED', 'CLOSED'):
+                resolved_at = _as_datetime(updated_at) or created_at
+
+            if resolved_at is None:
+                state = 'PENDING'
+            elif resolved_at <= due_at:
+                state = 'ACHIEVED'
+            else:
+                state = 'BREACHED'
+            updates.append({'id': ticket_id, 'due': due_at, 'resolved': resolved_at, 'state': state})
+
+        if updates:
+            bind.execute(sa.text(
+                'UPDATE tickets SET sla_due_at = :due, first_resolved_at = :resolved, sla_state = :state '
+                'WHERE id = :id'
+            ), updates)
+        last_id = rows[-1][0]
+
+
+def _as_datetime(value):
+    # SQLite hands raw text back through sa.text()
+    if value is None or not isinstance(value, str):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def downgrade():
+    bind = op.get_bind()
+    op.execute('DROP INDEX IF EXISTS ix_tickets_is_demo_sla_state_sla_due_at')
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.drop_column('sla_state')
+        batch_op.drop_column('first_resolved_at')
+        batch_op.drop_column('sla_due_at')
+
+    if bind.dialect.name == 'postgresql':
+        sla_status.drop(bind, checkfirst=True)
@@ -0,0 +1,156 @@
+"""Add ticket_daily_stats rollup table
+
+Revision ID: e4b7a91c3f28
+Revises: c2d8e5f17a39
+Create Date: 2026-10-17 14:12:40.551902
+
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7a91c3f28'
+down_revision = 'c2d8e5f17a39'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def _enum(name, *values):
+    # The ticket enums already exist on Postgres; reuse them instead of creating new types
+    if op.get_bind().dialect.name == 'postgresql':
+        return postgresql.ENUM(*values, name=name, create_type=False)
+    return sa.Enum(*values, name=name)
+
+
+def upgrade():
+    op.create_table('ticket_daily_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stat_date', sa.Date(), nullable=False),
+    sa.Column('is_demo', sa.Boolean(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('priority', _enum('ticketpriority', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'), nullable=False),
+    sa.Column('status', _enum('ticketstatus', 'OPEN', 'IN_PROGRESS', 'RESOLVED', 'CLOSED', 'WITHDRAWN'), nullable=False),
+    sa.Column('created_count', sa.Integer(), nullable=False),
+    sa.Column('entered_count', sa.Integer(), nullable=False),
+    sa.Column('exited_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ticket_daily_stats', schema=None) as batch_op:
+        batch_op.create_index('ix_ticket_daily_stats_key', ['stat_date', 'is_demo', 'team_id', 'category', 'priority', 'status'], unique=False)
+
+    _backfill()
+
+
+BATCH_SIZE = 500
+
+
+def _backfill():
+    """Seeds the rollup from existing tickets, replaying their status history.
+
+    Mirrors TicketStatsService.rebuild() (`flask rebuild-ticket-stats`) without importing
+    app code: every event of a ticket is attributed to its current team, category and
+    priority, so later incremental deltas apply on top of the seeded rows.
+    """
+    bind = op.get_bind()
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('tickets')}
+    # tickets.is_demo and tickets.category were historically created via db.create_all()
+    # rather than a revision, so they may be missing
+    is_demo = sa.column('is_demo', sa.Boolean) if 'is_demo' in columns else sa.false().label('is_demo')
+    category = sa.column('category', sa.String) if 'category' in columns else sa.null().label('category')
+    tickets = sa.table('tickets', sa.column('id', sa.Integer), sa.column('team_id', sa.Integer),
+                       sa.column('priority', sa.String),
+                       sa.column('status', sa.String), sa.column('is_deleted', sa.Boolean),
+                       sa.column('deleted_at', sa.DateTime), sa.column('created_at', sa.DateTime),
+                       sa.column('updated_at', sa.DateTime))
+    history = sa.table('ticket_status_history', sa.column('id', sa.Integer), sa.column('ticket_id', sa.Integer),
+                       sa.column('old_status', sa.String), sa.column('new_status', sa.String),
+                       sa.column('changed_at', sa.DateTime))
+    stats = sa.table('ticket_daily_stats', *(sa.column(name) for name in (
+        'stat_date', 'is_demo', 'team_id', 'category', 'priority', 'status',
+        'created_count', 'entered_count', 'exited_count')))
+
+    deltas = defaultdict(lambda: [0, 0, 0])
+    count, last_id = 0, 0
+    while True:
+        batch = bind.execute(
+            sa.select(tickets.c.id, is_demo, tickets.c.team_id, category, tickets.c.priority,
+                      tickets.c.status, tickets.c.is_deleted, tickets.c.deleted_at,
+                      tickets.c.created_at, tickets.c.updated_at)
+            .select_from(tickets)
+            .where(tickets.c.id > last_id)
+            .order_by(tickets.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        events = defaultdict(list)
+        for h in bind.execute(
+            sa.select(history.c.id, history.c.ticket_id, history.c.old_status, history.c.new_status,
+                      history.c.changed_at)
+            .where(history.c.ticket_id.in_([t.id for t in batch]))
+        ):
+            events[h.ticket_id].append(h)
+        for ticket in batch:
+            _add_ticket_events(deltas, ticket, events[ticket.id])
+        count += len(batch)
+        last_id = batch[-1].id
+
+    rows = [
+        dict(stat_date=key[0], is_demo=key[1], team_id=key[2], category=key[3], priority=key[4],
+             status=key[5], created_count=created, entered_count=entered, exited_count=exited)
+        for key, (created, entered, exited) in deltas.items()
+    ]
+    if rows:
+        bind.execute(stats.insert(), rows)
+    logger.info(f"Backfilled ticket_daily_stats from {count} tickets ({len(rows)} rows).")
+
+
+def _add_ticket_events(deltas, ticket, history):
+    created_at = ticket.created_at or datetime.utcnow()
+
+    def add(when, status, column):
+        key = ((when or created_at).date(), bool(ticket.is_demo), ticket.team_id, ticket.category,
+               ticket.priority, status)
+        deltas[key][column] += 1
+
+    history = sorted(history, key=lambda h: (h.changed_at or created_at, h.id))
+    if history and history[0].old_status is None:
+        status = history[0].new_status
+    elif history:
+        status = history[0].old_status
+    else:
+        status = ticket.status
+
+    add(created_at, status, 0)
+    add(created_at, status, 1)
+    for h in history:
+        if h.old_status is None or h.new_status == status:
+            continue
+        add(h.changed_at, status, 2)
+        add(h.changed_at, h.new_status, 1)
+        status = h.new_status
+
+    if status != ticket.status:
+        add(ticket.updated_at, status, 2)
+        add(ticket.updated_at, ticket.status, 1)
+        status = ticket.status
+
+    if ticket.is_deleted:
+        add(ticket.deleted_at or ticket.updated_at, status, 2)
+
+
+def downgrade():
+    with op.batch_alter_table('ticket_daily_stats', schema=None) as batch_op:
+        batch_op.drop_index('ix_ticket_daily_stats_key')
+
+    op.drop_table('ticket_daily_stats')
@@ -216,3 +216,44 @@ def test_direct_ticket_assignment(client, employee_headers, app):
         assert ticket.assigned_to_id == agent_id
         assert ticket.team.name == "Hardware Support"
         assert ticket.status == TicketStatus.OPEN
+
+def test_agents_paginated_with_fixed_query_count(client, employee_headers, app):
+    from sqlalchemy import event
+    hw_team = Team.query.filter_by(name="Hardware Support").first()
+    db.session.add_all([
+        User(email=f"agent{i}@tt.com", password_hash="test", full_name=f"Agent {i:02d}",
+             role=UserRole.IT_STAFF, team_id=hw_team.id, specializations=["Laptops", f"Skill {i}"])
+        for i in range(12)
+    ])
+    db.session.commit()
+    db.session.expire_all()
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get('/api/v1/users/agents?specialty=laptops&page=2&per_page=5', headers=employee_headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [a['fullName'] for a in data['items']] == [f"Agent {i:02d}" for i in range(5, 10)]
+    assert data['meta']['totalItems'] == 12
+    assert data['items'][0]['team']['name'] == "Hardware Support"
+    # Auth (version + user) + COUNT + page (with team) + specialties, independent of page size
+    assert len(statements) <= 5, statements
+
+def test_specialties_cache_follows_profile_edits(client, agent_headers, employee_headers):
+    assert client.get('/api/v1/users/specialties', headers=employee_headers).get_json() == []
+
+    client.patch('/api/v1/users/me', json={"specializations": ["VPN", " vpn ", "Firewall"]}, headers=agent_headers)
+    assert client.get('/api/v1/users/specialties', headers=employee_headers).get_json() == ["Firewall", "VPN"]
+
+    client.patch('/api/v1/users/me', json={"specializations": ["Routing"]}, headers=agent_headers)
+    assert client.get('/api/v1/users/specialties', headers=employee_headers).get_json() == ["Routing"]
+
+    agent = User.query.filter_by(email="agent_dir@tt.com").first()
+    agent.is_active = False
+    db.session.commit()
+    assert client.get('/api/v1/users/specialties', headers=employee_headers).get_json() == []
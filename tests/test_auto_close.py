@@ -0,0 +1,85 @@
+import pytest
+from datetime import timedelta
+from sqlalchemy import event
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.ticket import Ticket
+from app.models.notification import Notification
+from app.models.ticket_status_history import TicketStatusHistory
+from app.core.constants import UserRole, TicketStatus, TicketPriority
+from app.services.ticket_service import TicketService
+from app.services.ticket_stats_service import TicketStatsService
+from app.utils.time_utils import utcnow
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def employee(app):
+    user = User(email="emp@tt.com", password_hash="x", full_name="Employee", role=UserRole.EMPLOYEE)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def _resolved(user, days_ago, count=1, first_resolved=True):
+    then = utcnow() - timedelta(days=days_ago)
+    tickets = [Ticket(title=f"Resolved {days_ago}d", description="Desc", category="Software Issue",
+                      priority=TicketPriority.MEDIUM, status=TicketStatus.RESOLVED, created_by_id=user.id,
+                      created_at=then - timedelta(hours=1), first_resolved_at=then if first_resolved else None)
+               for _ in range(count)]
+    db.session.add_all(tickets)
+    db.session.commit()
+    Ticket.query.filter(Ticket.id.in_([t.id for t in tickets])).update(
+        {Ticket.updated_at: then}, synchronize_session=False
+    )
+    db.session.commit()
+    return [t.id for t in tickets]
+
+def test_auto_close_is_set_based(app, employee):
+    old = _resolved(employee, 10, count=7)
+    unsettled = _resolved(employee, 9, first_resolved=False)
+    recent = _resolved(employee, 2, count=3)
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        assert TicketService.auto_close_resolved_tickets(batch_size=5) == 8
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    # Two batches of work plus the final empty page, independent of the number of tickets
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE TICKETS SET STATUS")]
+    assert len(updates) == 2
+    assert len([s for s in statements if "INSERT INTO notifications" in s]) == 2
+
+    statuses = dict(db.session.query(Ticket.id, Ticket.status).all())
+    assert all(statuses[i] == TicketStatus.CLOSED for i in old + unsettled)
+    assert all(statuses[i] == TicketStatus.RESOLVED for i in recent)
+
+    history = TicketStatusHistory.query.filter_by(new_status=TicketStatus.CLOSED).all()
+    assert sorted(h.ticket_id for h in history) == sorted(old + unsettled)
+    assert all(h.changed_by_id is None and h.old_status == TicketStatus.RESOLVED for h in history)
+    assert Notification.query.filter_by(user_id=employee.id, title="Ticket Closed").count() == 8
+
+    # first_resolved_at is kept, and settled only where it was missing
+    ticket = db.session.get(Ticket, old[0])
+    assert ticket.first_resolved_at < utcnow() - timedelta(days=9)
+    settled = db.session.get(Ticket, unsettled[0])
+    assert settled.first_resolved_at is not None
+    assert settled.sla_state is not None
+
+    # The dashboard rollup follows the bulk update
+    counts = TicketStatsService.get_dashboard_counts()
+    assert counts["by_status"].get(TicketStatus.CLOSED) == 8
+    assert counts["by_status"].get(TicketStatus.RESOLVED) == 3
+
+    assert TicketService.auto_close_resolved_tickets() == 0
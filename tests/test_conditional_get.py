@@ -0,0 +1,217 @@
+import pytest
+from datetime import timedelta
+from sqlalchemy import event, insert, update, delete
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+from app.models.announcement import Announcement
+from app.core.constants import UserRole, TicketPriority, TicketStatus
+from app.utils.jwt import create_access_token
+from app.utils.time_utils import utcnow
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def seeded(app):
+    team = Team(name="ETag Team")
+    admin = User(email="etag_admin@tt.com", password_hash="test", full_name="ETag Admin", role=UserRole.ADMIN)
+    employee = User(email="etag_emp@tt.com", password_hash="test", full_name="ETag Employee", role=UserRole.EMPLOYEE)
+    db.session.add_all([team, admin, employee])
+    db.session.flush()
+    tickets = [Ticket(title=f"ETag ticket {i}", description="Desc", category="Software Issue",
+                      priority=TicketPriority.LOW, created_by_id=employee.id, team_id=team.id)
+               for i in range(2)]
+    db.session.add_all(tickets)
+    db.session.commit()
+    return {
+        "team": team,
+        "tickets": tickets,
+        "employee_id": employee.id,
+        "admin": {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"},
+        "employee": {"Authorization": f"Bearer {create_access_token(identity=str(employee.id))}"}
+    }
+
+def _revalidate(client, path, headers, etag):
+    return client.get(path, headers={**headers, "If-None-Match": etag})
+
+def test_ticket_list_not_modified(client, seeded):
+    first = client.get('/api/v1/tickets', headers=seeded["admin"])
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        cached = _revalidate(client, '/api/v1/tickets', seeded["admin"], etag)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+    # Only the validators are read, with one query; the list and COUNT queries never run
+    assert len(statements) == 1, statements
+    assert "max(tickets.updated_at)" in statements[0]
+    assert not any("tickets.title" in s for s in statements), statements
+
+    # Another user sees a different list, so gets a different validator
+    other = client.get('/api/v1/tickets', headers=seeded["employee"])
+    assert other.headers['ETag'] != etag
+    # So does another page
+    assert client.get('/api/v1/tickets?per_page=1', headers=seeded["admin"]).headers['ETag'] != etag
+
+    seeded["tickets"][0].priority = TicketPriority.HIGH
+    db.session.commit()
+    changed = _revalidate(client, '/api/v1/tickets', seeded["admin"], etag)
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+    # Renaming a creator changes the serialized list as well
+    etag = changed.headers['ETag']
+    db.session.get(User, seeded["employee_id"]).full_name = "Renamed Employee"
+    db.session.commit()
+    assert _revalidate(client, '/api/v1/tickets', seeded["admin"], etag).status_code == 200
+
+def test_bulk_and_core_writes_change_validators(client, seeded):
+    etag = client.get('/api/v1/tickets', headers=seeded["admin"]).headers['ETag']
+    db.session.execute(
+        update(Ticket).where(Ticket.id == seeded["tickets"][0].id).values(status=TicketStatus.CLOSED),
+        execution_options={"synchronize_session": False}
+    )
+    db.session.commit()
+    assert _revalidate(client, '/api/v1/tickets', seeded["admin"], etag).status_code == 200
+
+    etag = client.get('/api/v1/users/teams', headers=seeded["employee"]).headers['ETag']
+    assert _revalidate(client, '/api/v1/users/teams', seeded["employee"], etag).status_code == 304
+    db.session.execute(insert(Team.__table__), [{"name": "Core Team"}])
+    db.session.commit()
+    changed = _revalidate(client, '/api/v1/users/teams', seeded["employee"], etag)
+    assert changed.status_code == 200
+    assert "Core Team" in [t["name"] for t in changed.get_json()]
+
+def test_ticket_detail_scoped_to_ticket(client, seeded):
+    first, second = seeded["tickets"]
+    path = f'/api/v1/tickets/{first.id}'
+    etag = client.get(path, headers=seeded["admin"]).headers['ETag']
+    assert _revalidate(client, path, seeded["admin"], etag).status_code == 304
+
+    # Changes to another ticket leave this ticket's validator alone
+    second.title = "Another title"
+    db.session.commit()
+    assert _revalidate(client, path, seeded["admin"], etag).status_code == 304
+
+    db.session.add(Comment(text="New comment", ticket_id=first.id, user_id=seeded["employee_id"]))
+    db.session.commit()
+    changed = _revalidate(client, path, seeded["admin"], etag)
+    assert changed.status_code == 200
+    assert [c["text"] for c in changed.get_json()["comments"]] == ["New comment"]
+
+    assert client.get('/api/v1/tickets/9999', headers=seeded["admin"]).status_code == 404
+
+def test_announcements_expire_without_writes(client, seeded, monkeypatch):
+    db.session.add(Announcement(title="Short lived", message="Soon gone", expires_at=utcnow() + timedelta(hours=1)))
+    db.session.commit()
+
+    first = client.get('/api/v1/announcements', headers=seeded["employee"])
+    assert [a["title"] for a in first.get_json()] == ["Short lived"]
+    etag = first.headers['ETag']
+    assert _revalidate(client, '/api/v1/announcements', seeded["employee"], etag).status_code == 304
+
+    later = utcnow() + timedelta(hours=2)
+    monkeypatch.setattr("app.utils.time_utils.utcnow", lambda: later)
+    expired = _revalidate(client, '/api/v1/announcements', seeded["employee"], etag)
+    assert expired.status_code == 200
+    assert expired.get_json() == []
+
+def test_team_mappings_not_modified(client, seeded):
+    etag = client.get('/api/v1/admin/team-mappings', headers=seeded["admin"]).headers['ETag']
+    assert _revalidate(client, '/api/v1/admin/team-mappings', seeded["admin"], etag).status_code == 304
+
+    response = client.post('/api/v1/admin/team-mappings', headers=seeded["admin"],
+                           json={"category": "Network Issue", "team_id": seeded["team"].id})
+    assert response.status_code == 201
+    assert _revalidate(client, '/api/v1/admin/team-mappings', seeded["admin"], etag).status_code == 200
+
+    # The 304 path still goes through authorization
+    assert _revalidate(client, '/api/v1/admin/team-mappings', seeded["employee"], etag).status_code == 403
+
+def _statements_during(fn):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return statements
+
+def test_ticket_writes_leave_counters_alone(client, seeded):
+    from app.models.ticket_status_history import TicketStatusHistory
+
+    first, second = seeded["tickets"]
+    etag = client.get('/api/v1/tickets', headers=seeded["admin"]).headers['ETag']
+
+    def write():
+        first.status = TicketStatus.IN_PROGRESS
+        db.session.add(TicketStatusHistory(ticket_id=first.id, old_status=TicketStatus.OPEN,
+                                           new_status=TicketStatus.IN_PROGRESS, changed_by_id=seeded["employee_id"]))
+        db.session.add(Comment(text="Working on it", ticket_id=first.id, user_id=seeded["employee_id"]))
+        db.session.commit()
+        db.session.execute(update(Ticket).where(Ticket.id == second.id).values(priority=TicketPriority.HIGH),
+                           execution_options={"synchronize_session": False})
+        db.session.commit()
+    # Ticket versions come from max(updated_at) and the row count, so no shared row is locked
+    assert not any("cache_versions" in s for s in _statements_during(write))
+    changed = _revalidate(client, '/api/v1/tickets', seeded["admin"], etag)
+    assert changed.status_code == 200
+
+    # A hard delete does not move max(updated_at) but changes the count
+    etag = changed.headers['ETag']
+    db.session.execute(delete(Ticket).where(Ticket.id == first.id).execution_options(include_deleted=True))
+    db.session.commit()
+    assert _revalidate(client, '/api/v1/tickets', seeded["admin"], etag).status_code == 200
+
+def test_counters_bump_after_commit(app, seeded):
+    from app.services.table_version_service import TableVersionService
+
+    before = TableVersionService.get_versions(["teams"])["teams"]
+    seeded["team"].name = "Renamed Team"
+    # Nothing touches the counter row while the writer's transaction is open
+    assert not any("cache_versions" in s for s in _statements_during(db.session.flush))
+    assert not any("cache_versions" in s for s in _statements_during(db.session.rollback))
+    assert TableVersionService.get_versions(["teams"])["teams"] == before
+
+    seeded["team"].name = "Renamed Team"
+    db.session.add(User(email="new_member@tt.com", password_hash="test", full_name="New", role=UserRole.EMPLOYEE))
+    db.session.commit()
+    versions = TableVersionService.get_versions(["teams", "users"])
+    assert versions["teams"] == before + 1 and versions["users"] >= 1
+
+def test_feedback_changes_ticket_detail(client, seeded):
+    from app.models.csat_feedback import CSATFeedback
+
+    ticket = seeded["tickets"][0]
+    path = f'/api/v1/tickets/{ticket.id}'
+    etag = client.get(path, headers=seeded["employee"]).headers['ETag']
+    db.session.add(CSATFeedback(ticket_id=ticket.id, user_id=seeded["employee_id"], rating=5, comment="Great"))
+    db.session.commit()
+    changed = _revalidate(client, path, seeded["employee"], etag)
+    assert changed.status_code == 200
+    assert changed.get_json()["feedback"]["rating"] == 5
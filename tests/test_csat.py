@@ -197,3 +197,79 @@ def test_dashboard_csat_analytics(client, auth_headers):
     assert data["csat"]["breakdown"]["1"] == 0 # Excluded demo rating
     assert len(data["csat"]["recent"]) == 2
     assert data["csat"]["recent"][0]["ticketTitle"] in ["T1", "T2"]
+
+def _seed_rated_tickets(auth_headers):
+    from datetime import timedelta
+    from app.models.team import Team
+    from app.utils.time_utils import utcnow
+
+    network, software = Team(name="Network Team"), Team(name="Software Team")
+    db.session.add_all([network, software])
+    db.session.commit()
+
+    specs = [
+        # (category, team, assignee, rating, age in days)
+        ("Network Issue", network, auth_headers["admin_id"], 5, 1),
+        ("Network Issue", network, auth_headers["admin_id"], 4, 2),
+        ("Software Issue", software, None, 2, 40),
+    ]
+    for category, team, assignee_id, rating, age in specs:
+        t = Ticket(title="Rated", description="H", category=category, priority=TicketPriority.LOW,
+                   created_by_id=auth_headers["employee1_id"], status=TicketStatus.RESOLVED,
+                   team_id=team.id, assigned_to_id=assignee_id)
+        db.session.add(t)
+        db.session.flush()
+        db.session.add(CSATFeedback(rating=rating, ticket_id=t.id, user_id=auth_headers["employee1_id"],
+                                    created_at=utcnow() - timedelta(days=age)))
+    db.session.commit()
+    return network, software
+
+def test_csat_endpoint_breakdowns(client, auth_headers):
+    network, software = _seed_rated_tickets(auth_headers)
+
+    data = client.get('/api/v1/analytics/csat?group_by=team', headers=auth_headers["admin"]).get_json()
+    assert data["total"] == 3
+    assert data["average"] == 3.67
+    assert data["breakdown"] == {"1": 0, "2": 1, "3": 0, "4": 1, "5": 1}
+    groups = {g["label"]: g for g in data["groups"]}
+    assert groups["Network Team"]["average"] == 4.5
+    assert groups["Software Team"]["breakdown"]["2"] == 1
+
+    data = client.get('/api/v1/analytics/csat?group_by=assignee', headers=auth_headers["admin"]).get_json()
+    assert {g["label"]: g["total"] for g in data["groups"]} == {"Admin User": 2, "Unassigned": 1}
+
+    data = client.get('/api/v1/analytics/csat?group_by=category&days=30', headers=auth_headers["admin"]).get_json()
+    assert data["total"] == 2
+    assert [g["key"] for g in data["groups"]] == ["Network Issue"]
+
+    data = client.get(f'/api/v1/analytics/csat?team_id={software.id}&recent=5', headers=auth_headers["admin"]).get_json()
+    assert data["average"] == 2.0
+    assert len(data["recent"]) == 1
+
+    assert client.get('/api/v1/analytics/csat?group_by=priority', headers=auth_headers["admin"]).status_code == 400
+    assert client.get('/api/v1/analytics/csat', headers=auth_headers["employee1"]).status_code == 403
+
+def test_csat_results_cached_until_new_feedback(client, auth_headers):
+    from sqlalchemy import event
+
+    _seed_rated_tickets(auth_headers)
+    assert client.get('/api/v1/analytics/csat?group_by=team', headers=auth_headers["admin"]).get_json()["total"] == 3
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        client.get('/api/v1/analytics/csat?group_by=team', headers=auth_headers["admin"])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    # Only the auth lookup and the cache version check; no aggregation
+    assert not any("csat_feedbacks" in sql for sql in statements)
+
+    t = Ticket(title="New", description="H", category="Network Issue", priority=TicketPriority.LOW,
+               created_by_id=auth_headers["employee1_id"], status=TicketStatus.RESOLVED)
+    db.session.add(t)
+    db.session.commit()
+    response = client.post(f'/api/v1/tickets/{t.id}/feedback', json={"rating": 1}, headers=auth_headers["employee1"])
+    assert response.status_code == 201
+
+    assert client.get('/api/v1/analytics/csat?group_by=team', headers=auth_headers["admin"]).get_json()["total"] == 4
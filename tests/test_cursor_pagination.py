@@ -0,0 +1,120 @@
+import pytest
+from datetime import timedelta
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.ticket import Ticket
+from app.core.constants import UserRole, TicketPriority
+from app.utils.jwt import create_access_token
+from app.utils.time_utils import utcnow
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def employee(app):
+    user = User(
+        email="cursor_emp@tt.com",
+        password_hash="test",
+        full_name="Cursor Employee",
+        role=UserRole.EMPLOYEE
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+def _seed_tickets(creator_id, count, team_id=None, same_timestamp=False):
+    base = utcnow()
+    for i in range(count):
+        db.session.add(Ticket(
+            title=f"Ticket {i}",
+            description="Desc",
+            category="Software Issue",
+            priority=TicketPriority.LOW,
+            created_by_id=creator_id,
+            team_id=team_id,
+            created_at=base if same_timestamp else base - timedelta(minutes=i)
+        ))
+    db.session.commit()
+
+def test_cursor_walks_all_pages_without_duplicates(client, employee):
+    # Identical timestamps force the id tie-breaker to do the work
+    _seed_tickets(employee.id, 7, same_timestamp=True)
+
+    seen = []
+    cursor = ""
+    while True:
+        response = client.get(f'/api/v1/tickets?per_page=3&cursor={cursor}', headers=_headers(employee))
+        assert response.status_code == 200
+        data = response.get_json()
+        seen.extend(item['id'] for item in data['items'])
+        assert 'total_items' not in data['meta']
+        if not data['meta']['hasMore']:
+            assert data['meta']['nextCursor'] is None
+            break
+        cursor = data['meta']['nextCursor']
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    assert seen == sorted(seen, reverse=True)
+
+def test_cursor_mode_optional_total(client, employee):
+    _seed_tickets(employee.id, 4)
+
+    response = client.get('/api/v1/tickets?pagination=cursor&per_page=2&include_total=true', headers=_headers(employee))
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data['items']) == 2
+    assert data['meta']['totalItems'] == 4
+    assert data['meta']['hasMore'] is True
+
+def test_cursor_mode_respects_scoping(app, client, employee):
+    team = Team(name="Cursor Team")
+    db.session.add(team)
+    db.session.commit()
+
+    other = User(email="other_emp@tt.com", password_hash="test", full_name="Other", role=UserRole.EMPLOYEE)
+    staff = User(email="cursor_staff@tt.com", password_hash="test", full_name="Staff", role=UserRole.IT_STAFF, team_id=team.id)
+    db.session.add_all([other, staff])
+    db.session.commit()
+
+    _seed_tickets(employee.id, 2)
+    _seed_tickets(other.id, 3, team_id=team.id)
+
+    # Employee only sees their own tickets
+    data = client.get('/api/v1/tickets?pagination=cursor', headers=_headers(employee)).get_json()
+    assert len(data['items']) == 2
+    assert all(item['createdById'] == employee.id for item in data['items'])
+
+    # IT staff only sees their team's tickets
+    data = client.get('/api/v1/tickets?pagination=cursor', headers=_headers(staff)).get_json()
+    assert len(data['items']) == 3
+
+def test_invalid_cursor_rejected(client, employee):
+    response = client.get('/api/v1/tickets?cursor=not-a-real-cursor', headers=_headers(employee))
+    assert response.status_code == 400
+
+def test_cursor_mode_clamps_per_page(client, employee):
+    _seed_tickets(employee.id, 3)
+    for per_page in (0, -3):
+        response = client.get(f'/api/v1/tickets?pagination=cursor&per_page={per_page}', headers=_headers(employee))
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data['items']) == 1
+        assert data['meta']['per_page'] == 1
+        assert data['meta']['has_more'] is True
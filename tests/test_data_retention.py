@@ -14,6 +14,7 @@ from app.models.comment import Comment
 from app.models.ticket_status_history import TicketStatusHistory
 from app.core.constants import UserRole, TicketStatus
 from app.services.ticket_service import TicketService
+from app.services.archive_service import ArchiveService
 from app.utils.jwt import create_access_token
 
 @pytest.fixture
@@ -104,16 +105,20 @@ def test_archive_and_purge_service(app, temp_archive, test_user):
         assert Comment.query.filter_by(ticket_id=ticket_id).first() is None
         assert TicketStatusHistory.query.filter_by(ticket_id=ticket_id).first() is None
 
-        # Check archive JSON
-        archive_path = os.path.join(temp_archive, f"ticket_archive_{ticket_id}.json")
-        assert os.path.exists(archive_path)
+        # Check archive segment
+        manifest = ArchiveService.read_manifest(temp_archive)
+        assert len(manifest) == 1
+        assert manifest[0]['segment'].endswith('.jsonl.gz')
+        assert os.path.exists(os.path.join(temp_archive, manifest[0]['segment']))
 
-        with open(archive_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            assert data['id'] == ticket_id
-            assert data['title'] == "Old Closed Ticket"
-            assert len(data['comments']) == 1
-            assert data['comments'][0]['text'] == "This is a test comment"
+        records = list(ArchiveService.iter_records(temp_archive))
+        assert len(records) == 1
+        data = records[0]
+        assert data['id'] == ticket_id
+        assert data['title'] == "Old Closed Ticket"
+        assert len(data['comments']) == 1
+        assert data['comments'][0]['text'] == "This is a test comment"
+        assert data['comments'][0]['author_name'] == "User Test"
 
 def test_soft_deleted_purge(app, temp_archive, test_user):
     with app.app_context():
@@ -144,9 +149,10 @@ def test_soft_deleted_purge(app, temp_archive, test_user):
         # Check DB
         assert Ticket.query.execution_options(include_deleted=True).filter_by(id=ticket_id).first() is None
 
-        # Check file
-        archive_path = os.path.join(temp_archive, f"ticket_archive_{ticket_id}.json")
-        assert os.path.exists(archive_path)
+        # Check archive
+        records = list(ArchiveService.iter_records(temp_archive))
+        assert [r['id'] for r in records] == [ticket_id]
+        assert records[0]['is_deleted'] is True
 
 def test_manual_purge_api(app, client, admin_headers, test_user):
     # Create ticket
@@ -175,3 +181,171 @@ def test_manual_purge_api(app, client, admin_headers, test_user):
     # Verify database
     with app.app_context():
         assert Ticket.query.execution_options(include_deleted=True).filter_by(id=ticket_id).first() is None
+
+def _old_tickets(user, count):
+    tickets = [
+        Ticket(title=f"Old {i}", description="Desc", category="Software Issue",
+               status=TicketStatus.CLOSED, created_by_id=user.id)
+        for i in range(count)
+    ]
+    db.session.add_all(tickets)
+    db.session.flush()
+    for ticket in tickets:
+        db.session.add(Comment(ticket_id=ticket.id, user_id=user.id, text=f"Comment {ticket.id}"))
+        db.session.add(TicketStatusHistory(ticket_id=ticket.id, old_status=TicketStatus.RESOLVED,
+                                           new_status=TicketStatus.CLOSED, changed_by_id=user.id))
+    db.session.commit()
+    Ticket.query.update({Ticket.updated_at: utcnow() - timedelta(days=40)})
+    db.session.commit()
+    return [t.id for t in tickets]
+
+def test_purge_runs_in_batches(app, temp_archive, test_user):
+    from sqlalchemy import event
+
+    ids = _old_tickets(test_user, 7)
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        assert ArchiveService.archive_and_purge(batch_size=3) == 7
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    manifest = ArchiveService.read_manifest(temp_archive)
+    assert [entry['count'] for entry in manifest] == [3, 3, 1]
+    assert sorted(r['id'] for r in ArchiveService.iter_records(temp_archive)) == ids
+    assert Ticket.query.execution_options(include_deleted=True).count() == 0
+    assert Comment.query.count() == 0
+    # One bulk DELETE per table per batch, never one per ticket
+    deletes = [s for s in statements if s.lstrip().upper().startswith("DELETE")]
+    assert len(deletes) == 3 * 5
+    assert not os.path.exists(os.path.join(temp_archive, "checkpoint.json"))
+
+    from app.services.ticket_stats_service import TicketStatsService
+    assert TicketStatsService.get_dashboard_counts()["total"] == 0
+
+def test_interrupted_purge_resumes_without_duplicates(app, temp_archive, test_user, monkeypatch):
+    ids = _old_tickets(test_user, 5)
+    original = ArchiveService._purge
+    calls = []
+
+    def crash_on_second_batch(ticket_ids):
+        calls.append(ticket_ids)
+        if len(calls) == 2:
+            raise RuntimeError("worker killed")
+        return original(ticket_ids)
+
+    monkeypatch.setattr(ArchiveService, "_purge", staticmethod(crash_on_second_batch))
+    with pytest.raises(RuntimeError):
+        ArchiveService.archive_and_purge(batch_size=2)
+    db.session.rollback()
+    assert os.path.exists(os.path.join(temp_archive, "checkpoint.json"))
+    assert Ticket.query.count() == 3
+
+    monkeypatch.setattr(ArchiveService, "_purge", original)
+    assert ArchiveService.archive_and_purge(batch_size=2) == 3
+
+    archived = [r['id'] for r in ArchiveService.iter_records(temp_archive)]
+    assert archived == ids
+    assert [entry['count'] for entry in ArchiveService.read_manifest(temp_archive)] == [2, 2, 1]
+    assert Ticket.query.execution_options(include_deleted=True).count() == 0
+    assert not os.path.exists(os.path.join(temp_archive, "checkpoint.json"))
+
+def test_purge_with_nothing_eligible(app, temp_archive, test_user):
+    db.session.add(Ticket(title="Recent", description="Desc", category="Software Issue",
+                          status=TicketStatus.CLOSED, created_by_id=test_user.id))
+    db.session.commit()
+
+    assert ArchiveService.archive_and_purge() == 0
+    assert Ticket.query.count() == 1
+    assert not os.path.exists(os.path.join(temp_archive, "checkpoint.json"))
+
+def test_archived_ticket_lookup_api(app, client, admin_headers, temp_archive, test_user):
+    ids = _old_tickets(test_user, 5)
+    ArchiveService.archive_and_purge(batch_size=2)
+
+    response = client.get(f'/api/v1/admin/archive/tickets/{ids[3]}', headers=admin_headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['id'] == ids[3]
+    assert data['comments'][0]['text'] == f"Comment {ids[3]}"
+    assert data['status_history'][0]['new_status'] == "Closed"
+
+    assert client.get('/api/v1/admin/archive/tickets/9999', headers=admin_headers).status_code == 404
+
+    page = client.get(f'/api/v1/admin/archive/tickets?created_by_id={test_user.id}&limit=3',
+                      headers=admin_headers).get_json()
+    assert [e['ticket_id'] for e in page['items']] == ids[:3]
+    rest = client.get(f'/api/v1/admin/archive/tickets?created_by_id={test_user.id}&after_id={page["next_after_id"]}',
+                      headers=admin_headers).get_json()
+    assert [e['ticket_id'] for e in rest['items']] == ids[3:]
+    assert client.get('/api/v1/admin/archive/tickets?from=yesterday', headers=admin_headers).status_code == 400
+
+    # The sidecar is derived data and can be recreated from the segments
+    os.remove(os.path.join(temp_archive, "index.sqlite"))
+    assert ArchiveService.rebuild_index() == 5
+    assert ArchiveService.get_archived_ticket(ids[3])['id'] == ids[3]
+
+def test_restore_archived_tickets(app, temp_archive, test_user):
+    from app.models.csat_feedback import CSATFeedback
+    from app.services.ticket_stats_service import TicketStatsService
+
+    ids = _old_tickets(test_user, 4)
+    db.session.add(CSATFeedback(ticket_id=ids[0], user_id=test_user.id, rating=4, comment="Fine"))
+    db.session.commit()
+    ArchiveService.archive_and_purge(batch_size=3)
+    assert Ticket.query.count() == 0
+
+    runner = app.test_cli_runner()
+    output = runner.invoke(args=['restore-archived-tickets', str(ids[0]), str(ids[2]), '9999', '--batch-size', '1'])
+    assert output.exit_code == 0, output.output
+    assert "Restored 2 tickets." in output.output
+    assert "Not in the archive: 9999" in output.output
+
+    restored = Ticket.query.order_by(Ticket.id).all()
+    assert [t.id for t in restored] == [ids[0], ids[2]]
+    assert restored[0].status == TicketStatus.CLOSED
+    assert [c.text for c in restored[0].comments] == [f"Comment {ids[0]}"]
+    assert len(restored[0].status_history) == 1
+    assert restored[0].feedback.rating == 4
+    assert TicketStatsService.get_dashboard_counts()["total"] == 2
+
+    result = ArchiveService.restore([ids[0], ids[1]])
+    assert result["restored"] == [ids[1]]
+    assert result["already_present"] == [ids[0]]
+    assert Ticket.query.count() == 3
+
+def test_restored_tickets_survive_next_purge(app, temp_archive, test_user):
+    ids = _old_tickets(test_user, 2)
+    ArchiveService.archive_and_purge()
+    assert Ticket.query.count() == 0
+
+    result = ArchiveService.restore(ids)
+    assert result["restored"] == ids
+
+    # The restore restarts the retention period, so the next run leaves the tickets alone
+    assert ArchiveService.archive_and_purge() == 0
+    restored = Ticket.query.order_by(Ticket.id).all()
+    assert [t.id for t in restored] == ids
+    assert all(t.status == TicketStatus.CLOSED for t in restored)
+    assert all(t.updated_at > utcnow() - timedelta(minutes=1) for t in restored)
+
+def test_restored_open_tickets_are_reindexed_for_duplicates(app, temp_archive, test_user):
+    from app.services.duplicate_service import DuplicateService
+
+    ticket = Ticket(title="Shared drive mapping lost", description="Drive S: missing after reboot",
+                    category="Software Issue", status=TicketStatus.WITHDRAWN, created_by_id=test_user.id)
+    db.session.add(ticket)
+    db.session.commit()
+    ticket_id = ticket.id
+    ticket.updated_at = utcnow() - timedelta(days=40)
+    db.session.add(Ticket(title="Monitor flickers", description="Desc", category="Hardware Issue",
+                          created_by_id=test_user.id))
+    db.session.commit()
+    ArchiveService.archive_and_purge()
+    DuplicateService.rebuild()
+
+    # The restored id is below the index's high-water mark, so only the restore can index it
+    ArchiveService.restore([ticket_id])
+    matches, _ = DuplicateService.find_similar(test_user, "Shared drive mapping lost")
+    assert [t.id for t, _ in matches] == [ticket_id]
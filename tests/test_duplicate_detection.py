@@ -0,0 +1,152 @@
+import pytest
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.ticket import Ticket
+from app.core.constants import UserRole, TicketPriority, TicketStatus
+from app.services.duplicate_service import DuplicateService, MinHashLSH, shingles, signature
+from app.utils.jwt import create_access_token
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def users(app):
+    users = {
+        "alice": User(email="alice@tt.com", password_hash="x", full_name="Alice", role=UserRole.EMPLOYEE),
+        "bob": User(email="bob@tt.com", password_hash="x", full_name="Bob", role=UserRole.EMPLOYEE),
+        "admin": User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN),
+    }
+    db.session.add_all(users.values())
+    db.session.commit()
+    return users
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+def _create(client, user, title, description):
+    response = client.post('/api/v1/tickets', headers=_headers(user), json={
+        "title": title, "description": description, "category": "Network Issue", "priority": "High"
+    })
+    assert response.status_code == 201
+    return response.get_json()
+
+def test_lsh_estimates_similarity():
+    index = MinHashLSH()
+    index.add(1, signature(shingles("VPN keeps disconnecting", "Drops every few minutes from home")))
+    index.add(2, signature(shingles("Printer out of toner", "Third floor printer")))
+
+    results = {key: sim for key, sim, _ in index.query(signature(shingles("VPN disconnects", "drops every few minutes")))}
+    assert 1 in results and results[1] >= 0.5
+    assert 2 not in results
+
+    index.remove(1)
+    assert index.query(signature(shingles("VPN keeps disconnecting"))) == []
+
+def test_create_flow_surfaces_rephrased_duplicates(client, users):
+    first = _create(client, users["alice"], "VPN keeps disconnecting", "The VPN drops every few minutes from home")
+    assert first["possible_duplicates"] == []
+    _create(client, users["alice"], "Printer out of toner", "Third floor printer is empty")
+
+    second = _create(client, users["alice"], "VPN disconnects", "VPN drops every few minutes when working from home")
+    assert [d["id"] for d in second["possible_duplicates"]] == [first["ticket_id"]]
+    assert second["possibleDuplicates"][0]["similarity"] >= 0.5
+
+def test_check_duplicate_counts_other_users_without_exposing_them(client, users, app):
+    _create(client, users["bob"], "Outlook cannot connect to server", "Outlook says disconnected since 9am")
+
+    data = client.post('/api/v1/tickets/check-duplicate', headers=_headers(users["alice"]),
+                       json={"title": "Outlook can't connect to the server"}).get_json()
+    assert data["exists"] is False
+    assert data["similar"] == []
+    assert data["similar_count"] == 1
+
+    data = client.post('/api/v1/tickets/check-duplicate', headers=_headers(users["admin"]),
+                       json={"title": "Outlook can't connect to the server"}).get_json()
+    assert len(data["similar"]) == 1
+
+    data = client.post('/api/v1/tickets/check-duplicate', headers=_headers(users["bob"]),
+                       json={"title": "Outlook can't connect to the server"}).get_json()
+    assert data["exists"] is True
+
+def test_index_catches_up_and_drops_resolved_tickets(client, users, app):
+    DuplicateService.rebuild()
+    # Created outside this worker's create flow, e.g. by another worker
+    ticket = Ticket(title="Wifi down in building B", description="No wireless on any floor",
+                    category="Network Issue", priority=TicketPriority.HIGH, created_by_id=users["bob"].id)
+    db.session.add(ticket)
+    db.session.commit()
+
+    matches, count = DuplicateService.find_similar(users["admin"], "Wifi down building B")
+    assert [t.id for t, _ in matches] == [ticket.id]
+
+    ticket.status = TicketStatus.RESOLVED
+    db.session.commit()
+    assert DuplicateService.find_similar(users["admin"], "Wifi down building B") == ([], 0)
+
+def test_reopened_ticket_is_reindexed(client, users, app):
+    from app.schemas.ticket_schema import TicketUpdate
+    from app.services.ticket_service import TicketService
+
+    ticket = _create(client, users["alice"], "Laptop fan very loud", "Fan runs at full speed all day")
+    assert DuplicateService.find_similar(users["admin"], "Laptop fan loud")[1] == 1
+
+    TicketService.update_ticket(ticket["ticket_id"], TicketUpdate(status=TicketStatus.RESOLVED), users["admin"].id)
+    # The lookup prunes the resolved ticket from the index
+    assert DuplicateService.find_similar(users["admin"], "Laptop fan loud") == ([], 0)
+
+    TicketService.update_ticket(ticket["ticket_id"], TicketUpdate(status=TicketStatus.IN_PROGRESS), users["admin"].id)
+    matches, _ = DuplicateService.find_similar(users["admin"], "Laptop fan loud")
+    assert [t.id for t, _ in matches] == [ticket["ticket_id"]]
+
+def test_background_build(app, users):
+    from app.services import duplicate_service
+
+    db.session.add(Ticket(title="Badge reader broken", description="Door 3 badge reader",
+                          category="Hardware Issue", priority=TicketPriority.LOW, created_by_id=users["bob"].id))
+    db.session.commit()
+
+    DuplicateService.start_background_build(app).join(10)
+    assert len(duplicate_service._text_index) == 1
+    assert duplicate_service._high_water is not None
+
+def test_lookup_latency():
+    import random
+    import string
+    import time
+
+    rng = random.Random(7)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(3000)]
+    texts = [(" ".join(rng.sample(vocabulary, 5)), " ".join(rng.sample(vocabulary, 30))) for _ in range(2000)]
+    # An outage: 200 rephrasings of the same problem, all candidates of each other
+    outage = "vpn gateway unreachable from home office since morning".split()
+    texts += [(" ".join(rng.sample(outage, 5)), " ".join(outage + rng.sample(vocabulary, 3))) for _ in range(200)]
+
+    index = MinHashLSH()
+    started = time.perf_counter()
+    for key, (title, description) in enumerate(texts):
+        index.add(key, signature(shingles(title, description)))
+    assert time.perf_counter() - started < 2.0
+
+    def median_lookup(queries):
+        timings = []
+        for title, description in queries:
+            started = time.perf_counter()
+            index.query(signature(shingles(title, description)))
+            timings.append(time.perf_counter() - started)
+        return sorted(timings)[len(timings) // 2]
+
+    # Signature plus candidate lookup stays under a millisecond
+    assert median_lookup(texts[:200]) < 0.001
+    assert median_lookup(texts[-50:]) < 0.001
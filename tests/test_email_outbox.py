@@ -0,0 +1,237 @@
+import time
+import socketserver
+import threading
+import pytest
+from email import message_from_bytes
+from datetime import timedelta
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.email_outbox import EmailOutbox
+from app.core.constants import UserRole
+from app.services.email_service import EmailService
+from app.services.email_worker import email_worker_pool, PooledSMTPConnection
+from app.utils.jwt import create_access_token
+from app.utils.time_utils import utcnow
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, text):
+        self.wfile.write(f"{text}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode().strip()[:4].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-stand-in\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif verb == "AUTH":
+                server.logins += 1
+                self.reply("235 Authentication successful")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    data += self.rfile.readline()
+                if server.fail_codes:
+                    code = server.fail_codes.pop(0)
+                    self.reply(f"{code} Simulated failure")
+                else:
+                    server.messages.append(message_from_bytes(data[:-5]))
+                    self.reply("250 Queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                self.reply("250 OK")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Minimal local SMTP server that records messages and can fail DATA on demand."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.messages, self.fail_codes = [], []
+        self.connections = self.logins = 0
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _configure_mail(app, server):
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_PORT=server.server_address[1], MAIL_USE_TLS=False,
+                      MAIL_USERNAME="system@tt.com", MAIL_PASSWORD="secret", MAIL_MAX_ATTEMPTS=3)
+
+@pytest.fixture
+def app(smtp_server):
+    app = create_app(TestingConfig)
+    _configure_mail(app, smtp_server)
+    email_worker_pool.metrics.reset()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def connection(app):
+    conn = PooledSMTPConnection(app.config, email_worker_pool.metrics)
+    yield conn
+    conn.close()
+
+def test_send_email_only_queues(app, smtp_server):
+    entry = EmailService.send_email("emp@tt.com", "Welcome", "<p>Hi</p>")
+    assert entry.status == EmailOutbox.PENDING
+    assert smtp_server.messages == []
+    assert EmailService.get_queue_stats()["pending"] == 1
+
+def test_workers_reuse_one_authenticated_connection(app, smtp_server, connection):
+    for i in range(3):
+        EmailService.send_email(f"user{i}@tt.com", f"Subject {i}", "<p>Body</p>")
+    EmailService.send_email("pdf@tt.com", "With PDF", "<p>See attached</p>",
+                            attachments=[("summary.pdf", b"%PDF-1.4 test")], reply_to="help@tt.com")
+
+    assert email_worker_pool.process_due(connection) == 4
+    assert smtp_server.connections == 1
+    assert smtp_server.logins == 1
+    assert [m["Subject"] for m in smtp_server.messages] == ["Subject 0", "Subject 1", "Subject 2", "With PDF"]
+
+    with_pdf = smtp_server.messages[-1]
+    assert with_pdf["Reply-To"] == "help@tt.com"
+    attachment = [part for part in with_pdf.walk() if part.get_filename() == "summary.pdf"][0]
+    assert attachment.get_payload(decode=True) == b"%PDF-1.4 test"
+
+    assert EmailOutbox.query.filter_by(status=EmailOutbox.SENT).count() == 4
+    metrics = email_worker_pool.metrics.snapshot()
+    assert metrics["sent"] == 4
+    assert metrics["connections_opened"] == 1
+    assert metrics["avg_send_ms"] is not None
+
+def test_transient_failure_retried_with_backoff(app, smtp_server, connection):
+    smtp_server.fail_codes = [451]
+    entry = EmailService.send_email("emp@tt.com", "Retry me", "<p>Body</p>")
+
+    assert email_worker_pool.process_due(connection) == 1
+    db.session.refresh(entry)
+    assert entry.status == EmailOutbox.PENDING
+    assert entry.attempts == 1
+    assert entry.next_attempt_at > utcnow() + timedelta(seconds=20)
+
+    # Not due yet
+    assert email_worker_pool.process_due(connection) == 0
+
+    entry.next_attempt_at = utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert email_worker_pool.process_due(connection) == 1
+    db.session.refresh(entry)
+    assert entry.status == EmailOutbox.SENT
+    assert entry.attempts == 2
+    assert email_worker_pool.metrics.snapshot()["retried"] == 1
+
+def test_permanent_failure_and_attempt_limit(app, smtp_server, connection):
+    smtp_server.fail_codes = [550, 451, 451, 451]
+    rejected = EmailService.send_email("nobody@tt.com", "Rejected", "<p>Body</p>")
+    email_worker_pool.process_due(connection)
+    db.session.refresh(rejected)
+    assert rejected.status == EmailOutbox.FAILED
+    assert "Simulated failure" in rejected.last_error
+
+    flaky = EmailService.send_email("emp@tt.com", "Flaky", "<p>Body</p>")
+    for _ in range(3):
+        flaky.next_attempt_at = utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        email_worker_pool.process_due(connection)
+        db.session.refresh(flaky)
+    assert flaky.status == EmailOutbox.FAILED
+    assert flaky.attempts == 3
+
+def test_email_queue_endpoint(app, smtp_server, connection):
+    admin = User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN)
+    db.session.add(admin)
+    db.session.commit()
+    EmailService.send_email("a@tt.com", "One", "<p>1</p>")
+    email_worker_pool.process_due(connection)
+    EmailService.send_email("b@tt.com", "Two", "<p>2</p>")
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"}
+    data = app.test_client().get('/api/v1/admin/email-queue', headers=headers).get_json()
+    assert data["queue"]["pending"] == 1
+    assert data["queue"]["sent"] == 1
+    assert data["workers"]["sent"] == 1
+
+def test_background_workers_drain_queue(smtp_server, tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'outbox.db'}"
+        MAIL_WORKERS = 2
+        MAIL_POLL_SECONDS = 1
+
+    app = create_app(FileConfig)
+    _configure_mail(app, smtp_server)
+    with app.app_context():
+        db.create_all()
+        for i in range(5):
+            EmailService.send_email(f"user{i}@tt.com", f"Background {i}", "<p>Body</p>")
+
+    email_worker_pool.start(app)
+    try:
+        deadline = time.monotonic() + 10
+        while len(smtp_server.messages) < 5 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        email_worker_pool.stop()
+
+    # Each message is delivered exactly once, over at most one connection per worker
+    assert sorted(m["Subject"] for m in smtp_server.messages) == [f"Background {i}" for i in range(5)]
+    assert smtp_server.connections <= 2
+    with app.app_context():
+        assert EmailOutbox.query.filter_by(status=EmailOutbox.SENT).count() == 5
+        db.drop_all()
+
+def test_resolution_pdf_rendered_by_worker(app, smtp_server, connection, monkeypatch):
+    from app.core.constants import TicketStatus
+    from app.schemas.ticket_schema import TicketCreate, TicketUpdate
+    from app.services.ticket_service import TicketService
+    from app.services.ticket_pdf_service import TicketPdfService
+
+    rendered = []
+    original = TicketPdfService.generate_ticket_pdf
+    monkeypatch.setattr(TicketPdfService, "generate_ticket_pdf",
+                        staticmethod(lambda ticket: rendered.append(ticket.id) or original(ticket)))
+
+    admin = User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN)
+    employee = User(email="emp@tt.com", password_hash="x", full_name="Employee", role=UserRole.EMPLOYEE)
+    db.session.add_all([admin, employee])
+    db.session.commit()
+    ticket = TicketService.create_ticket(
+        TicketCreate(title="Printer", description="Jammed", category="Hardware Issue"), employee.id
+    )
+    TicketService.update_ticket(ticket.id, TicketUpdate(status=TicketStatus.RESOLVED), admin.id)
+
+    # Nothing is rendered while the status change is handled
+    assert rendered == []
+    entry = EmailOutbox.query.filter(EmailOutbox.subject.startswith("Resolved:")).one()
+    assert entry.attachments is None
+    assert entry.deferred_attachments == [
+        {"kind": "ticket_pdf", "ticket_id": ticket.id, "filename": f"Ticket_{ticket.id}_Summary.pdf"}
+    ]
+
+    assert email_worker_pool.process_due(connection) >= 1
+    assert rendered == [ticket.id]
+    message = [m for m in smtp_server.messages if m["Subject"].startswith("Resolved:")][0]
+    pdf = [part for part in message.walk() if part.get_filename() == f"Ticket_{ticket.id}_Summary.pdf"][0]
+    assert pdf.get_payload(decode=True).startswith(b"%PDF")
@@ -217,3 +217,79 @@ def test_calendar_event_broadcast(client, admin_headers, monkeypatch):
     assert emitted_events[0][1]['action'] == 'deleted'
     assert emitted_events[0][1]['event']['id'] == event_id
 
+
+def _add_event(title, start, hours=2, creator_id=None):
+    event = Event(title=title, event_type="maintenance", start_time=start,
+                  end_time=start + timedelta(hours=hours), created_by_id=creator_id)
+    db.session.add(event)
+    db.session.commit()
+    return event
+
+def test_get_events_window(client, admin_headers):
+    from sqlalchemy import event as sa_event
+
+    base = datetime(2026, 6, 1, 9, 0)
+    admin_id = User.query.filter_by(email="admin_evt@tt.com").first().id
+    for day in range(10):
+        _add_event(f"Window Event {day}", base + timedelta(days=day), creator_id=admin_id)
+    # Starts before the window and runs into it
+    _add_event("Long Event", base - timedelta(days=2), hours=24 * 3, creator_id=admin_id)
+
+    client.get('/api/v1/events', headers=admin_headers)  # warm the principal cache
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    sa_event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        # The format calendar.js sends (Date.toISOString())
+        response = client.get('/api/v1/events?start=2026-06-03T00:00:00.000Z&end=2026-06-05T00:00:00.000Z',
+                              headers=admin_headers)
+    finally:
+        sa_event.remove(db.engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    titles = [e['title'] for e in response.get_json()]
+    assert titles == ["Window Event 2", "Window Event 3"]
+    assert all(e['createdBy'] == "Admin Events" for e in response.get_json())
+    # Creators come from the same query as the events
+    assert len([s for s in statements if "events.title" in s]) == 1
+    assert len(statements) <= 2
+
+    wide = client.get('/api/v1/events?start=2026-06-01&end=2026-06-02', headers=admin_headers).get_json()
+    assert [e['title'] for e in wide] == ["Long Event", "Window Event 0"]
+    # Offsets are converted to UTC: 11:00+02:00 is 09:00Z, when Window Event 0 starts
+    shifted = client.get('/api/v1/events?start=2026-06-01T11:00:00%2B02:00&end=2026-06-01T12:00:00%2B02:00',
+                         headers=admin_headers).get_json()
+    assert [e['title'] for e in shifted] == ["Long Event", "Window Event 0"]
+
+    assert client.get('/api/v1/events?start=soon', headers=admin_headers).status_code == 400
+    assert client.get('/api/v1/events?start=2026-06-05&end=2026-06-01', headers=admin_headers).status_code == 400
+
+def test_calendar_ics_etag(client, admin_headers):
+    event = _add_event("Patch; Night, Part 1", datetime(2026, 6, 1, 22, 0))
+
+    response = client.get('/api/v1/events/calendar.ics', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/calendar'
+    body = response.get_data(as_text=True)
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert "SUMMARY:Patch\\; Night\\, Part 1\r\n" in body
+    assert "DTSTART:20260601T220000Z\r\n" in body
+    etag = response.headers['ETag']
+
+    # Unchanged calendar: the client only revalidates
+    cached = client.get('/api/v1/events/calendar.ics', headers={**admin_headers, 'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+
+    event.title = "Patch Night"
+    db.session.commit()
+    updated = client.get('/api/v1/events/calendar.ics', headers={**admin_headers, 'If-None-Match': etag})
+    assert updated.status_code == 200
+    assert "SUMMARY:Patch Night\r\n" in updated.get_data(as_text=True)
+
+    etag = updated.headers['ETag']
+    assert client.delete(f'/api/v1/events/{event.id}', headers=admin_headers).status_code == 200
+    emptied = client.get('/api/v1/events/calendar.ics', headers={**admin_headers, 'If-None-Match': etag})
+    assert emptied.status_code == 200
+    assert "BEGIN:VEVENT" not in emptied.get_data(as_text=True)
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import pytest
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+from app.core.constants import UserRole, TicketPriority
+from app.services import export_service
+from app.utils.jwt import create_access_token
+
+ROWS = 12
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def staff(app):
+    team = Team(name="Export Team")
+    db.session.add(team)
+    db.session.flush()
+    staff = User(email="export_staff@tt.com", password_hash="x", full_name="Staff",
+                 role=UserRole.IT_STAFF, team_id=team.id)
+    db.session.add(staff)
+    db.session.flush()
+    for i in range(ROWS):
+        ticket = Ticket(title=f"Export {i}", description="Desc", category="Software Issue",
+                        priority=TicketPriority.LOW, created_by_id=staff.id, team_id=team.id)
+        db.session.add(ticket)
+        db.session.flush()
+        db.session.add(Comment(text=f"Note, {i}", ticket_id=ticket.id, user_id=staff.id))
+    deleted = Ticket(title="Gone", description="Desc", category="Software Issue", priority=TicketPriority.LOW,
+                     created_by_id=staff.id, team_id=team.id, is_deleted=True)
+    db.session.add(deleted)
+    db.session.commit()
+    return staff
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+def test_csv_export_streams_in_batches(client, staff, monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 5)
+    response = client.get('/api/v1/users/export?format=csv', headers=_headers(staff))
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == ['User Profile']
+    tickets_at = rows.index(['Tickets'])
+    ticket_rows = rows[tickets_at + 2:rows.index([], tickets_at)]
+    assert [r[1] for r in ticket_rows] == [f"Export {i}" for i in range(ROWS)]
+    comment_rows = rows[rows.index(['My Comments']) + 2:]
+    assert [r[1] for r in comment_rows] == [f"Note, {i}" for i in range(ROWS)]
+
+def test_ndjson_export(client, staff):
+    response = client.get('/api/v1/users/export?format=ndjson', headers=_headers(staff))
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["Content-Disposition"].endswith(f"ticket_tally_data_{staff.id}.ndjson")
+
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert records[0]["type"] == "user" and records[0]["email"] == "export_staff@tt.com"
+    tickets = [r for r in records if r["type"] == "ticket"]
+    comments = [r for r in records if r["type"] == "comment"]
+    assert len(tickets) == ROWS
+    assert tickets[0]["status"] == "Open"
+    assert len(comments) == ROWS
+
+    # Rows are read as plain tuples, nothing accumulates in the session
+    assert not any(isinstance(obj, (Ticket, Comment)) for obj in db.session.identity_map.values())
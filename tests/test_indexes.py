@@ -0,0 +1,29 @@
+import pytest
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.cli import explain_hot_queries
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def test_hot_queries_use_indexes(app):
+    plans = dict(explain_hot_queries())
+
+    assert "ix_tickets_github_pr_url" in " ".join(plans["GitHub webhook PR lookup"])
+    assert "ix_ticket_status_history_ticket_id" in " ".join(plans["Ticket status history"])
+    assert "ix_comments_ticket_id" in " ".join(plans["Ticket comments"])
+    assert "ix_notifications_user_id_is_read_created_at" in " ".join(plans["Unread notification count"])
+    assert "ix_activity_logs_timestamp" in " ".join(plans["Recent activity log"])
+    assert "ix_tickets_assigned_to_id_status" in " ".join(plans["Claim workload check"])
+
+def test_explain_queries_command(app):
+    result = app.test_cli_runner().invoke(args=["explain-queries"])
+    assert result.exit_code == 0
+    assert "== Ticket list (admin, newest first)" in result.output
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import event
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.core.extensions import socketio
+from app.models.user import User
+from app.models.team import Team
+from app.models.notification import Notification
+from app.core.constants import UserRole, TicketPriority
+from app.schemas.ticket_schema import TicketCreate
+from app.services.ticket_service import TicketService
+from app.services.notification_service import NotificationService
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def staff_setup(app):
+    team = Team(name="Software Team")
+    other = Team(name="Hardware Team")
+    db.session.add_all([team, other])
+    db.session.commit()
+
+    employee = User(email="emp@tt.com", password_hash="x", full_name="Emp", role=UserRole.EMPLOYEE)
+    admins = [User(email=f"admin{i}@tt.com", password_hash="x", full_name=f"Admin {i}", role=UserRole.ADMIN) for i in range(2)]
+    staff = [User(email=f"staff{i}@tt.com", password_hash="x", full_name=f"Staff {i}",
+                  role=UserRole.IT_STAFF, team_id=team.id) for i in range(10)]
+    outsider = User(email="hw@tt.com", password_hash="x", full_name="HW", role=UserRole.IT_STAFF, team_id=other.id)
+    db.session.add_all([employee, outsider] + admins + staff)
+    db.session.commit()
+    return {"team": team, "other": other, "employee": employee, "outsider": outsider}
+
+def test_ticket_fanout_uses_one_insert_and_one_emit_per_room(app, staff_setup, monkeypatch):
+    emitted = []
+    monkeypatch.setattr(socketio, 'emit', lambda name, data, *args, **kwargs: emitted.append((name, data, kwargs)))
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        data = TicketCreate(title="Crash", description="App crashes", category="Software Issue", priority=TicketPriority.HIGH)
+        ticket = TicketService.create_ticket(data, staff_setup["employee"].id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert len([s for s in statements if s.startswith("INSERT INTO notifications")]) == 1
+
+    # Creator + 2 admins + 10 team staff; the other team's staff is not notified
+    rows = Notification.query.all()
+    assert len(rows) == 13
+    assert staff_setup["outsider"].id not in {n.user_id for n in rows}
+    assert ticket.team_id == staff_setup["team"].id
+
+    # One batched push per recipient room
+    batches = {kwargs["to"]: data for name, data, kwargs in emitted if name == 'new_notifications'}
+    assert len(batches) == 13
+    assert all(len(batch) == 1 and room == f"user_{batch[0]['user_id']}" for room, batch in batches.items())
+
+def test_recipient_lists_cached_until_membership_changes(app, staff_setup):
+    team_id = staff_setup["team"].id
+    assert len(NotificationService.get_recipient_ids(UserRole.IT_STAFF, team_id)) == 10
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        NotificationService.get_recipient_ids(UserRole.IT_STAFF, team_id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert not any("FROM users" in s for s in statements)
+
+    outsider = staff_setup["outsider"]
+    outsider.team_id = team_id
+    db.session.commit()
+    assert outsider.id in NotificationService.get_recipient_ids(UserRole.IT_STAFF, team_id)
+    assert len(NotificationService.get_recipient_ids(UserRole.IT_STAFF, staff_setup["other"].id)) == 0
@@ -0,0 +1,104 @@
+import os
+import pytest
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.comment import Comment
+from app.core.constants import UserRole
+from app.schemas.ticket_schema import TicketCreate
+from app.services.ticket_service import TicketService
+from app.services.pdf_service import PDFService
+from app.services.pdf_cache_service import PDFCacheService
+from app.utils.jwt import create_access_token
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(TestingConfig)
+    app.config.update(PDF_CACHE_FOLDER=str(tmp_path / "pdf_cache"))
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    original = PDFService.generate_ticket_pdf
+    monkeypatch.setattr(PDFService, "generate_ticket_pdf",
+                        staticmethod(lambda ticket: calls.append(ticket.id) or original(ticket)))
+    return calls
+
+@pytest.fixture
+def setup(app):
+    employee = User(email="emp@tt.com", password_hash="x", full_name="Employee", role=UserRole.EMPLOYEE)
+    other = User(email="other@tt.com", password_hash="x", full_name="Other", role=UserRole.EMPLOYEE)
+    db.session.add_all([employee, other])
+    db.session.commit()
+    tickets = [
+        TicketService.create_ticket(TicketCreate(title=f"PDF {i}", description="Desc", category="Software Issue"),
+                                    employee.id)
+        for i in range(3)
+    ]
+    return {"employee": employee, "other": other, "tickets": tickets}
+
+def _headers(user, etag=None):
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    return headers
+
+def test_pdf_served_from_cache_with_etag(client, setup, renders):
+    employee, ticket = setup["employee"], setup["tickets"][0]
+    url = f"/api/v1/tickets/{ticket.id}/pdf"
+
+    first = client.get(url, headers=_headers(employee))
+    assert first.status_code == 200
+    assert first.mimetype == "application/pdf"
+    assert first.data.startswith(b"%PDF")
+    assert "Ticket-{}.pdf".format(ticket.id) in first.headers["Content-Disposition"]
+    etag = first.headers["ETag"]
+    assert etag
+
+    second = client.get(url, headers=_headers(employee))
+    assert second.headers["ETag"] == etag
+    assert second.data == first.data
+
+    not_modified = client.get(url, headers=_headers(employee, etag))
+    assert not_modified.status_code == 304
+    assert renders == [ticket.id]
+
+    # A new comment changes the version, so the stale file is replaced
+    db.session.add(Comment(ticket_id=ticket.id, user_id=employee.id, text="More info"))
+    db.session.commit()
+    changed = client.get(url, headers=_headers(employee, etag))
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert renders == [ticket.id, ticket.id]
+    assert len(os.listdir(client.application.config["PDF_CACHE_FOLDER"])) == 1
+
+def test_pdf_permissions_checked_before_cache(client, setup, renders):
+    ticket = setup["tickets"][0]
+    response = client.get(f"/api/v1/tickets/{ticket.id}/pdf", headers=_headers(setup["other"]))
+    assert response.status_code == 403
+    assert client.get("/api/v1/tickets/999/pdf", headers=_headers(setup["employee"])).status_code == 404
+    assert renders == []
+
+def test_pdf_cache_evicts_least_recently_served(app, setup):
+    tickets = setup["tickets"]
+    paths = []
+    for ticket in tickets:
+        _, version = PDFCacheService.get_version(ticket.id)
+        paths.append(PDFCacheService.get_path(ticket.id, version))
+    size = os.path.getsize(paths[0])
+
+    # Make the second ticket the least recently served
+    os.utime(paths[1], (0, 0))
+    app.config["PDF_CACHE_MAX_BYTES"] = size * 2 + size // 2
+    assert PDFCacheService.evict() == 1
+    assert [os.path.exists(p) for p in paths] == [True, False, True]
@@ -201,9 +201,11 @@ def test_broadcast_live_activity_demo_status(app, auth_headers, monkeypatch):
     
     # Mock socketio.emit
     emitted_data = []
-    def mock_emit(event, data):
+    emitted_rooms = []
+    def mock_emit(event, data, to=None):
         if event == 'live_activity':
             emitted_data.append(data)
+            emitted_rooms.append(to)
             
     from app.main import socketio
     monkeypatch.setattr(socketio, 'emit', mock_emit)
@@ -231,6 +233,7 @@ def test_broadcast_live_activity_demo_status(app, auth_headers, monkeypatch):
     )
     assert len(emitted_data) == 1
     assert emitted_data[0]['is_demo'] is False
+    assert emitted_rooms[0] == 'non_demo'
     
     # 2. Create a demo ticket
     t_demo = Ticket(
@@ -253,6 +256,7 @@ def test_broadcast_live_activity_demo_status(app, auth_headers, monkeypatch):
     )
     assert len(emitted_data) == 2
     assert emitted_data[1]['is_demo'] is True
+    assert emitted_rooms[1] == 'demo'
 
 def test_socketio_redis_message_queue_config(monkeypatch):
     from app.core.extensions import socketio
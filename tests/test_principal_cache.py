@@ -0,0 +1,90 @@
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.core.constants import UserRole
+from app.utils.jwt import create_access_token
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def users(app):
+    users = {
+        "admin": User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN),
+        "employee": User(email="emp@tt.com", password_hash=generate_password_hash("secret1"),
+                         full_name="Emp", role=UserRole.EMPLOYEE),
+    }
+    db.session.add_all(users.values())
+    db.session.commit()
+    return {name: (user, {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"})
+            for name, user in users.items()}
+
+@contextmanager
+def count_user_selects():
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+def test_repeat_requests_skip_user_lookup(client, users):
+    _, headers = users["employee"]
+    assert client.get('/api/v1/tickets', headers=headers).status_code == 200
+
+    db.session.expire_all()
+    with count_user_selects() as statements:
+        assert client.get('/api/v1/tickets', headers=headers).status_code == 200
+        assert client.get('/api/v1/notifications/', headers=headers).status_code == 200
+    assert statements == []
+
+    # Handlers needing more than the cached fields still get them
+    response = client.get('/api/v1/users/me', headers=headers)
+    assert response.get_json()["full_name"] == "Emp"
+
+def test_role_change_and_deactivation_invalidate(client, users):
+    employee, headers = users["employee"]
+    _, admin_headers = users["admin"]
+    assert client.get('/api/v1/users', headers=headers).status_code == 403
+
+    employee.role = UserRole.ADMIN
+    db.session.commit()
+    assert client.get('/api/v1/users', headers=headers).status_code == 200
+
+    assert client.patch(f'/api/v1/users/{employee.id}', json={"is_active": False},
+                        headers=admin_headers).status_code == 200
+    response = client.get('/api/v1/tickets', headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()["message"] == "Account is deactivated"
+
+def test_profile_and_password_updates_go_through_principal(client, users):
+    employee, headers = users["employee"]
+    assert client.patch('/api/v1/users/me', json={"full_name": "Emp Renamed"}, headers=headers).status_code == 200
+    assert client.post('/api/v1/users/me/password', json={"current_password": "secret1", "new_password": "secret22"},
+                       headers=headers).status_code == 200
+
+    db.session.expire_all()
+    user = db.session.get(User, employee.id)
+    assert user.full_name == "Emp Renamed"
+    assert check_password_hash(user.password_hash, "secret22")
+    assert client.get('/api/v1/users/me', headers=headers).get_json()["full_name"] == "Emp Renamed"
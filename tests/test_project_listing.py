@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import event
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.project import Project
+from app.models.email_outbox import EmailOutbox
+from app.core.constants import UserRole, ProjectStatus
+from app.utils.jwt import create_access_token
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_USERNAME="system@tt.com")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def seeded(app):
+    admin = User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN)
+    members = [User(email=f"m{i}@tt.com", password_hash="x", full_name=f"Member {i}", role=UserRole.EMPLOYEE)
+               for i in range(4)]
+    db.session.add_all([admin] + members)
+    db.session.commit()
+    return {"admin": admin, "members": members,
+            "headers": {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"}}
+
+def _count_queries(fn):
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return result, statements
+
+def test_project_list_is_paginated_and_batch_loaded(client, seeded):
+    admin, members = seeded["admin"], seeded["members"]
+    for i in range(6):
+        db.session.add(Project(name=f"P{i}", status=ProjectStatus.PLANNING, created_by_id=admin.id, team=members[:3]))
+    db.session.commit()
+    db.session.expire_all()
+
+    response, statements = _count_queries(
+        lambda: client.get('/api/v1/projects?page=1&per_page=4', headers=seeded["headers"]))
+    data = response.get_json()
+    assert [p["name"] for p in data["items"]] == ["P5", "P4", "P3", "P2"]
+    assert data["meta"]["totalItems"] == 6
+    assert all(len(p["team"]) == 3 and p["createdBy"] == "admin@tt.com" for p in data["items"])
+    # Auth + COUNT + page with creators + members of the page
+    assert len(statements) <= 5, statements
+
+    assert len(client.get('/api/v1/projects', headers=seeded["headers"]).get_json()) == 6
+
+def test_members_resolved_in_one_query_and_emails_queued(client, seeded):
+    members = seeded["members"]
+    payload = {
+        "name": "Apollo", "status": "Active", "priority": "High",
+        "team": [{"email": "m0@tt.com"}, {"name": "member 1"}, {"email": "m0@tt.com"},
+                 {"email": "nobody@tt.com"}, {"email": "admin@tt.com"}]
+    }
+    response, statements = _count_queries(
+        lambda: client.post('/api/v1/projects', json=payload, headers=seeded["headers"]))
+    assert response.status_code == 201
+    project = response.get_json()
+    assert sorted(m["email"] for m in project["team"]) == ["admin@tt.com", "m0@tt.com", "m1@tt.com"]
+    # "member 1" matched by name, case-insensitively
+    assert {m["id"] for m in project["team"]} == {seeded["admin"].id, members[0].id, members[1].id}
+    assert len([s for s in statements if s.startswith("SELECT users.") and "IN (" in s]) == 1
+
+    # Creator notice plus one per member, skipping the admin who is also a member
+    recipients = sorted(e.to_email for e in EmailOutbox.query.all())
+    assert recipients == ["admin@tt.com", "m0@tt.com", "m1@tt.com"]
+
+    response = client.patch(f'/api/v1/projects/{project["id"]}',
+                            json={"team": [{"email": "m1@tt.com"}, {"email": "m2@tt.com"}, {"email": "m3@tt.com"}]},
+                            headers=seeded["headers"])
+    assert sorted(m["email"] for m in response.get_json()["team"]) == ["m1@tt.com", "m2@tt.com", "m3@tt.com"]
+    assignments = sorted(e.to_email for e in EmailOutbox.query.filter(EmailOutbox.subject.startswith("New Project")))
+    assert assignments == ["m0@tt.com", "m1@tt.com", "m2@tt.com", "m3@tt.com"]
@@ -0,0 +1,110 @@
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+from app.core.constants import UserRole, TicketPriority
+from app.utils.jwt import create_access_token
+
+ROWS = 30
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@contextmanager
+def count_queries():
+    """Counts the SQL statements executed on the engine inside the block."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+@pytest.fixture
+def seeded(app):
+    """One admin, one IT staff and ROWS tickets each with a distinct creator, team and assignee."""
+    team = Team(name="Budget Team")
+    admin = User(email="budget_admin@tt.com", password_hash="test", full_name="Admin", role=UserRole.ADMIN)
+    staff = User(email="budget_staff@tt.com", password_hash="test", full_name="Staff", role=UserRole.IT_STAFF)
+    db.session.add_all([team, admin, staff])
+    db.session.commit()
+    staff.team_id = team.id
+
+    for i in range(ROWS):
+        row_team = Team(name=f"Team {i}")
+        creator = User(email=f"creator{i}@tt.com", password_hash="test", full_name=f"Creator {i}", role=UserRole.EMPLOYEE)
+        assignee = User(email=f"assignee{i}@tt.com", password_hash="test", full_name=f"Assignee {i}", role=UserRole.IT_STAFF)
+        db.session.add_all([row_team, creator, assignee])
+        db.session.flush()
+        ticket = Ticket(
+            title=f"Ticket {i}",
+            description="Desc",
+            category="Software Issue",
+            priority=TicketPriority.LOW,
+            created_by_id=creator.id,
+            assigned_to_id=staff.id if i % 2 else assignee.id,
+            team_id=team.id if i % 3 == 0 else row_team.id
+        )
+        db.session.add(ticket)
+        db.session.flush()
+        db.session.add(Comment(text=f"Comment {i}", ticket_id=ticket.id, user_id=staff.id))
+    db.session.commit()
+    db.session.expire_all()
+
+    return {
+        "admin": {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"},
+        "staff": {"Authorization": f"Bearer {create_access_token(identity=str(staff.id))}"}
+    }
+
+def test_ticket_list_query_budget(client, seeded):
+    with count_queries() as statements:
+        response = client.get('/api/v1/tickets', headers=seeded["admin"])
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == ROWS
+    # Auth lookup + ETag version counters + COUNT + page SELECT, independent of row count
+    assert len(statements) <= 5, statements
+
+def test_ticket_cursor_list_query_budget(client, seeded):
+    with count_queries() as statements:
+        response = client.get('/api/v1/tickets?pagination=cursor', headers=seeded["admin"])
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == ROWS
+    # Auth lookup + ETag version counters + page SELECT
+    assert len(statements) <= 4, statements
+
+def test_it_staff_lists_query_budget(client, seeded):
+    for path in ('/api/v1/it-staff/assigned-tickets', '/api/v1/it-staff/team-tickets'):
+        db.session.expire_all()
+        with count_queries() as statements:
+            response = client.get(path, headers=seeded["staff"])
+        assert response.status_code == 200
+        assert len(response.get_json()) > 0
+        assert len(statements) <= 3, statements
+
+def test_export_query_budget(client, seeded):
+    for fmt in ('json', 'csv'):
+        db.session.expire_all()
+        with count_queries() as statements:
+            response = client.get(f'/api/v1/users/export?format={fmt}', headers=seeded["staff"])
+        assert response.status_code == 200
+        assert len(statements) <= 4, statements
@@ -225,3 +225,122 @@ def test_check_sla_status_resolved_breached(app):
     
     status = SLAService.check_sla_status(ticket)
     assert status == SLAStatus.BREACHED
+
+def _create_via_service(user, priority):
+    from app.schemas.ticket_schema import TicketCreate
+    from app.services.ticket_service import TicketService
+    data = TicketCreate(title="SLA Ticket", description="Desc", category="General", priority=priority)
+    return TicketService.create_ticket(data, user.id)
+
+def test_materialized_sla_fields_maintained(app):
+    from app.schemas.ticket_schema import TicketUpdate
+    from app.services.ticket_service import TicketService
+
+    user = User(email="employee_test@tt.com", password_hash="test", full_name="Employee", role=UserRole.EMPLOYEE)
+    db.session.add(user)
+    db.session.commit()
+
+    # Create: deadline derived from priority
+    ticket = _create_via_service(user, TicketPriority.LOW)
+    assert ticket.sla_state == SLAStatus.PENDING
+    assert abs((ticket.sla_due_at - (ticket.created_at + timedelta(hours=48))).total_seconds()) < 1.0
+
+    # Priority change: deadline recomputed
+    TicketService.update_ticket(ticket.id, TicketUpdate(priority=TicketPriority.CRITICAL), user.id)
+    assert abs((ticket.sla_due_at - (ticket.created_at + timedelta(hours=4))).total_seconds()) < 1.0
+
+    # Resolve: first resolution recorded and state settled
+    TicketService.update_ticket(ticket.id, TicketUpdate(status=TicketStatus.RESOLVED), user.id)
+    assert ticket.first_resolved_at is not None
+    assert ticket.sla_state == SLAStatus.ACHIEVED
+    first_resolved_at = ticket.first_resolved_at
+
+    # Reopen and resolve again: first resolution is kept
+    TicketService.update_ticket(ticket.id, TicketUpdate(status=TicketStatus.IN_PROGRESS), user.id)
+    TicketService.update_ticket(ticket.id, TicketUpdate(status=TicketStatus.RESOLVED), user.id)
+    assert ticket.first_resolved_at == first_resolved_at
+    assert SLAService.check_sla_status(ticket) == SLAStatus.ACHIEVED
+
+def test_compliance_counts_from_materialized_fields(app):
+    user = User(email="employee_test@tt.com", password_hash="test", full_name="Employee", role=UserRole.EMPLOYEE)
+    db.session.add(user)
+    db.session.commit()
+
+    now = utcnow()
+    db.session.add_all([
+        # Met
+        Ticket(title="a", description="d", created_by_id=user.id, status=TicketStatus.RESOLVED,
+               sla_due_at=now, first_resolved_at=now - timedelta(hours=1), sla_state=SLAStatus.ACHIEVED),
+        # Missed after resolution
+        Ticket(title="b", description="d", created_by_id=user.id, status=TicketStatus.CLOSED,
+               sla_due_at=now - timedelta(hours=2), first_resolved_at=now, sla_state=SLAStatus.BREACHED),
+        # Missed while still open
+        Ticket(title="c", description="d", created_by_id=user.id,
+               sla_due_at=now - timedelta(hours=1), sla_state=SLAStatus.PENDING),
+        # Pending
+        Ticket(title="d", description="d", created_by_id=user.id,
+               sla_due_at=now + timedelta(hours=1), sla_state=SLAStatus.PENDING),
+        # Withdrawn and demo tickets are ignored
+        Ticket(title="e", description="d", created_by_id=user.id, status=TicketStatus.WITHDRAWN,
+               sla_due_at=now - timedelta(hours=1), sla_state=SLAStatus.PENDING),
+        Ticket(title="f", description="d", created_by_id=user.id, is_demo=True,
+               sla_due_at=now - timedelta(hours=1), sla_state=SLAStatus.PENDING),
+    ])
+    db.session.commit()
+
+    assert SLAService.get_compliance_counts() == {"met": 1, "missed": 2, "pending": 1}
+
+def test_policy_cache_serves_hits_without_queries(app):
+    from sqlalchemy import event
+    SLAService.get_policy_hours()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        hours = SLAService.get_policy_hours()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert hours[TicketPriority.CRITICAL] == 4
+    assert statements == []
+
+def test_admin_sla_update_bumps_version_and_reloads(app, client):
+    from app.utils.jwt import create_access_token
+    from app.services.cache_version_service import CacheVersionService
+    from app.services.sla_service import SLA_POLICY_CACHE
+
+    admin = User(email="admin_sla@tt.com", password_hash="test", full_name="Admin", role=UserRole.ADMIN)
+    db.session.add(admin)
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"}
+
+    assert SLAService.get_policy_hours()[TicketPriority.HIGH] == 8
+    before = CacheVersionService.get_version(SLA_POLICY_CACHE)
+
+    res = client.patch('/api/v1/admin/slas/high', json={"resolution_time_hours": 12}, headers=headers)
+    assert res.status_code == 200
+    assert res.get_json()['sla']['resolutionTimeHours'] == 12
+    assert CacheVersionService.get_version(SLA_POLICY_CACHE) == before + 1
+    assert SLAService.get_policy_hours()[TicketPriority.HIGH] == 12
+
+    res = client.patch('/api/v1/admin/slas/High', json={"resolution_time_hours": 0}, headers=headers)
+    assert res.status_code == 400
+    res = client.patch('/api/v1/admin/slas/Urgent', json={"resolution_time_hours": 5}, headers=headers)
+    assert res.status_code == 404
+
+def test_policy_cache_picks_up_other_worker_changes(app):
+    from app.services.cache_version_service import CacheVersionService
+    from app.services.sla_service import SLA_POLICY_CACHE
+    from sqlalchemy import update
+
+    app.config['SLA_CACHE_CHECK_SECONDS'] = 0
+    assert SLAService.get_policy_hours()[TicketPriority.LOW] == 48
+
+    # Simulate another worker: change the row and bump the version without touching this
+    # process's cache (Core statements bypass the ORM flush hooks).
+    db.session.execute(update(SLA).where(SLA.priority == TicketPriority.LOW).values(resolution_time_hours=72))
+    CacheVersionService.bump(SLA_POLICY_CACHE, connection=db.session.connection())
+    db.session.commit()
+
+    assert SLAService.get_policy_hours()[TicketPriority.LOW] == 72
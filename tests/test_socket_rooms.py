@@ -0,0 +1,82 @@
+import pytest
+from app.main import create_app
+from app.core.config import TestingConfig, Config
+from app.core.database import db
+from app.core.extensions import socketio
+from app.models.user import User
+from app.models.team import Team
+from app.models.ticket import Ticket
+from app.core.constants import UserRole, TicketPriority
+from app.services.notification_service import NotificationService
+from app.utils.jwt import create_access_token
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def users(app):
+    team = Team(name="Network Team")
+    db.session.add(team)
+    db.session.commit()
+    alice = User(email="alice@tt.com", password_hash="x", full_name="Alice", role=UserRole.IT_STAFF, team_id=team.id)
+    bob = User(email="bob@tt.com", password_hash="x", full_name="Bob", role=UserRole.EMPLOYEE)
+    demo = User(email=Config.DEMO_EMAIL, password_hash="x", full_name="Demo", role=UserRole.ADMIN)
+    db.session.add_all([alice, bob, demo])
+    db.session.commit()
+    return {"alice": alice, "bob": bob, "demo": demo}
+
+def _connect(app, user=None, token=None):
+    if user is not None:
+        token = create_access_token(identity=str(user.id))
+    auth = {"token": token} if token else None
+    return socketio.test_client(app, auth=auth)
+
+def _events(client, name):
+    return [msg["args"][0] for msg in client.get_received() if msg["name"] == name]
+
+def test_handshake_requires_valid_token(app, users):
+    assert not _connect(app).is_connected()
+    assert not _connect(app, token="not-a-jwt").is_connected()
+
+    client = _connect(app, users["alice"])
+    assert client.is_connected()
+    client.disconnect()
+
+def test_notifications_only_reach_the_recipient(app, users):
+    alice, bob = _connect(app, users["alice"]), _connect(app, users["bob"])
+
+    NotificationService.create_notification(users["bob"].id, "Hi", "For Bob")
+    NotificationService.create_notifications([
+        {"user_id": users["alice"].id, "title": "A1", "message": "m"},
+        {"user_id": users["alice"].id, "title": "A2", "message": "m"},
+        {"user_id": users["bob"].id, "title": "B1", "message": "m"},
+    ])
+
+    alice_received = alice.get_received()
+    bob_received = bob.get_received()
+    assert [m["name"] for m in alice_received] == ["new_notifications"]
+    assert [n["title"] for n in alice_received[0]["args"][0]] == ["A1", "A2"]
+    assert [m["name"] for m in bob_received] == ["new_notification", "new_notifications"]
+    assert [n["title"] for n in bob_received[1]["args"][0]] == ["B1"]
+
+def test_live_activity_and_calendar_rooms(app, users):
+    alice, demo = _connect(app, users["alice"]), _connect(app, users["demo"])
+
+    ticket = Ticket(title="Demo ticket", description="d", priority=TicketPriority.LOW,
+                    created_by_id=users["demo"].id, is_demo=True)
+    db.session.add(ticket)
+    db.session.commit()
+
+    NotificationService.broadcast_live_activity("created", ticket.id, "Demo ticket created", "Demo")
+    assert _events(alice, "live_activity") == []
+    assert [a["ticket_id"] for a in _events(demo, "live_activity")] == [ticket.id]
+
+    NotificationService.broadcast_calendar_event("created", {"id": 1})
+    assert len(_events(alice, "calendar_update")) == 1
+    assert len(_events(demo, "calendar_update")) == 1
@@ -0,0 +1,112 @@
+import pytest
+from app.main import create_app
+from app.core.config import TestingConfig, Config
+from app.core.database import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.ticket import Ticket
+from app.models.comment import Comment
+from app.core.constants import UserRole, TicketPriority
+from app.utils.jwt import create_access_token
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def users(app):
+    team = Team(name="Network")
+    db.session.add(team)
+    db.session.flush()
+    users = {
+        "alice": User(email="alice@tt.com", password_hash="x", full_name="Alice", role=UserRole.EMPLOYEE),
+        "bob": User(email="bob@tt.com", password_hash="x", full_name="Bob", role=UserRole.EMPLOYEE),
+        "staff": User(email="staff@tt.com", password_hash="x", full_name="Staff", role=UserRole.IT_STAFF, team_id=team.id),
+        "admin": User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN),
+        "demo": User(email=Config.DEMO_EMAIL, password_hash="x", full_name="Demo", role=UserRole.ADMIN),
+    }
+    db.session.add_all(users.values())
+    db.session.commit()
+    users["team"] = team
+    return users
+
+def _ticket(creator, title, description, team=None, is_demo=False):
+    ticket = Ticket(title=title, description=description, category="Network Issue", priority=TicketPriority.HIGH,
+                    created_by_id=creator.id, team_id=team.id if team else None, is_demo=is_demo)
+    db.session.add(ticket)
+    db.session.commit()
+    return ticket
+
+def _search(client, user, q, **params):
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+    return client.get('/api/v1/tickets/search', query_string={"q": q, **params}, headers=headers)
+
+def test_search_ranks_title_description_and_comments(client, users):
+    alice = users["alice"]
+    in_comment = _ticket(alice, "Laptop slow", "Takes ages to boot")
+    db.session.add(Comment(ticket_id=in_comment.id, user_id=alice.id, text="Also the VPN drops"))
+    in_description = _ticket(alice, "Cannot reach intranet", "The VPN client times out")
+    in_title = _ticket(alice, "VPN disconnects", "Every few minutes")
+    # Enough unrelated tickets that "vpn" is a rare (informative) term
+    for n in range(6):
+        _ticket(alice, f"Printer jam {n}", "Tray 2")
+
+    response = _search(client, users["admin"], "vpn")
+    assert response.status_code == 200
+    items = response.get_json()["items"]
+    assert [i["id"] for i in items] == [in_title.id, in_description.id, in_comment.id]
+    assert items[0]["score"] > items[-1]["score"]
+
+    # Stemming: "disconnecting" matches "disconnects"
+    assert [i["id"] for i in _search(client, users["admin"], "disconnecting").get_json()["items"]] == [in_title.id]
+
+def test_search_index_follows_changes(client, users):
+    alice = users["alice"]
+    ticket = _ticket(alice, "Monitor flicker", "Second screen")
+    assert _search(client, alice, "keyboard").get_json()["items"] == []
+
+    ticket.title = "Keyboard flicker"
+    db.session.commit()
+    assert [i["id"] for i in _search(client, alice, "keyboard").get_json()["items"]] == [ticket.id]
+
+    comment = Comment(ticket_id=ticket.id, user_id=alice.id, text="Happens after docking")
+    db.session.add(comment)
+    db.session.commit()
+    assert len(_search(client, alice, "docking").get_json()["items"]) == 1
+    db.session.delete(comment)
+    db.session.commit()
+    assert _search(client, alice, "docking").get_json()["items"] == []
+
+    ticket.soft_delete()
+    db.session.commit()
+    assert _search(client, alice, "keyboard").get_json()["items"] == []
+
+def test_search_respects_scoping(client, users):
+    alice, bob, team = users["alice"], users["bob"], users["team"]
+    own = _ticket(alice, "Email bounce", "Outlook error")
+    teams = _ticket(bob, "Email quota", "Mailbox full", team=team)
+    demo = _ticket(bob, "Email demo", "Demo data", is_demo=True)
+
+    ids = lambda user: sorted(i["id"] for i in _search(client, user, "email").get_json()["items"])
+    assert ids(alice) == [own.id]
+    assert ids(bob) == [teams.id]
+    assert ids(users["staff"]) == [teams.id]
+    assert ids(users["admin"]) == sorted([own.id, teams.id])
+    assert ids(users["demo"]) == [demo.id]
+
+def test_search_input_validation(client, users):
+    _ticket(users["alice"], "VPN down", "Again")
+    assert _search(client, users["admin"], "").status_code == 400
+    assert _search(client, users["admin"], "  ***  ").status_code == 400
+    # FTS syntax in user input is treated as plain words
+    response = _search(client, users["admin"], 'vpn" OR NEAR(')
+    assert response.status_code == 200
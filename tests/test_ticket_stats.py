@@ -0,0 +1,126 @@
+import pytest
+from datetime import timedelta
+from sqlalchemy import func
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.ticket import Ticket
+from app.models.ticket_daily_stat import TicketDailyStat
+from app.core.constants import UserRole, TicketStatus, TicketPriority
+from app.schemas.ticket_schema import TicketCreate, TicketUpdate
+from app.services.ticket_service import TicketService
+from app.services.ticket_stats_service import TicketStatsService
+from app.utils.jwt import create_access_token
+from app.utils.time_utils import utcnow
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def users(app):
+    admin = User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN)
+    employee = User(email="emp@tt.com", password_hash="x", full_name="Employee", role=UserRole.EMPLOYEE)
+    db.session.add_all([admin, employee])
+    db.session.commit()
+    return {"admin": admin, "employee": employee}
+
+def _create(user, category="Software Issue", priority=TicketPriority.MEDIUM):
+    data = TicketCreate(title="Stats", description="Desc", category=category, priority=priority)
+    return TicketService.create_ticket(data, user.id)
+
+def _scan_counts():
+    rows = db.session.query(Ticket.status, func.count(Ticket.id))\
+        .filter(Ticket.is_demo == False).group_by(Ticket.status).all()
+    return {status: count for status, count in rows}
+
+def _exercise_transitions(users):
+    employee, admin = users["employee"], users["admin"]
+    t1 = _create(employee)
+    t2 = _create(employee, category="Hardware Issue", priority=TicketPriority.HIGH)
+    t3 = _create(employee, category="Network Issue")
+    t4 = _create(employee)
+
+    TicketService.update_ticket(t1.id, TicketUpdate(status=TicketStatus.IN_PROGRESS), admin.id)
+    TicketService.update_ticket(t1.id, TicketUpdate(status=TicketStatus.RESOLVED), admin.id)
+    TicketService.update_ticket(t2.id, TicketUpdate(priority=TicketPriority.CRITICAL, category="Email Issue"), admin.id)
+    TicketService.claim_ticket(t3.id, admin.id)
+
+    # Changes made outside TicketService are tracked by the same flush hook
+    t4.soft_delete()
+    db.session.commit()
+    return t1, t2, t3, t4
+
+def test_rollup_tracks_transitions(app, users):
+    _exercise_transitions(users)
+
+    counts = TicketStatsService.get_dashboard_counts()
+    assert counts["by_status"] == _scan_counts()
+    assert counts["total"] == 3
+    assert counts["by_category"] == {"Software Issue": 1, "Email Issue": 1, "Network Issue": 1}
+    assert counts["by_priority"] == {"Medium": 2, "Critical": 1}
+    assert counts["resolved_today"] == 1
+    assert counts["trends"]["dates"][-1] == utcnow().date().isoformat()
+    assert counts["trends"]["created"][-1] == 4
+    assert counts["trends"]["resolved"][-1] == 1
+
+def test_rollup_ignores_demo_and_hard_deletes(app, users):
+    t1, t2, _, _ = _exercise_transitions(users)
+    demo = Ticket(title="Demo", description="d", created_by_id=users["employee"].id, is_demo=True)
+    db.session.add(demo)
+    db.session.delete(t2)
+    db.session.commit()
+
+    counts = TicketStatsService.get_dashboard_counts()
+    assert counts["by_status"] == _scan_counts()
+    assert TicketStatsService.get_dashboard_counts(is_demo=True)["total"] == 1
+
+def test_rebuild_matches_incremental_rollup(app, users):
+    _exercise_transitions(users)
+    # A ticket inserted a few days ago without any status history
+    old = Ticket(title="Old", description="d", created_by_id=users["employee"].id,
+                 status=TicketStatus.CLOSED, created_at=utcnow() - timedelta(days=3))
+    db.session.add(old)
+    db.session.commit()
+
+    incremental = TicketStatsService.get_dashboard_counts()
+    assert incremental["trends"]["created"][-4] == 1
+
+    assert TicketStatsService.rebuild(batch_size=2) == 5
+    rebuilt = TicketStatsService.get_dashboard_counts()
+    assert rebuilt == incremental
+
+def test_rebuild_cli(app, users):
+    _exercise_transitions(users)
+    db.session.query(TicketDailyStat).delete()
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["rebuild-ticket-stats"])
+    assert result.exit_code == 0
+    assert "from 4 tickets" in result.output
+    assert TicketStatsService.get_dashboard_counts()["by_status"] == _scan_counts()
+
+def test_dashboard_reads_rollup(client, users):
+    _exercise_transitions(users)
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(users['admin'].id))}"}
+
+    res = client.get('/api/v1/analytics/dashboard', headers=headers)
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["total_tickets"] == 3
+    assert data["open_tickets"] == 1
+    assert data["in_progress_tickets"] == 1
+    assert data["resolved_tickets"] == 1
+    assert data["resolved_today"] == 1
+    assert len(data["trends"]["dates"]) == 7
+    assert data["trends"]["created"][-1] == 4
@@ -0,0 +1,108 @@
+import pytest
+from datetime import timedelta
+from app.main import create_app
+from app.core.config import TestingConfig
+from app.core.database import db
+from app.models.user import User
+from app.models.team import Team
+from app.models.ticket import Ticket
+from app.models.ticket_status_history import TicketStatusHistory
+from app.core.constants import UserRole, TicketStatus, TicketPriority
+from app.utils.jwt import create_access_token
+from app.utils.time_utils import utcnow
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def setup(app):
+    team = Team(name="Network Team")
+    other_team = Team(name="Hardware Team")
+    db.session.add_all([team, other_team])
+    db.session.commit()
+
+    admin = User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN)
+    staff = User(email="staff@tt.com", password_hash="x", full_name="Staff", role=UserRole.IT_STAFF, team_id=team.id)
+    employee = User(email="emp@tt.com", password_hash="x", full_name="Emp", role=UserRole.EMPLOYEE)
+    db.session.add_all([admin, staff, employee])
+    db.session.commit()
+
+    now = utcnow()
+
+    def ticket(days_ago, team_id, resolved_days_ago=None, is_demo=False):
+        t = Ticket(title="T", description="D", priority=TicketPriority.LOW, created_by_id=employee.id,
+                   team_id=team_id, is_demo=is_demo, created_at=now - timedelta(days=days_ago))
+        db.session.add(t)
+        db.session.flush()
+        if resolved_days_ago is not None:
+            # Resolved, then closed later: only the transition into Resolved counts
+            t.status = TicketStatus.CLOSED
+            db.session.add_all([
+                TicketStatusHistory(ticket_id=t.id, old_status=TicketStatus.OPEN, new_status=TicketStatus.RESOLVED,
+                                    changed_at=now - timedelta(days=resolved_days_ago)),
+                TicketStatusHistory(ticket_id=t.id, old_status=TicketStatus.RESOLVED, new_status=TicketStatus.CLOSED,
+                                    changed_at=now),
+            ])
+        return t
+
+    ticket(0, team.id, resolved_days_ago=0)
+    ticket(2, team.id)
+    ticket(20, other_team.id, resolved_days_ago=10)
+    ticket(200, team.id, resolved_days_ago=100)
+    ticket(0, team.id, is_demo=True)
+    db.session.commit()
+
+    def headers(user):
+        return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+    return {"admin": headers(admin), "staff": headers(staff), "employee": headers(employee)}
+
+def test_daily_trend_from_status_history(client, setup):
+    data = client.get('/api/v1/analytics/trends?window=7', headers=setup["admin"]).get_json()
+    assert data["granularity"] == "day"
+    assert len(data["buckets"]) == 7
+    assert data["buckets"][-1] == utcnow().date().isoformat()
+    assert data["created"] == [0, 0, 0, 0, 1, 0, 1]
+    assert data["resolved"] == [0, 0, 0, 0, 0, 0, 1]
+
+def test_long_windows_and_weekly_buckets(client, setup):
+    data = client.get('/api/v1/analytics/trends?window=30', headers=setup["admin"]).get_json()
+    assert sum(data["created"]) == 3
+    assert sum(data["resolved"]) == 2
+
+    data = client.get('/api/v1/analytics/trends?window=365&granularity=week', headers=setup["admin"]).get_json()
+    assert len(data["buckets"]) in (53, 54)
+    assert sum(data["created"]) == 4
+    assert sum(data["resolved"]) == 3
+
+    data = client.get('/api/v1/analytics/trends?window=7&granularity=hour', headers=setup["admin"]).get_json()
+    assert len(data["buckets"]) == 7 * 24
+    assert data["resolved"][-1] == 1
+
+def test_trends_scoped_to_it_staff_team(client, setup):
+    data = client.get('/api/v1/analytics/trends?window=30', headers=setup["staff"]).get_json()
+    assert sum(data["created"]) == 2
+    assert sum(data["resolved"]) == 1
+
+def test_trends_rejects_invalid_parameters(client, setup):
+    assert client.get('/api/v1/analytics/trends?window=14', headers=setup["admin"]).status_code == 400
+    assert client.get('/api/v1/analytics/trends?granularity=month', headers=setup["admin"]).status_code == 400
+    assert client.get('/api/v1/analytics/trends?window=365&granularity=hour', headers=setup["admin"]).status_code == 400
+    assert client.get('/api/v1/analytics/trends', headers=setup["employee"]).status_code == 403
+
+def test_it_dashboard_weekly_activity(client, setup):
+    data = client.get('/api/v1/analytics/it-dashboard', headers=setup["staff"]).get_json()
+    assert len(data["weekly_activity"]["dates"]) == 7
+    # The IT dashboard does not filter demo tickets, so today's demo ticket counts too
+    assert data["weekly_activity"]["assigned"][-1] == 2
+    assert data["weekly_activity"]["resolved"][-1] == 1
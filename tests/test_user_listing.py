@@ -0,0 +1,113 @@
+import pytest
+from datetime import timedelta
+from sqlalchemy import event
+from app.main import create_app
+from app.core.config import TestingConfig, Config
+from app.core.database import db
+from app.models.user import User
+from app.models.ticket import Ticket
+from app.core.constants import UserRole, TicketPriority, TicketStatus
+from app.utils.jwt import create_access_token
+from app.utils.time_utils import utcnow
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def seeded(app):
+    now = utcnow()
+    admin = User(email="admin@tt.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN,
+                 created_at=now - timedelta(days=100))
+    db.session.add(admin)
+    db.session.add(User(email=Config.DEMO_EMAIL, password_hash="x", full_name="Demo", role=UserRole.ADMIN))
+    employees = [
+        User(email=f"emp{i:02d}@tt.com", password_hash="x", full_name=f"Employee {i:02d}",
+             role=UserRole.EMPLOYEE, created_at=now - timedelta(days=i))
+        for i in range(7)
+    ]
+    staff = [
+        User(email="jsmith@tt.com", password_hash="x", full_name="Jane Smith", role=UserRole.IT_STAFF,
+             created_at=now - timedelta(days=50)),
+        User(email="ops@tt.com", password_hash="x", full_name="Smith Operator", role=UserRole.IT_STAFF,
+             is_active=False, created_at=now - timedelta(days=60)),
+    ]
+    db.session.add_all(employees + staff)
+    db.session.flush()
+    for i in range(3):
+        db.session.add(Ticket(title=f"T{i}", description="d", category="General", priority=TicketPriority.LOW,
+                              created_by_id=employees[0].id, assigned_to_id=staff[0].id,
+                              status=TicketStatus.RESOLVED if i else TicketStatus.OPEN))
+    db.session.commit()
+    return {"headers": {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"},
+            "employees": employees, "staff": staff}
+
+def test_cursor_pages_cover_role_without_repeats(client, seeded):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"role": "employee", "pagination": "cursor", "per_page": 3}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get('/api/v1/users', query_string=params, headers=seeded["headers"]).get_json()
+        seen += [u["email"] for u in data["items"]]
+        pages += 1
+        cursor = data["meta"]["nextCursor"]
+        if not cursor:
+            break
+    assert pages == 3
+    assert seen == [f"emp{i:02d}@tt.com" for i in range(7)]
+
+    bad = client.get('/api/v1/users?cursor=garbage', headers=seeded["headers"])
+    assert bad.status_code == 400
+
+def test_prefix_search_and_batched_ticket_counts(client, seeded, app):
+    search = lambda q: [u["email"] for u in client.get(
+        '/api/v1/users', query_string={"search": q}, headers=seeded["headers"]).get_json()]
+    assert search("JANE") == ["jsmith@tt.com"]
+    assert search("jsm") == ["jsmith@tt.com"]
+    assert sorted(search("smith")) == ["ops@tt.com"]
+    assert search("100%") == []
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        users = client.get('/api/v1/users', headers=seeded["headers"]).get_json()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    by_email = {u["email"]: u for u in users}
+    assert by_email["emp00@tt.com"]["tickets_raised"] == 3
+    assert by_email["jsmith@tt.com"]["tickets_resolved"] == 2
+    assert Config.DEMO_EMAIL not in by_email
+    # Users + two grouped ticket counts, plus at most the auth lookup, whatever the user count
+    assert len(statements) <= 5, statements
+
+def test_role_summary(client, seeded):
+    data = client.get('/api/v1/users/summary', headers=seeded["headers"]).get_json()
+    assert data["total"] == 10
+    assert data["active"] == 9
+    assert data["by_role"]["employee"] == {"total": 7, "active": 7}
+    assert data["byRole"]["it_staff"] == {"total": 2, "active": 1}
+    assert data["by_role"]["admin"] == {"total": 1, "active": 1}
+
+def test_prefix_indexes_use_pattern_ops_on_postgres(app):
+    from sqlalchemy.dialects import postgresql, sqlite
+    from sqlalchemy.schema import CreateIndex
+
+    ddl = {dialect.name: [str(CreateIndex(index).compile(dialect=dialect))
+                          for index in User.__table__.indexes
+                          if index.name == "ix_users_lower_email"
+                          and index._ddl_if.dialect == dialect.name]
+           for dialect in (postgresql.dialect(), sqlite.dialect())}
+    # LIKE 'prefix%' can only use the index under a non-C collation with the pattern opclass
+    assert ddl["postgresql"] == ["CREATE INDEX ix_users_lower_email ON users (lower(email) text_pattern_ops)"]
+    assert ddl["sqlite"] == ["CREATE INDEX ix_users_lower_email ON users (lower(email))"]